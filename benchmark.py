@@ -278,6 +278,47 @@ myNoddys = Noddy.objects()
     t = timeit.Timer(stmt=stmt, setup=setup)
     print(t.timeit(1))
 
+    setup = """
+from pymongo import MongoClient
+connection = MongoClient()
+connection.drop_database('timeit_test')
+connection.close()
+
+from bson import ObjectId
+from mongoengine import Document, StringField, IntField, ListField, connect
+connect("timeit_test")
+
+class Person(Document):
+    name = StringField()
+    age = IntField(default=30)
+    tags = ListField(StringField())
+
+son = {'_id': ObjectId(), 'name': u'Ross', 'age': 30, 'tags': [u'a', u'b']}
+"""
+
+    stmt = """
+for i in range(10000):
+    Person._from_son(son)
+"""
+
+    print("-" * 100)
+    print("""Loading 10000 documents with _from_son (no signal receivers) - MongoEngine""")
+    t = timeit.Timer(stmt=stmt, setup=setup)
+    print(t.timeit(1))
+
+    stmt = """
+person = Person(name='Ross')
+person.save()
+for i in range(10000):
+    person.age = i
+    person.save(write_concern={"w": 0})
+"""
+
+    print("-" * 100)
+    print("""Saving a document 10000 times (no signal receivers) - MongoEngine, write_concern={"w": 0}""")
+    t = timeit.Timer(stmt=stmt, setup=setup)
+    print(t.timeit(1))
+
 
 if __name__ == "__main__":
     main()
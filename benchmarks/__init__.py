@@ -0,0 +1,14 @@
+"""CPU benchmarks of MongoEngine's hot paths: building documents from SON
+and back, validation, change tracking, query compilation, dereferencing and
+embedded list filtering.  They run without a MongoDB server::
+
+    python -m benchmarks                     # run all the cases
+    python -m benchmarks -k 'from_son.*'     # run the matching cases
+    python -m benchmarks -s baseline.json    # save the results
+    python -m benchmarks -b baseline.json    # flag regressions
+
+Each case reports the operations per second and the peak memory an
+operation allocates (when :mod:`tracemalloc` is available).  Compared with a
+baseline, the cases more than ``--threshold`` slower or allocating more are
+reported and the exit status is 1.
+"""
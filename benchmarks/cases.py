@@ -0,0 +1,175 @@
+"""The benchmarked operations.
+
+Each case is a function registered with :func:`benchmark` that prepares its
+data and returns the operation to time, a callable taking no argument.
+"""
+from bson import BSON, ObjectId
+
+from mongoengine import Q
+from mongoengine.base import RawSON
+from mongoengine.dereference import DeReference
+from mongoengine.queryset import transform
+
+from benchmarks.documents import (Flat, Deep, Lists, Series, Dynamic, Author,
+                                  Post, flat_son, deep_son, lists_son,
+                                  series_son, dynamic_son, post_son)
+
+__all__ = ('CASES', 'benchmark')
+
+CASES = []
+
+
+def benchmark(name):
+    """Register the decorated setup function as the case ``name``."""
+    def register(setup):
+        CASES.append((name, setup))
+        return setup
+    return register
+
+
+SHAPES = (('flat', Flat, flat_son), ('deep', Deep, deep_son),
+          ('lists', Lists, lists_son), ('dynamic', Dynamic, dynamic_son))
+
+# Large lists of scalars
+SERIES = (('series', Series, series_son),)
+
+
+def _register_shapes(operation, setup, shapes=SHAPES):
+    for shape, doc_cls, make_son in shapes:
+        benchmark('%s.%s' % (operation, shape))(
+            lambda doc_cls=doc_cls, make_son=make_son:
+            setup(doc_cls, make_son))
+
+
+def _from_son(doc_cls, make_son):
+    son = make_son()
+    return lambda: doc_cls._from_son(son)
+
+
+def _from_son_readonly(doc_cls, make_son):
+    son = make_son()
+    return lambda: doc_cls._from_son(son, _readonly=True)
+
+
+def _init(doc_cls, make_son):
+    doc = doc_cls._from_son(make_son())
+    values = dict((name, doc[name]) for name in doc if name != 'id')
+    return lambda: doc_cls(**values)
+
+
+def _to_mongo(doc_cls, make_son):
+    return doc_cls._from_son(make_son()).to_mongo
+
+
+def _validate(doc_cls, make_son):
+    return doc_cls._from_son(make_son()).validate
+
+
+def _delta(doc_cls, make_son):
+    doc = doc_cls._from_son(make_son())
+    doc.name = 'Changed'
+    return doc._delta
+
+
+def _get_changed_fields(doc_cls, make_son):
+    return doc_cls._from_son(make_son())._get_changed_fields
+
+
+def _to_json(doc_cls, make_son):
+    return doc_cls._from_son(make_son()).to_json
+
+
+_register_shapes('from_son', _from_son)
+_register_shapes('from_son.readonly', _from_son_readonly)
+_register_shapes('init', _init)
+_register_shapes('to_mongo', _to_mongo)
+_register_shapes('validate', _validate)
+_register_shapes('delta', _delta)
+_register_shapes('get_changed_fields', _get_changed_fields)
+_register_shapes('to_json', _to_json, SHAPES[:2])
+_register_shapes('from_son', _from_son, SERIES)
+_register_shapes('to_mongo', _to_mongo, SERIES)
+
+
+@benchmark('transform.query')
+def transform_query():
+    owner = ObjectId()
+    return lambda: transform.query(
+        Flat, name='Ada', age__gte=18, tags__in=['math', 'poetry'],
+        owner=owner, kind__ne='c')
+
+
+@benchmark('transform.query.deep')
+def transform_query_deep():
+    return lambda: transform.query(
+        Deep, profile__company__address__city='London',
+        profile__home__zip_code__startswith='12')
+
+
+@benchmark('transform.update')
+def transform_update():
+    return lambda: transform.update(
+        Flat, set__name='Ada', inc__age=1, push__tags='code',
+        unset__website=True)
+
+
+@benchmark('q.compile')
+def q_compile():
+    def compile_q():
+        query = ((Q(name='Ada') | Q(age__gt=30)) &
+                 Q(kind__in=['a', 'b']) & Q(active=True))
+        return query.to_query(Flat)
+    return compile_q
+
+
+@benchmark('dereference.attach')
+def dereference_attach():
+    authors = [Author(id=ObjectId(), name='Author %d' % i)
+               for i in range(100)]
+    post = Post._from_son(post_son(authors))
+    dereference = DeReference()
+    dereference.max_depth = 1
+    dereference.object_map = dict(
+        ((Author._get_collection_name(), author.pk), author)
+        for author in authors)
+    items = post._data['authors']
+    return lambda: dereference._attach_objects(items, 0, post, 'authors')
+
+
+@benchmark('embedded_list.filter')
+def embedded_list_filter():
+    items = Lists._from_son(lists_son()).items
+    return lambda: items.filter(kind='b', quantity=42)
+
+
+@benchmark('read_name.eager.lists')
+def read_name_eager():
+    raw = BSON.encode(lists_son())
+    return lambda: Lists._from_son(BSON(raw).decode()).name
+
+
+@benchmark('read_lists.eager.lists')
+def read_lists_eager():
+    son = lists_son()
+
+    def read():
+        doc = Lists._from_son(son)
+        return doc.items, doc.values
+    return read
+
+
+@benchmark('read_lists.readonly.lists')
+def read_lists_readonly():
+    son = lists_son()
+
+    def read():
+        doc = Lists._from_son(son, _readonly=True)
+        return doc.items, doc.values
+    return read
+
+
+if RawSON is not None:
+    @benchmark('read_name.lazy.lists')
+    def read_name_lazy():
+        raw = BSON.encode(lists_son())
+        return lambda: Lists._from_son(RawSON(raw)).name
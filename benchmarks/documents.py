@@ -0,0 +1,165 @@
+"""Document classes and sample data the benchmarks run on.
+
+The shapes cover the common layouts of real collections: a flat document of
+scalar fields, a deeply embedded one, one holding large lists and a dynamic
+one, plus a document referencing others.
+"""
+import datetime
+
+from bson import DBRef, ObjectId
+
+from mongoengine import *
+
+__all__ = ('Flat', 'Deep', 'Lists', 'Series', 'Dynamic', 'Author', 'Post',
+           'flat_son', 'deep_son', 'lists_son', 'series_son', 'dynamic_son',
+           'post_son', 'LIST_SIZE', 'SERIES_SIZE')
+
+LIST_SIZE = 1000
+SERIES_SIZE = 10000
+
+
+class Flat(Document):
+    name = StringField(max_length=100, required=True)
+    email = EmailField()
+    age = IntField(min_value=0)
+    score = FloatField()
+    active = BooleanField(default=True)
+    created = DateTimeField(default=datetime.datetime.utcnow)
+    website = URLField()
+    tags = ListField(StringField())
+    owner = ObjectIdField()
+    kind = StringField(choices=('a', 'b', 'c'))
+    meta = {'collection': 'benchmark_flat'}
+
+
+class Geo(EmbeddedDocument):
+    lat = FloatField()
+    lng = FloatField()
+
+
+class Address(EmbeddedDocument):
+    street = StringField()
+    city = StringField()
+    zip_code = StringField(db_field='zip')
+    geo = EmbeddedDocumentField(Geo)
+
+
+class Company(EmbeddedDocument):
+    name = StringField()
+    address = EmbeddedDocumentField(Address)
+
+
+class Profile(EmbeddedDocument):
+    bio = StringField()
+    company = EmbeddedDocumentField(Company)
+    home = EmbeddedDocumentField(Address)
+
+
+class Deep(Document):
+    name = StringField()
+    profile = EmbeddedDocumentField(Profile)
+    meta = {'collection': 'benchmark_deep'}
+
+
+class Item(EmbeddedDocument):
+    sku = StringField()
+    kind = StringField()
+    quantity = IntField(min_value=0)
+    price = FloatField()
+
+
+class Lists(Document):
+    name = StringField()
+    items = EmbeddedDocumentListField(Item)
+    values = ListField(IntField())
+    meta = {'collection': 'benchmark_lists'}
+
+
+class Series(Document):
+    name = StringField()
+    values = ListField(FloatField())
+    meta = {'collection': 'benchmark_series'}
+
+
+class Dynamic(DynamicDocument):
+    name = StringField()
+    meta = {'collection': 'benchmark_dynamic'}
+
+
+class Author(Document):
+    name = StringField()
+    meta = {'collection': 'benchmark_author'}
+
+
+class Post(Document):
+    title = StringField()
+    authors = ListField(ReferenceField(Author, dbref=True))
+    meta = {'collection': 'benchmark_post'}
+
+
+def flat_son():
+    return {
+        '_id': ObjectId(),
+        'name': 'Ada Lovelace',
+        'email': 'ada@example.com',
+        'age': 36,
+        'score': 99.5,
+        'active': True,
+        'created': datetime.datetime(2016, 5, 1, 12, 30),
+        'website': 'http://example.com/ada',
+        'tags': ['math', 'engines', 'poetry'],
+        'owner': ObjectId(),
+        'kind': 'a',
+    }
+
+
+def _address_son(city):
+    return {'street': '1 Main Street', 'city': city, 'zip': '12345',
+            'geo': {'lat': 51.5, 'lng': -0.12}}
+
+
+def deep_son():
+    return {
+        '_id': ObjectId(),
+        'name': 'Ada Lovelace',
+        'profile': {
+            'bio': 'Wrote the first program',
+            'company': {'name': 'Analytical Engines',
+                        'address': _address_son('London')},
+            'home': _address_son('Marylebone'),
+        },
+    }
+
+
+def lists_son(size=LIST_SIZE):
+    kinds = ('a', 'b', 'c')
+    return {
+        '_id': ObjectId(),
+        'name': 'Inventory',
+        'items': [{'sku': 'sku-%d' % i, 'kind': kinds[i % 3],
+                   'quantity': i, 'price': i * 1.5}
+                  for i in range(size)],
+        'values': list(range(size)),
+    }
+
+
+def series_son(size=SERIES_SIZE):
+    return {'_id': ObjectId(), 'name': 'Sensor',
+            'values': [i * 0.5 for i in range(size)]}
+
+
+def dynamic_son():
+    son = {'_id': ObjectId(), 'name': 'Record'}
+    for i in range(10):
+        son['attr_%d' % i] = 'value %d' % i
+    son['nested'] = {'a': 1, 'b': [1, 2, 3]}
+    return son
+
+
+def post_son(authors):
+    return {
+        '_id': ObjectId(),
+        'title': 'Notes',
+        'authors': [DBRef(Author._get_collection_name(), author.pk)
+                    for author in authors],
+    }
@@ -0,0 +1,140 @@
+"""Time the benchmark cases and compare them with a saved baseline."""
+from __future__ import print_function
+
+import fnmatch
+import gc
+import json
+import platform
+import sys
+from optparse import OptionParser
+from timeit import default_timer as timer
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+import mongoengine
+
+__all__ = ('run', 'compare', 'main')
+
+
+def measure(operation, min_time=0.2, repeat=3):
+    """Return the operations per second of ``operation`` (the best of
+    ``repeat`` runs lasting at least ``min_time`` seconds each) and the peak
+    memory it allocates, in KiB, None when :mod:`tracemalloc` is missing.
+    """
+    operation()  # warm up the caches
+
+    number = 1
+    while True:
+        elapsed = _time(operation, number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed <= 0 else max(2, int(min_time / elapsed) + 1)
+    best = min([elapsed] + [_time(operation, number)
+                            for _ in range(repeat - 1)])
+
+    alloc_kib = None
+    if tracemalloc is not None:
+        tracemalloc.start()
+        try:
+            operation()
+            alloc_kib = tracemalloc.get_traced_memory()[1] / 1024.0
+        finally:
+            tracemalloc.stop()
+    return number / best, alloc_kib
+
+
+def _time(operation, number):
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = timer()
+        for _ in range(number):
+            operation()
+        return timer() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def run(pattern=None, min_time=0.2, repeat=3, stream=sys.stdout):
+    """Run the cases whose name matches the glob ``pattern`` (all of them
+    if None) and return their results, keyed by case name.
+    """
+    from benchmarks.cases import CASES
+
+    results = {}
+    for name, setup in CASES:
+        if pattern and not fnmatch.fnmatch(name, pattern):
+            continue
+        ops, alloc_kib = measure(setup(), min_time, repeat)
+        results[name] = {'ops_per_sec': ops, 'alloc_kib': alloc_kib}
+        if stream is not None:
+            print('%-32s %14.1f ops/s %12s KiB/op' % (
+                name, ops, '-' if alloc_kib is None else '%.1f' % alloc_kib),
+                file=stream)
+    return results
+
+
+def compare(results, baseline, threshold=0.1):
+    """Return the ``(name, metric, baseline value, value)`` of the
+    ``results`` more than ``threshold`` (a ratio) slower, or allocating
+    more, than ``baseline``.
+    """
+    regressions = []
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        result, previous = results[name], baseline[name]
+        if result['ops_per_sec'] < previous['ops_per_sec'] * (1 - threshold):
+            regressions.append((name, 'ops_per_sec',
+                                previous['ops_per_sec'],
+                                result['ops_per_sec']))
+        if (result.get('alloc_kib') is not None and
+                previous.get('alloc_kib') is not None and
+                result['alloc_kib'] >
+                previous['alloc_kib'] * (1 + threshold)):
+            regressions.append((name, 'alloc_kib', previous['alloc_kib'],
+                                result['alloc_kib']))
+    return regressions
+
+
+def main(argv=None):
+    parser = OptionParser(usage='python -m benchmarks [options]')
+    parser.add_option('-k', dest='pattern',
+                      help='only run the cases matching this glob pattern')
+    parser.add_option('-b', '--baseline',
+                      help='JSON file of results to compare with')
+    parser.add_option('-s', '--save',
+                      help='save the results to this JSON file')
+    parser.add_option('-t', '--threshold', type='float', default=0.1,
+                      help='ratio beyond which a change is a regression '
+                           '[default: %default]')
+    parser.add_option('--min-time', type='float', default=0.2,
+                      help='minimal duration of a timed run, in seconds '
+                           '[default: %default]')
+    parser.add_option('--repeat', type='int', default=3,
+                      help='number of timed runs [default: %default]')
+    options, args = parser.parse_args(argv)
+
+    results = run(options.pattern, options.min_time, options.repeat)
+
+    if options.save:
+        with open(options.save, 'w') as f:
+            json.dump({'python': platform.python_version(),
+                       'mongoengine': mongoengine.get_version(),
+                       'results': results}, f, indent=2, sort_keys=True)
+
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, options.threshold)
+        for name, metric, previous, value in regressions:
+            print('REGRESSION %s %s: %.1f -> %.1f (%+.0f%%)' % (
+                name, metric, previous, value,
+                (value - previous) * 100.0 / previous))
+        if regressions:
+            return 1
+    return 0
@@ -10,9 +10,11 @@ import signals
 from signals import *
 from errors import *
 import errors
+from context_managers import session
 
 __all__ = (list(document.__all__) + fields.__all__ + connection.__all__ +
-           list(queryset.__all__) + signals.__all__ + list(errors.__all__))
+           list(queryset.__all__) + signals.__all__ + list(errors.__all__) +
+           ['session'])
 
 VERSION = (0, 10, 6)
 
@@ -0,0 +1,211 @@
+"""Helper functions, classes and constants behind the asyncio API.
+
+The asyncio API is built on futures rather than coroutines so that the code
+base keeps a single syntax for all the supported Python versions: every
+asynchronous method returns an :class:`asyncio.Future`, which can be awaited
+from a coroutine.
+"""
+import itertools
+
+try:
+    import asyncio
+except ImportError:  # Python 2
+    asyncio = None
+
+try:
+    StopAsyncIteration = StopAsyncIteration
+except NameError:  # Python < 3.5
+    StopAsyncIteration = StopIteration
+
+__all__ = ('HAS_ASYNCIO', 'StopAsyncIteration', 'resolved', 'failed', 'then',
+           'with_write_concern', 'count_documents', 'AsyncMockClient')
+
+HAS_ASYNCIO = asyncio is not None
+
+
+def _new_future():
+    if asyncio is None:
+        raise RuntimeError('The asyncio API of MongoEngine requires '
+                           'Python 3.4 or newer.')
+    return asyncio.Future()
+
+
+def resolved(value):
+    """Return a future already resolved with ``value``."""
+    future = _new_future()
+    future.set_result(value)
+    return future
+
+
+def failed(exc):
+    """Return a future already failed with the exception ``exc``."""
+    future = _new_future()
+    future.set_exception(exc)
+    return future
+
+
+def then(awaitable, callback, errback=None):
+    """Return a future resolved with ``callback(result)`` once ``awaitable``
+    (a future or a coroutine) is done.
+
+    An exception raised by ``awaitable`` is passed to ``errback``, which
+    returns the exception the returned future fails with; without
+    ``errback`` the exception is propagated as is.  An exception raised by
+    ``callback`` fails the returned future too.
+    """
+    inner = asyncio.ensure_future(awaitable)
+    outer = _new_future()
+
+    def _done(inner):
+        if outer.cancelled():
+            return
+        if inner.cancelled():
+            outer.cancel()
+            return
+        exc = inner.exception()
+        if exc is not None:
+            outer.set_exception(errback(exc) if errback else exc)
+            return
+        try:
+            result = callback(inner.result())
+        except Exception as exc:
+            outer.set_exception(exc)
+        else:
+            outer.set_result(result)
+
+    inner.add_done_callback(_done)
+    return outer
+
+
+def with_write_concern(collection, write_concern):
+    """Return ``collection`` using the write concern with the options
+    ``write_concern`` (e.g. ``{'w': 2}``), if any.
+    """
+    if not write_concern:
+        return collection
+    # Motor depends on PyMongo 3+
+    from pymongo.write_concern import WriteConcern
+    return collection.with_options(write_concern=WriteConcern(**write_concern))
+
+
+def _has_count_documents(collection):
+    """Tell whether the asyncio ``collection`` has ``count_documents``,
+    which Motor only has from its version 2.0 (on PyMongo 3.7).
+    """
+    if isinstance(collection, _AsyncMockProxy):
+        return hasattr(collection.delegate, 'count_documents')
+    # Motor resolves unknown attributes as sub-collections
+    import motor
+    return motor.version_tuple >= (2, 0)
+
+
+def count_documents(collection, query, **kwargs):
+    """Return a future resolved with the number of documents of the asyncio
+    ``collection`` matching ``query``, counted with ``count_documents`` or,
+    on older drivers, by a cursor.  ``kwargs`` are the ``limit``, ``skip``
+    and ``hint`` options of the count.
+    """
+    if _has_count_documents(collection):
+        return collection.count_documents(query, **kwargs)
+    cursor = collection.find(query)
+    for name, value in kwargs.items():
+        getattr(cursor, name)(value)
+    return cursor.count(with_limit_and_skip=True)
+
+
+class _AsyncMockProxy(object):
+    """Wrap a mongomock object, its method calls returning futures resolved
+    with (or failed by) what the underlying calls return (or raise).
+    """
+
+    def __init__(self, delegate):
+        self.delegate = delegate
+
+    def __getattr__(self, name):
+        attr = getattr(self.delegate, name)
+        if not callable(attr):
+            return attr
+
+        def method(*args, **kwargs):
+            try:
+                return resolved(attr(*args, **kwargs))
+            except Exception as exc:
+                return failed(exc)
+        method.__name__ = name
+        return method
+
+
+class AsyncMockClient(_AsyncMockProxy):
+    """In-process stand-in for Motor's
+    :class:`~motor.motor_asyncio.AsyncIOMotorClient` used by the mocked
+    connections, wrapping the synchronous mongomock client so that both APIs
+    see the same data.
+
+    .. versionadded:: 0.10.7
+    """
+
+    def __getitem__(self, name):
+        return _AsyncMockDatabase(self.delegate[name])
+
+    def get_database(self, name, **kwargs):
+        return _AsyncMockDatabase(self.delegate.get_database(name, **kwargs))
+
+    def close(self):
+        # The mongomock client is shared with the synchronous API
+        pass
+
+
+class _AsyncMockDatabase(_AsyncMockProxy):
+
+    def __getitem__(self, name):
+        return _AsyncMockCollection(self.delegate[name])
+
+    def get_collection(self, name, **kwargs):
+        return _AsyncMockCollection(
+            self.delegate.get_collection(name, **kwargs))
+
+
+class _AsyncMockCollection(_AsyncMockProxy):
+
+    def find(self, *args, **kwargs):
+        return _AsyncMockCursor(self.delegate.find(*args, **kwargs))
+
+    def aggregate(self, pipeline, **kwargs):
+        return _AsyncMockCursor(self.delegate.aggregate(pipeline, **kwargs))
+
+    def with_options(self, **kwargs):
+        return _AsyncMockCollection(self.delegate.with_options(**kwargs))
+
+
+class _AsyncMockCursor(object):
+    """Motor-like cursor: the query modifiers are applied in place and
+    return the cursor, the documents are fetched with :meth:`to_list`.
+    """
+
+    def __init__(self, delegate):
+        self.delegate = delegate
+
+    def __getattr__(self, name):
+        modifier = getattr(self.delegate, name)
+
+        def method(*args, **kwargs):
+            modifier(*args, **kwargs)
+            return self
+        method.__name__ = name
+        return method
+
+    def clone(self):
+        return _AsyncMockCursor(self.delegate.clone())
+
+    def count(self, with_limit_and_skip=False):
+        try:
+            return resolved(self.delegate.count(
+                with_limit_and_skip=with_limit_and_skip))
+        except Exception as exc:
+            return failed(exc)
+
+    def to_list(self, length):
+        try:
+            return resolved(list(itertools.islice(self.delegate, length)))
+        except Exception as exc:
+            return failed(exc)
@@ -1,11 +1,45 @@
+import datetime
 import weakref
 import itertools
 
+from bson import ObjectId
+
 from mongoengine.common import _import_class
 from mongoengine.errors import DoesNotExist, MultipleObjectsReturned
 
 __all__ = ("BaseDict", "BaseList", "EmbeddedDocumentList")
 
+# The types of the values a list remembers the removal of, which can be
+# pulled by value
+_PULLABLE_TYPES = (basestring, int, long, float, bool, datetime.datetime,
+                   ObjectId)
+
+
+# The base of the changes of the lists of documents being created
+_CREATING = object()
+
+
+def _root_document(instance):
+    """Return the document holding ``instance``, a document or an embedded
+    document, None if it isn't held by a document."""
+    try:
+        while instance is not None and not instance._is_document:
+            instance = getattr(instance, '_instance', None)
+    except ReferenceError:
+        return None
+    return instance
+
+
+def _untracked(value):
+    """Return ``value`` with its lists and dicts, at any depth, turned into
+    plain ones not tracking their changes, for read-only documents."""
+    if isinstance(value, list):
+        return [_untracked(item) for item in value]
+    if isinstance(value, dict):
+        return dict((key, _untracked(item))
+                    for key, item in value.iteritems())
+    return value
+
 
 class BaseDict(dict):
     """A special dict so we can watch any changes"""
@@ -68,21 +102,27 @@ class BaseDict(dict):
         self._mark_as_changed()
         return super(BaseDict, self).clear()
 
-    def pop(self, *args, **kwargs):
-        self._mark_as_changed()
-        return super(BaseDict, self).pop(*args, **kwargs)
+    def pop(self, key, *args, **kwargs):
+        if key in self:
+            self._mark_as_changed(key)
+        return super(BaseDict, self).pop(key, *args, **kwargs)
 
     def popitem(self, *args, **kwargs):
-        self._mark_as_changed()
-        return super(BaseDict, self).popitem()
+        key, value = super(BaseDict, self).popitem()
+        self._mark_as_changed(key)
+        return key, value
 
-    def setdefault(self, *args, **kwargs):
-        self._mark_as_changed()
-        return super(BaseDict, self).setdefault(*args, **kwargs)
+    def setdefault(self, key, *args, **kwargs):
+        if key not in self:
+            self._mark_as_changed(key)
+        return super(BaseDict, self).setdefault(key, *args, **kwargs)
 
     def update(self, *args, **kwargs):
-        self._mark_as_changed()
-        return super(BaseDict, self).update(*args, **kwargs)
+        # Only the updated keys are changed
+        items = dict(*args, **kwargs)
+        for key in items:
+            self._mark_as_changed(key)
+        return super(BaseDict, self).update(items)
 
     def _mark_as_changed(self, key=None):
         if hasattr(self._instance, '_mark_as_changed'):
@@ -94,11 +134,24 @@ class BaseDict(dict):
 
 class BaseList(list):
     """A special list so we can watch any changes
+
+    The lists of the fields of documents also remember how they changed
+    since they were loaded or saved, when it can be written as a single
+    update of the array: the items appended (``$push``), the values removed
+    (``$pullAll``) or the item popped (``$pop``).  See :meth:`_operation`.
     """
 
     _dereferenced = False
     _instance = None
     _name = None
+    # The change of the list: None if it can't be written as an update of
+    # the array, else an empty tuple or ('push', number of items appended),
+    # ('pull', [values removed]) or ('pop', 1 for the last item, -1 for the
+    # first one)
+    _change = None
+    # The changed fields of the document holding the list when _change
+    # started being recorded: the document is saved once they're replaced
+    _change_base = None
 
     def __init__(self, list_items, instance, name):
         Document = _import_class('Document')
@@ -106,6 +159,15 @@ class BaseList(list):
 
         if isinstance(instance, (Document, EmbeddedDocument)):
             self._instance = weakref.proxy(instance)
+            root = _root_document(instance)
+            if root is not None:
+                # Documents being created don't have changed fields yet
+                self._change_base = getattr(root, '_changed_fields',
+                                            _CREATING)
+                # A list replacing the one of the field isn't in the db
+                db_name = instance._db_field_map.get(name, name)
+                if db_name not in getattr(instance, '_changed_fields', ()):
+                    self._change = ()
         self._name = name
         super(BaseList, self).__init__(list_items)
 
@@ -130,6 +192,7 @@ class BaseList(list):
             yield self[i]
 
     def __setitem__(self, key, value, *args, **kwargs):
+        self._record(None)
         if isinstance(key, slice):
             self._mark_as_changed()
         else:
@@ -137,17 +200,18 @@ class BaseList(list):
         return super(BaseList, self).__setitem__(key, value)
 
     def __delitem__(self, key, *args, **kwargs):
-        if isinstance(key, slice):
-            self._mark_as_changed()
-        else:
-            self._mark_as_changed(key)
+        self._record(None)
+        # The following items move
+        self._mark_as_changed()
         return super(BaseList, self).__delitem__(key)
 
     def __setslice__(self, *args, **kwargs):
+        self._record(None)
         self._mark_as_changed()
         return super(BaseList, self).__setslice__(*args, **kwargs)
 
     def __delslice__(self, *args, **kwargs):
+        self._record(None)
         self._mark_as_changed()
         return super(BaseList, self).__delslice__(*args, **kwargs)
 
@@ -161,45 +225,111 @@ class BaseList(list):
         return self
 
     def __iadd__(self, other):
+        other = list(other)
+        self._record('push', len(other))
         self._mark_as_changed()
         return super(BaseList, self).__iadd__(other)
 
     def __imul__(self, other):
+        self._record(None)
         self._mark_as_changed()
         return super(BaseList, self).__imul__(other)
 
     def append(self, *args, **kwargs):
+        self._record('push', 1)
         self._mark_as_changed()
         return super(BaseList, self).append(*args, **kwargs)
 
-    def extend(self, *args, **kwargs):
+    def extend(self, iterable):
+        items = list(iterable)
+        self._record('push', len(items))
         self._mark_as_changed()
-        return super(BaseList, self).extend(*args, **kwargs)
+        return super(BaseList, self).extend(items)
 
     def insert(self, *args, **kwargs):
+        self._record(None)
         self._mark_as_changed()
         return super(BaseList, self).insert(*args, **kwargs)
 
     def pop(self, *args, **kwargs):
+        index = args[0] if args else -1
+        size = len(self)
+        value = super(BaseList, self).pop(*args, **kwargs)
+        if index in (-1, size - 1):
+            self._record('pop', 1)
+        elif index in (0, -size):
+            self._record('pop', -1)
+        else:
+            self._record(None)
         self._mark_as_changed()
-        return super(BaseList, self).pop(*args, **kwargs)
+        return value
 
-    def remove(self, *args, **kwargs):
+    def remove(self, value):
         self._mark_as_changed()
-        return super(BaseList, self).remove(*args, **kwargs)
+        super(BaseList, self).remove(value)
+        # $pull removes all the occurrences of the value
+        if isinstance(value, _PULLABLE_TYPES) and value not in self:
+            self._record('pull', value)
+        else:
+            self._record(None)
 
     def reverse(self, *args, **kwargs):
+        self._record(None)
         self._mark_as_changed()
         return super(BaseList, self).reverse()
 
     def sort(self, *args, **kwargs):
+        self._record(None)
         self._mark_as_changed()
         return super(BaseList, self).sort(*args, **kwargs)
 
+    def _record(self, operation, argument=None):
+        """Record a change of the list, None if it isn't an update of the
+        array."""
+        if self._change_base is None:
+            return
+        root = _root_document(self._instance)
+        base = getattr(root, '_changed_fields', None)
+        if base is not self._change_base:
+            # Saved since (the list is the one of the db), or being created
+            self._change_base = _CREATING if base is None else base
+            self._change = ()
+        change = self._change
+        if not change:
+            if operation is None or change is None:
+                self._change = None
+            elif operation == 'pull':
+                self._change = ('pull', [argument])
+            else:
+                self._change = (operation, argument)
+        elif operation == change[0] == 'push':
+            self._change = ('push', change[1] + argument)
+        elif operation == change[0] == 'pull':
+            change[1].append(argument)
+        else:
+            # Can't be written as a single update of the array
+            self._change = None
+
+    def _operation(self):
+        """Return the ``(operation, argument)`` writing the changes of the
+        list since the document holding it was loaded or saved, None if
+        they can't be written that way.
+        """
+        if not self._change or self._change_base is not getattr(
+                _root_document(self._instance), '_changed_fields', None):
+            return None
+        # Changes of the items would be lost with the update of the array
+        for item in super(BaseList, self).__iter__():
+            if isinstance(item, (list, dict)) or (
+                    hasattr(item, '_get_changed_fields') and
+                    not item._is_document and item._get_changed_fields()):
+                return None
+        return self._change
+
     def _mark_as_changed(self, key=None):
         if hasattr(self._instance, '_mark_as_changed'):
-            if key:
-                self._instance._mark_as_changed('%s.%s' % (self._name, 
+            if key is not None:
+                self._instance._mark_as_changed('%s.%s' % (self._name,
                     key % len(self)))
             else:
                 self._instance._mark_as_changed(self._name)
@@ -1,8 +1,10 @@
 import copy
+import itertools
 import operator
 import numbers
+import threading
+import weakref
 from collections import Hashable
-from functools import partial
 
 import pymongo
 from bson import json_util, ObjectId
@@ -11,6 +13,7 @@ from bson.son import SON
 
 from mongoengine import signals
 from mongoengine.common import _import_class
+from mongoengine.context_managers import _get_session
 from mongoengine.errors import (ValidationError, InvalidDocumentError,
                                 LookUpError, FieldDoesNotExist)
 from mongoengine.python_support import PY3, txt_type
@@ -20,14 +23,21 @@ from mongoengine.base.datastructures import (
     BaseList,
     EmbeddedDocumentList,
     StrictDict,
-    SemiStrictDict
+    SemiStrictDict,
+    _untracked
 )
-from mongoengine.base.fields import ComplexBaseField
+from mongoengine.base.fields import BaseField, ComplexBaseField
+from mongoengine.base.lazy import (RawSON, _LazyData, _LazySource,
+                                   lazy_data_class)
 
 __all__ = ('BaseDocument', 'NON_FIELD_ERRORS')
 
 NON_FIELD_ERRORS = '__all__'
 
+# The read-only state of the document being loaded by _from_son in the
+# thread, inherited by the documents embedded in it
+_loading = threading.local()
+
 
 class BaseDocument(object):
     __slots__ = ('_changed_fields', '_initialised', '_created', '_data',
@@ -36,6 +46,8 @@ class BaseDocument(object):
     _dynamic = False
     _dynamic_lock = True
     STRICT = False
+    # Set on the documents loaded by a read-only queryset
+    _readonly = False
 
     def __init__(self, *args, **values):
         """
@@ -67,7 +79,8 @@ class BaseDocument(object):
 
         _created = values.pop("_created", True)
 
-        signals.pre_init.send(self.__class__, document=self, values=values)
+        if signals.has_receivers(signals.pre_init, self.__class__):
+            signals.pre_init.send(self.__class__, document=self, values=values)
 
         # Check if there are undefined fields supplied to the constructor,
         # if so raise an Exception.
@@ -120,9 +133,6 @@ class BaseDocument(object):
                 else:
                     self._data[key] = value
 
-        # Set any get_fieldname_display methods
-        self.__set_field_display()
-
         if self._dynamic:
             self._dynamic_lock = False
             for key, value in dynamic_data.iteritems():
@@ -131,7 +141,8 @@ class BaseDocument(object):
         # Flag initialised
         self._initialised = True
         self._created = _created
-        signals.post_init.send(self.__class__, document=self)
+        if signals.has_receivers(signals.post_init, self.__class__):
+            signals.post_init.send(self.__class__, document=self)
 
     def __delattr__(self, *args, **kwargs):
         """Handle deletions of fields"""
@@ -145,6 +156,11 @@ class BaseDocument(object):
             super(BaseDocument, self).__delattr__(*args, **kwargs)
 
     def __setattr__(self, name, value):
+        if self._readonly:
+            OperationError = _import_class('OperationError')
+            raise OperationError("Read-only %s documents can not be "
+                                 "modified" % self._class_name)
+
         # Handle dynamic data only if an initialised dynamic document
         if self._dynamic and not self._dynamic_lock:
 
@@ -364,9 +380,17 @@ class BaseDocument(object):
 
         return data
 
-    def validate(self, clean=True):
+    def validate(self, clean=True, fields=None):
         """Ensure that all fields' values are valid and that required fields
         are present.
+
+        :param clean: run the :meth:`clean` method of the document
+        :param fields: the names of the fields to validate, all of them if
+            None; the other fields are only checked for being present if
+            they are required
+
+        .. versionchanged:: 0.10.7
+            Added the ``fields`` argument
         """
         # Ensure that each field is matched to a valid value
         errors = {}
@@ -376,19 +400,20 @@ class BaseDocument(object):
             except ValidationError as error:
                 errors[NON_FIELD_ERRORS] = error
 
-        # Get a list of tuples of field names and their current values
-        fields = [(self._fields.get(name, self._dynamic_fields.get(name)),
-                   self._data.get(name)) for name in self._fields_ordered]
-
-        EmbeddedDocumentField = _import_class("EmbeddedDocumentField")
-        GenericEmbeddedDocumentField = _import_class(
-            "GenericEmbeddedDocumentField")
+        validators = self._get_validators()
+        if self._dynamic:
+            validators = validators + [
+                (name, field, False, field.required)
+                for name, field in self._dynamic_fields.iteritems()]
 
-        for field, value in fields:
+        data = self._data
+        for name, field, embedded, required in validators:
+            value = data.get(name)
             if value is not None:
+                if fields is not None and name not in fields:
+                    continue
                 try:
-                    if isinstance(field, (EmbeddedDocumentField,
-                                          GenericEmbeddedDocumentField)):
+                    if embedded:
                         field._validate(value, clean=clean)
                     else:
                         field._validate(value)
@@ -396,7 +421,7 @@ class BaseDocument(object):
                     errors[field.name] = error.errors or error
                 except (ValueError, AttributeError, AssertionError) as error:
                     errors[field.name] = error
-            elif field.required and not getattr(field, '_auto_gen', False):
+            elif required:
                 errors[field.name] = ValidationError('Field is required',
                                                      field_name=field.name)
 
@@ -552,7 +577,11 @@ class BaseDocument(object):
                 return changed_fields
             inspected.add(self.id)
 
+        # The fields still to be decoded can't have changed
+        lazy = isinstance(self._data, _LazyData)
         for field_name in self._fields_ordered:
+            if lazy and not self._data._lazy_loaded(field_name):
+                continue
             db_field_name = self._db_field_map.get(field_name, field_name)
             key = '%s.' % db_field_name
             data = self._data.get(field_name, None)
@@ -587,14 +616,17 @@ class BaseDocument(object):
         """Returns the delta (set, unset) of the changes for a document.
         Gets any values that have been explicitly changed.
         """
-        # Handles cases where not loaded from_son but has _id
-        doc = self.to_mongo()
-
         set_fields = self._get_changed_fields()
         unset_data = {}
         parts = []
         if hasattr(self, '_changed_fields'):
             set_data = {}
+            # Only serialize the fields holding changes
+            roots = set(path.split('.', 1)[0] for path in set_fields)
+            if roots:
+                doc = self.to_mongo(fields=[
+                    self._reverse_db_field_map.get(root, root)
+                    for root in roots])
             # Fetch each set item from its path
             for path in set_fields:
                 parts = path.split('.')
@@ -614,7 +646,8 @@ class BaseDocument(object):
                 path = '.'.join(new_path)
                 set_data[path] = d
         else:
-            set_data = doc
+            # Handles cases where not loaded from_son but has _id
+            set_data = self.to_mongo()
             if '_id' in set_data:
                 del set_data['_id']
 
@@ -665,6 +698,79 @@ class BaseDocument(object):
             unset_data[path] = 1
         return set_data, unset_data
 
+    def _array_updates(self, set_data, unset_data):
+        """Replace the ``$set`` of the whole lists of ``set_data`` (as
+        returned by :meth:`_delta`) by updates of the arrays, when their
+        changes can be written that way (see
+        :class:`~mongoengine.base.datastructures.BaseList`): return the
+        ``$push``, ``$pullAll`` and ``$pop`` operators.  Only the items appended
+        or removed are then sent, and concurrent appends aren't lost.
+        """
+        operators = {}
+        paths = list(set_data) + list(unset_data)
+        for path, value in set_data.items():
+            if not isinstance(value, list):
+                continue
+            array = self._value_at(path)
+            if not isinstance(array, BaseList) or \
+                    not self._holds_array(path, array):
+                continue
+            operation = array._operation()
+            if operation is None:
+                continue
+            # The operators can't update a path and its parts at once
+            if any(other.startswith(path + '.') or
+                   path.startswith(other + '.') for other in paths):
+                continue
+            name, argument = operation
+            if name == 'push':
+                operators.setdefault('$push', {})[path] = {
+                    '$each': value[len(value) - argument:]}
+            elif name == 'pull':
+                field = array._instance._fields.get(array._name)
+                item_field = getattr(field, 'field', None)
+                if item_field is not None:
+                    argument = [item_field.to_mongo(item)
+                                for item in argument]
+                operators.setdefault('$pullAll', {})[path] = argument
+            else:
+                operators.setdefault('$pop', {})[path] = argument
+            del set_data[path]
+        return operators
+
+    def _holds_array(self, path, array):
+        """Whether ``array``, the list at the db ``path``, is the one of
+        the field at ``path`` rather than a list assigned from another field
+        or document, whose changes don't apply to the array in the db."""
+        holder_path, _, db_name = path.rpartition('.')
+        holder = self._value_at(holder_path) if holder_path else self
+        if not isinstance(holder, BaseDocument):
+            return False
+        name = holder._reverse_db_field_map.get(db_name, db_name)
+        try:
+            return (array._name == name and
+                    array._instance._data is holder._data)
+        except ReferenceError:
+            return False
+
+    def _value_at(self, path):
+        """Return the value at the db ``path`` of the document, None if
+        there's none."""
+        value = self
+        for part in path.split('.'):
+            if isinstance(value, list):
+                if not part.isdigit() or int(part) >= len(value):
+                    return None
+                value = value[int(part)]
+            elif isinstance(value, dict):
+                value = value.get(part)
+            elif isinstance(value, BaseDocument):
+                value = value._data.get(
+                    value._reverse_db_field_map.get(part, part))
+            else:
+                return None
+        return value
+
     @classmethod
     def _get_collection_name(cls):
         """Returns the collection name for this class. None for abstract class
@@ -672,21 +778,68 @@ class BaseDocument(object):
         return cls._meta.get('collection', None)
 
     @classmethod
-    def _from_son(cls, son, _auto_dereference=True, only_fields=None, created=False):
-        """Create an instance of a Document (subclass) from a PyMongo SON.
+    def _from_son(cls, son, _auto_dereference=True, only_fields=None,
+                  created=False, _readonly=None, _in_session=True):
+        """Create an instance of a Document (subclass) from a PyMongo SON,
+        read-only if ``_readonly``.  By default, the documents embedded in a
+        read-only document being loaded are read-only, other ones aren't.
+        Unless ``_in_session`` is False (for the documents read from another
+        collection than the one of the class), the instances of the active
+        :class:`~mongoengine.context_managers.session` are reused.
         """
+        loading_readonly = getattr(_loading, 'readonly', False)
+        if _readonly is None:
+            _readonly = loading_readonly
+        elif _readonly != loading_readonly:
+            _loading.readonly = _readonly
+            try:
+                return cls._from_son(son, _auto_dereference, only_fields,
+                                     created, _readonly, _in_session)
+            finally:
+                _loading.readonly = loading_readonly
+
+        # Read-only documents are not shared with the session
+        session = None if _readonly or not _in_session else _get_session()
+        if session is not None and cls._is_document and '_id' in son:
+            obj = session.get(cls, son['_id'])
+            if obj is not None:
+                return obj
+
         if not only_fields:
             only_fields = []
 
         # get the class name from the document, falling back to the given
         # class if unavailable
         class_name = son.get('_cls', cls._class_name)
-        data = dict(("%s" % key, value) for key, value in son.iteritems())
 
         # Return correct subclass for document type
         if class_name != cls._class_name:
             cls = get_document(class_name)
 
+        obj = None
+        plan = cls._get_hydration_plan()
+        if plan.supported:
+            obj = cls._hydrate(plan, son, _auto_dereference, only_fields,
+                               created, _readonly)
+        if obj is None:
+            obj = cls._from_son_init(son, _auto_dereference, only_fields,
+                                     created, _readonly)
+
+        # Partially loaded documents are not shared
+        if session is not None and cls._is_document and '_id' in son and \
+                not only_fields:
+            session._add_loaded(obj, son['_id'])
+        return obj
+
+    @classmethod
+    def _from_son_init(cls, son, _auto_dereference, only_fields, created,
+                       _readonly=False):
+        """Create an instance from a PyMongo SON by going through
+        :meth:`__init__`.  Used whenever the compiled hydration plan can't
+        reproduce the constructor's behaviour.
+        """
+        data = dict(("%s" % key, value) for key, value in son.iteritems())
+
         changed_fields = []
         errors_dict = {}
 
@@ -725,9 +878,201 @@ class BaseDocument(object):
             data = dict((k, v)
                         for k, v in data.iteritems() if k in cls._fields)
         obj = cls(__auto_convert=False, _created=created, __only_fields=only_fields, **data)
-        obj._changed_fields = changed_fields
         if not _auto_dereference:
             obj._fields = fields
+        if _readonly:
+            # Unwrap the lists and dicts the constructor wrapped, the values
+            # loaded and the defaults
+            obj_data = obj._data
+            wrapped = [key for key, value in data.iteritems()
+                       if isinstance(value, (list, tuple, dict))]
+            for key in itertools.chain(wrapped, changed_fields):
+                value = obj_data.get(key)
+                if isinstance(value, (BaseList, BaseDict)):
+                    value = obj_data[key] = _untracked(value)
+                    if key in obj._dynamic_fields:
+                        # Dynamic values are instance attributes as well
+                        object.__setattr__(obj, key, value)
+            if hasattr(obj, '_changed_fields'):
+                del obj._changed_fields
+            obj._readonly = True
+        else:
+            obj._changed_fields = changed_fields
+
+        return obj
+
+    def _get_validators(self):
+        """Return the ``(name, field, embedded, required)`` tuples of the
+        fields :meth:`validate` checks, ``embedded`` telling whether the
+        field validates documents to clean and ``required`` whether a value
+        is needed.  The list is compiled once per class.
+        """
+        cls = self.__class__
+        fields = self._fields
+        cached = cls.__dict__.get('_validators')
+        if (cached is not None and cached[0] is fields and
+                len(cached[1]) == len(fields)):
+            return cached[1]
+
+        EmbeddedDocumentField = _import_class("EmbeddedDocumentField")
+        GenericEmbeddedDocumentField = _import_class(
+            "GenericEmbeddedDocumentField")
+        validators = []
+        for name, field in fields.iteritems():
+            embedded = isinstance(field, (EmbeddedDocumentField,
+                                          GenericEmbeddedDocumentField))
+            required = field.required and not getattr(field, '_auto_gen',
+                                                      False)
+            validators.append((name, field, embedded, required))
+        if fields is cls._fields:
+            cls._validators = (fields, validators)
+        return validators
+
+    @classmethod
+    def _get_hydration_plan(cls):
+        """Return the compiled :class:`_HydrationPlan` for this class,
+        rebuilding it if the class' fields have changed since it was built.
+        """
+        plan = cls._hydration_plan
+        if plan is None or not plan.is_current(cls):
+            plan = _HydrationPlan(cls)
+            cls._hydration_plan = plan
+        return plan
+
+    @classmethod
+    def _hydrate(cls, plan, son, _auto_dereference, only_fields, created,
+                 _readonly=False):
+        """Build an instance from a PyMongo SON using a compiled plan,
+        filling ``_data`` directly instead of calling :meth:`__init__`.
+        Read-only instances are not given any change tracking state.
+
+        Returns ``None`` if the SON needs the generic constructor path
+        (unknown or invalid data, ``pre_init`` receivers, ...), in which case
+        nothing has been modified.
+        """
+        if signals.has_receivers(signals.pre_init, cls):
+            return None
+
+        check_unknown = cls._meta.get('strict', True) or created
+        strict = cls.STRICT
+        by_db_field = plan.by_db_field
+        for field in plan.field_objects:
+            field._auto_dereference = _auto_dereference
+
+        # Convert the SON values, bailing out on anything unusual so that
+        # the constructor can raise the appropriate error.
+        values = {}
+        extras = []
+        _cls = _missing = object()
+        # The fields of a raw document are left pending, to be decoded on
+        # first access
+        pending = {} if (RawSON is not None and isinstance(son, RawSON) and
+                         not _readonly) else None
+        items = son.iteritems() if pending is None else \
+            ((key, _missing) for key in son)
+        for key, value in items:
+            entry = by_db_field.get(key)
+            if entry is None:
+                if value is _missing:
+                    value = son[key]
+                if key in plan.aliased_names:
+                    return None
+                if strict:
+                    continue
+                if key == '_cls':
+                    _cls = value
+                    continue
+                if key in ('id', 'pk'):
+                    return None
+                if check_unknown and key != '_text_score':
+                    return None
+                extras.append((key, value))
+                continue
+
+            name, to_python = entry
+            if value is _missing:
+                pending[name] = (key, to_python)
+                continue
+            if value is not None and to_python is not None:
+                try:
+                    value = to_python(value)
+                except (AttributeError, ValueError):
+                    return None
+            values[name] = value
+
+        fields = cls._fields
+        if not _auto_dereference:
+            fields = copy.copy(fields)
+
+        obj = cls.__new__(cls)
+        obj._initialised = False
+        obj._created = True
+        if pending:
+            obj._data = plan.lazy_data_class(strict)()
+            obj._data._lazy_source = _LazySource(son, pending, obj, plan,
+                                                 _auto_dereference)
+        else:
+            obj._data = plan.data_class(strict)()
+        obj._dynamic_fields = SON()
+
+        skip_defaults = set(only_fields)
+        changed_fields = []
+        for name, field, db_field, plain in plan.fields:
+            if name in values:
+                value = values[name]
+            elif pending and name in pending:
+                continue
+            else:
+                # Mirror the defaults tracking of the constructor path
+                default = field.default
+                if default:
+                    if callable(default):
+                        default = default()
+                    if (isinstance(default, BaseDocument) or
+                            not only_fields or name in only_fields):
+                        changed_fields.append(name)
+                if db_field in skip_defaults:
+                    continue
+                if not plain:
+                    value = field.__get__(obj, cls)
+                elif field.null or default is None:
+                    value = None
+                elif default is field.default and callable(default):
+                    value = default()
+                else:
+                    value = default
+
+            if plain:
+                plan.set_value(obj, name, field, value, _readonly)
+            else:
+                field.__set__(obj, value)
+
+        if _cls is not _missing:
+            obj._cls = _cls
+        elif '_cls' not in values:
+            obj._cls = cls._class_name
+
+        for key, value in extras:
+            obj._data[key] = value
+
+        obj._initialised = True
+        obj._created = created
+        if signals.has_receivers(signals.post_init, cls):
+            signals.post_init.send(cls, document=obj)
+
+        if plan.is_embedded:
+            obj._instance = None
+        if _readonly:
+            if not _auto_dereference:
+                obj._fields = fields
+            obj._readonly = True
+            return obj
+        if not _auto_dereference:
+            # Keep the ordering the copied fields dict would have produced
+            order = dict((name, i) for i, name in enumerate(fields))
+            changed_fields.sort(key=order.__getitem__)
+            obj._fields = fields
+        obj._changed_fields = changed_fields
 
         return obj
 
@@ -999,21 +1344,136 @@ class BaseDocument(object):
         parts = [f.db_field for f in cls._lookup_field(parts)]
         return '.'.join(parts)
 
-    def __set_field_display(self):
-        """Dynamically set the display value for a field with choices"""
-        for attr_name, field in self._fields.items():
-            if field.choices:
-                if self._dynamic:
-                    obj = self
-                else:
-                    obj = type(self)
-                setattr(obj,
-                        'get_%s_display' % attr_name,
-                        partial(self.__get_field_display, field=field))
-
-    def __get_field_display(self, field):
-        """Returns the display value for a choice field"""
-        value = getattr(self, field.name)
-        if field.choices and isinstance(field.choices[0], (list, tuple)):
-            return dict(field.choices).get(value, value)
-        return value
+
+def _class_function(cls, name):
+    """Return the function defining the method ``name`` of ``cls`` (unbound
+    methods being gone in Python 3, they can't be compared across classes).
+    """
+    for klass in cls.__mro__:
+        if name in klass.__dict__:
+            return klass.__dict__[name]
+
+
+class _HydrationPlan(object):
+    """Per-class recipe used by :meth:`BaseDocument._from_son` to turn a SON
+    into a document without going through :meth:`BaseDocument.__init__`.
+
+    The plan maps each ``db_field`` to its field name and ``to_python``
+    converter (``None`` when the field's ``to_python`` is a no-op) and records
+    which fields rely on the plain :class:`BaseField` descriptors, so their
+    values can be written straight into ``_data``.
+    """
+
+    def __init__(self, doc_cls):
+        self.doc_cls = doc_cls
+        self.doc_fields = doc_cls._fields
+        self.num_fields = len(doc_cls._fields)
+        self.db_field_map = doc_cls._db_field_map
+        self.EmbeddedDocument = _import_class('EmbeddedDocument')
+        self.is_embedded = issubclass(doc_cls, self.EmbeddedDocument)
+        self._data_classes = {}
+
+        self.by_db_field = {}
+        self.fields = []
+        self.field_objects = []
+        self.plain_names = set()
+        # Lists of scalars, which can't hold embedded documents
+        self.scalar_lists = set()
+        for name, field in doc_cls._fields.iteritems():
+            db_field = field.db_field
+            field_type = type(field)
+            to_python = field.to_python
+            if _class_function(field_type, 'to_python') is \
+                    BaseField.__dict__['to_python']:
+                to_python = None
+            plain = (_class_function(field_type, '__set__') is
+                     BaseField.__dict__['__set__'] and
+                     _class_function(field_type, '__get__') in (
+                         BaseField.__dict__['__get__'],
+                         ComplexBaseField.__dict__['__get__']))
+            self.by_db_field[db_field] = (name, to_python)
+            self.fields.append((name, field, db_field, plain))
+            self.field_objects.append(field)
+            if plain:
+                self.plain_names.add(name)
+            if getattr(field, 'field', None) is not None and \
+                    field.field._identity_types:
+                self.scalar_lists.add(name)
+
+        # Field names that differ from their db_field; seeing one of them in
+        # a SON means the constructor's key renaming has to sort things out.
+        self.aliased_names = set(
+            name for name, db_field in self.db_field_map.iteritems()
+            if name != db_field)
+
+        self.supported = self._is_supported(doc_cls)
+
+    def _is_supported(self, doc_cls):
+        if doc_cls._dynamic:
+            return False
+
+        # The plan replays BaseDocument.__init__ and __setattr__, so classes
+        # customising either have to go through the constructor.
+        for attr, allowed in (('__init__', (BaseDocument,
+                                            self.EmbeddedDocument)),
+                              ('__setattr__', (BaseDocument,))):
+            owner = next(klass for klass in doc_cls.__mro__
+                         if attr in klass.__dict__)
+            if owner not in allowed:
+                return False
+
+        reverse_map = doc_cls._reverse_db_field_map
+        for name, field, db_field, plain in self.fields:
+            if reverse_map.get(name, name) != name:
+                return False
+            if db_field != name and db_field in self.doc_fields:
+                return False
+        return True
+
+    def is_current(self, doc_cls):
+        """Whether the plan still describes ``doc_cls``."""
+        return (self.doc_cls is doc_cls and
+                self.doc_fields is doc_cls._fields and
+                self.num_fields == len(doc_cls._fields) and
+                self.db_field_map is doc_cls._db_field_map)
+
+    def data_class(self, strict):
+        """The ``_data`` container class for the given ``STRICT`` setting."""
+        try:
+            return self._data_classes[strict]
+        except KeyError:
+            base = StrictDict if strict else SemiStrictDict
+            data_class = base.create(
+                allowed_keys=self.doc_cls._fields_ordered)
+            self._data_classes[strict] = data_class
+            return data_class
+
+    def lazy_data_class(self, strict):
+        """The ``_data`` container class of the documents loaded lazily from
+        a :class:`~mongoengine.base.lazy.RawSON`."""
+        return lazy_data_class(self.data_class(strict))
+
+    def set_value(self, obj, name, field, value, readonly=False):
+        """Equivalent of :meth:`BaseField.__set__` on an uninitialised
+        document, the embedded documents of a ``readonly`` one not being
+        linked to it.
+        """
+        if value is None and not field.null and field.default is not None:
+            value = field.default
+            if callable(value):
+                value = value()
+
+        if readonly:
+            obj._data[name] = value
+            return
+
+        EmbeddedDocument = self.EmbeddedDocument
+        if isinstance(value, EmbeddedDocument):
+            value._instance = weakref.proxy(obj)
+        elif isinstance(value, (list, tuple)) and \
+                name not in self.scalar_lists:
+            for v in value:
+                if isinstance(v, EmbeddedDocument):
+                    v._instance = weakref.proxy(obj)
+
+        obj._data[name] = value
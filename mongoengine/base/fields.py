@@ -1,5 +1,5 @@
-import operator
 import warnings
+from itertools import imap
 import weakref
 
 from bson import DBRef, ObjectId, SON
@@ -9,7 +9,7 @@ from mongoengine.common import _import_class
 from mongoengine.errors import ValidationError
 from mongoengine.base.common import ALLOW_INHERITANCE
 from mongoengine.base.datastructures import (
-    BaseDict, BaseList, EmbeddedDocumentList
+    BaseDict, BaseList, EmbeddedDocumentList, _untracked
 )
 
 __all__ = ("BaseField", "ComplexBaseField",
@@ -32,6 +32,9 @@ class BaseField(object):
     _geo_index = False
     _auto_gen = False  # Call `generate` to generate a value
     _auto_dereference = True
+    # The types of the values to_python returns unchanged, whose lists the
+    # complex fields copy without converting the items
+    _identity_types = ()
 
     # These track each time a Field instance is created. Used to retain order.
     # The auto_creation_counter is used for fields that MongoEngine implicitly
@@ -138,13 +141,18 @@ class BaseField(object):
                 # So mark it as changed
                 instance._mark_as_changed(self.name)
 
+        # Read-only embedded documents are not linked to their owner
         EmbeddedDocument = _import_class('EmbeddedDocument')
         if isinstance(value, EmbeddedDocument):
-            value._instance = weakref.proxy(instance)
+            if not value._readonly:
+                value._instance = weakref.proxy(instance)
         elif isinstance(value, (list, tuple)):
             for v in value:
-                if isinstance(v, EmbeddedDocument):
+                if isinstance(v, EmbeddedDocument) and not v._readonly:
                     v._instance = weakref.proxy(instance)
+            if instance._initialised and isinstance(value, BaseList):
+                # The changes recorded don't apply to the array replaced
+                value._change = None
         instance._data[self.name] = value
 
     def error(self, message="", errors=None, field_name=None):
@@ -222,6 +230,31 @@ class BaseField(object):
         self._set_owner_document(owner_document)
 
 
+_unconverted_types_cache = {}
+
+
+def _unconverted_types(field, method):
+    """Return the types of the values the ``method`` (``'to_python'`` or
+    ``'to_mongo'``) of ``field`` returns unchanged: the ``_identity_types``
+    declared by the class defining its ``to_python``, for ``to_mongo`` only
+    when it is the default one calling ``to_python``.
+    """
+    field_type = type(field)
+    key = (field_type, method)
+    types = _unconverted_types_cache.get(key)
+    if types is None:
+        types = frozenset()
+        owners = {}
+        for name in ('to_python', 'to_mongo'):
+            owners[name] = next(klass for klass in field_type.__mro__
+                                if name in klass.__dict__)
+        if method == 'to_python' or owners['to_mongo'] is BaseField:
+            types = frozenset(
+                owners['to_python'].__dict__.get('_identity_types', ()))
+        _unconverted_types_cache[key] = types
+    return types
+
+
 class ComplexBaseField(BaseField):
     """Handles complex fields, such as lists / dictionaries.
 
@@ -251,10 +284,20 @@ class ComplexBaseField(BaseField):
         _dereference = _import_class("DeReference")()
 
         self._auto_dereference = instance._fields[self.name]._auto_dereference
-        if instance._initialised and dereference and instance._data.get(self.name):
+        data = instance._data.get(self.name)
+        if instance._readonly:
+            # Read-only documents keep their plain lists and dicts
+            if instance._initialised and dereference and data:
+                data = _untracked(_dereference(
+                    data, max_depth=1, instance=instance, name=self.name))
+                instance._data[self.name] = data
+            return data
+
+        # Values already dereferenced (e.g. prefetched) are left alone
+        if (instance._initialised and dereference and data and
+                not getattr(data, '_dereferenced', False)):
             instance._data[self.name] = _dereference(
-                instance._data.get(self.name), max_depth=1, instance=instance,
-                name=self.name
+                data, max_depth=1, instance=instance, name=self.name
             )
 
         value = super(ComplexBaseField, self).__get__(instance, owner)
@@ -291,38 +334,41 @@ class ComplexBaseField(BaseField):
         if hasattr(value, 'to_python'):
             return value.to_python()
 
-        is_list = False
-        if not hasattr(value, 'items'):
-            try:
-                is_list = True
-                value = dict([(k, v) for k, v in enumerate(value)])
-            except TypeError:  # Not iterable return the value
-                return value
+        if hasattr(value, 'items'):
+            return dict((key, self._item_to_python(item))
+                        for key, item in value.items())
 
+        try:
+            items = iter(value)
+        except TypeError:  # Not iterable return the value
+            return value
+        field = self.field
+        if field is None:
+            return [self._item_to_python(item) for item in items]
+
+        field._auto_dereference = self._auto_dereference
+        if not isinstance(value, (list, tuple)):
+            value = list(items)
+        if _unconverted_types(field, 'to_python').issuperset(imap(type, value)):
+            # The items are already what the field would convert them to
+            return list(value)
+        to_python = field.to_python
+        return [to_python(item) for item in value]
+
+    def _item_to_python(self, item):
         if self.field:
-            self.field._auto_dereference = self._auto_dereference
-            value_dict = dict([(key, self.field.to_python(item))
-                               for key, item in value.items()])
-        else:
-            Document = _import_class('Document')
-            value_dict = {}
-            for k, v in value.items():
-                if isinstance(v, Document):
-                    # We need the id from the saved object to create the DBRef
-                    if v.pk is None:
-                        self.error('You can only reference documents once they'
-                                   ' have been saved to the database')
-                    collection = v._get_collection_name()
-                    value_dict[k] = DBRef(collection, v.pk)
-                elif hasattr(v, 'to_python'):
-                    value_dict[k] = v.to_python()
-                else:
-                    value_dict[k] = self.to_python(v)
-
-        if is_list:  # Convert back to a list
-            return [v for _, v in sorted(value_dict.items(),
-                                         key=operator.itemgetter(0))]
-        return value_dict
+            return self.field.to_python(item)
+        Document = _import_class('Document')
+        if isinstance(item, Document):
+            # We need the id from the saved object to create the DBRef
+            if item.pk is None:
+                self.error('You can only reference documents once they'
+                           ' have been saved to the database')
+            collection = item._get_collection_name()
+            return DBRef(collection, item.pk)
+        elif hasattr(item, 'to_python'):
+            return item.to_python()
+        return self.to_python(item)
 
     def to_mongo(self, value, **kwargs):
         """Convert a Python type to a MongoDB-compatible type.
@@ -345,53 +391,56 @@ class ComplexBaseField(BaseField):
                 val['_cls'] = cls.__name__
             return val
 
-        is_list = False
-        if not hasattr(value, 'items'):
-            try:
-                is_list = True
-                value = dict([(k, v) for k, v in enumerate(value)])
-            except TypeError:  # Not iterable return the value
-                return value
+        if hasattr(value, 'items'):
+            return dict((key, self._item_to_mongo(item, kwargs))
+                        for key, item in value.iteritems())
 
+        try:
+            items = iter(value)
+        except TypeError:  # Not iterable return the value
+            return value
+        field = self.field
+        if field is None:
+            return [self._item_to_mongo(item, kwargs) for item in items]
+
+        if not isinstance(value, (list, tuple)):
+            value = list(items)
+        if _unconverted_types(field, 'to_mongo').issuperset(imap(type, value)):
+            return list(value)
+        to_mongo = field.to_mongo
+        return [to_mongo(item, **kwargs) for item in value]
+
+    def _item_to_mongo(self, item, kwargs):
         if self.field:
-            value_dict = dict([(key, self.field.to_mongo(item, **kwargs))
-                               for key, item in value.iteritems()])
-        else:
-            value_dict = {}
-            for k, v in value.iteritems():
-                if isinstance(v, Document):
-                    # We need the id from the saved object to create the DBRef
-                    if v.pk is None:
-                        self.error('You can only reference documents once they'
-                                   ' have been saved to the database')
-
-                    # If its a document that is not inheritable it won't have
-                    # any _cls data so make it a generic reference allows
-                    # us to dereference
-                    meta = getattr(v, '_meta', {})
-                    allow_inheritance = (
-                        meta.get('allow_inheritance', ALLOW_INHERITANCE)
-                        is True)
-                    if not allow_inheritance and not self.field:
-                        value_dict[k] = GenericReferenceField().to_mongo(
-                            v, **kwargs)
-                    else:
-                        collection = v._get_collection_name()
-                        value_dict[k] = DBRef(collection, v.pk)
-                elif hasattr(v, 'to_mongo'):
-                    cls = v.__class__
-                    val = v.to_mongo(**kwargs)
-                    # If it's a document that is not inherited add _cls
-                    if isinstance(v, (Document, EmbeddedDocument)):
-                        val['_cls'] = cls.__name__
-                    value_dict[k] = val
-                else:
-                    value_dict[k] = self.to_mongo(v, **kwargs)
-
-        if is_list:  # Convert back to a list
-            return [v for _, v in sorted(value_dict.items(),
-                                         key=operator.itemgetter(0))]
-        return value_dict
+            return self.field.to_mongo(item, **kwargs)
+        Document = _import_class("Document")
+        EmbeddedDocument = _import_class("EmbeddedDocument")
+        GenericReferenceField = _import_class("GenericReferenceField")
+        if isinstance(item, Document):
+            # We need the id from the saved object to create the DBRef
+            if item.pk is None:
+                self.error('You can only reference documents once they'
+                           ' have been saved to the database')
+
+            # If its a document that is not inheritable it won't have
+            # any _cls data so make it a generic reference allows
+            # us to dereference
+            meta = getattr(item, '_meta', {})
+            allow_inheritance = (
+                meta.get('allow_inheritance', ALLOW_INHERITANCE)
+                is True)
+            if not allow_inheritance:
+                return GenericReferenceField().to_mongo(item, **kwargs)
+            collection = item._get_collection_name()
+            return DBRef(collection, item.pk)
+        elif hasattr(item, 'to_mongo'):
+            cls = item.__class__
+            val = item.to_mongo(**kwargs)
+            # If it's a document that is not inherited add _cls
+            if isinstance(item, (Document, EmbeddedDocument)):
+                val['_cls'] = cls.__name__
+            return val
+        return self.to_mongo(item, **kwargs)
 
     def validate(self, value):
         """If field is provided ensure the value is valid.
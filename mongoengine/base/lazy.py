@@ -0,0 +1,245 @@
+"""Lazy loading of documents from their raw BSON.
+
+A queryset in :meth:`~mongoengine.queryset.QuerySet.lazy` mode fetches the
+documents as :class:`RawSON`, which keep the BSON bytes read from the
+server.  :meth:`~mongoengine.base.BaseDocument._from_son` then leaves the
+fields undecoded in the ``_data`` of the document (see
+:func:`lazy_data_class`): each one is decoded and converted by its field on
+first access, the other fields costing nothing.
+"""
+import struct
+import weakref
+
+from mongoengine.common import _import_class
+from mongoengine.errors import InvalidDocumentError
+
+try:
+    from bson.codec_options import DEFAULT_CODEC_OPTIONS
+    from bson.raw_bson import RawBSONDocument
+    from bson import BSON
+except ImportError:
+    RawBSONDocument = None
+
+__all__ = ('RawSON', 'LAZY_LOADING_AVAILABLE')
+
+LAZY_LOADING_AVAILABLE = RawBSONDocument is not None
+
+_INT = struct.Struct('<i')
+
+# Size of the values of the fixed size BSON types, by type byte
+_FIXED_SIZES = {0x01: 8, 0x06: 0, 0x07: 12, 0x08: 1, 0x09: 8, 0x0A: 0,
+                0x10: 4, 0x11: 8, 0x12: 8, 0x13: 16, 0x7F: 0, 0xFF: 0}
+
+
+def _value_size(raw, element_type, position):
+    """Return the size of the value of type ``element_type`` starting at
+    ``position`` in the BSON ``raw``."""
+    size = _FIXED_SIZES.get(element_type)
+    if size is not None:
+        return size
+    if element_type in (0x03, 0x04, 0x0F):
+        # Embedded document, array, code with scope
+        return _INT.unpack_from(raw, position)[0]
+    if element_type in (0x02, 0x0D, 0x0E):
+        # String, code, symbol
+        return 4 + _INT.unpack_from(raw, position)[0]
+    if element_type == 0x05:
+        return 5 + _INT.unpack_from(raw, position)[0]
+    if element_type == 0x0B:
+        # Regular expression: pattern and options cstrings
+        end = raw.index(b'\x00', raw.index(b'\x00', position) + 1)
+        return end + 1 - position
+    if element_type == 0x0C:
+        # DBPointer
+        return 16 + _INT.unpack_from(raw, position)[0]
+    raise InvalidDocumentError('Unknown BSON type %#x' % element_type)
+
+
+if LAZY_LOADING_AVAILABLE:
+
+    class RawSON(RawBSONDocument):
+        """A :class:`~bson.raw_bson.RawBSONDocument` decoding its top level
+        values one by one as they are read, instead of all at once.
+
+        .. versionadded:: 0.10.7
+        """
+
+        __slots__ = ('_elements', '_options')
+
+        def __init__(self, bson_bytes, codec_options=None):
+            if codec_options is None:
+                codec_options = self.codec_options(DEFAULT_CODEC_OPTIONS)
+            super(RawSON, self).__init__(
+                bson_bytes,
+                codec_options._replace(document_class=RawBSONDocument))
+            self._elements = None
+            # The values are decoded into plain dicts
+            self._options = codec_options._replace(document_class=dict)
+
+        @classmethod
+        def codec_options(cls, codec_options):
+            """Return ``codec_options`` decoding the documents as
+            :class:`RawSON`."""
+            return codec_options._replace(document_class=cls)
+
+        def _index(self):
+            """Map the keys of the document to the ``(element start, value
+            start, value end)`` of their element in the BSON."""
+            elements = self._elements
+            if elements is None:
+                elements = self._elements = {}
+                raw = self.raw
+                end = len(raw) - 1
+                position = 4
+                while position < end:
+                    element_type = ord(raw[position:position + 1])
+                    name_end = raw.index(b'\x00', position + 1)
+                    value_start = name_end + 1
+                    value_end = value_start + _value_size(
+                        raw, element_type, value_start)
+                    name = raw[position + 1:name_end].decode('utf-8')
+                    elements[name] = (position, value_start, value_end)
+                    position = value_end
+            return elements
+
+        def __getitem__(self, key):
+            start, value_start, value_end = self._index()[key]
+            element = self.raw[start:value_end]
+            son = BSON(_INT.pack(len(element) + 5) + element + b'\x00')
+            return son.decode(self._options)[key]
+
+        def binary(self, key):
+            """Return a :class:`memoryview` of the BSON of the generic binary
+            value ``key``, None if it is another type of value."""
+            start, value_start, value_end = self._index()[key]
+            raw = self.raw
+            if ord(raw[start:start + 1]) != 0x05 or \
+                    raw[value_start + 4:value_start + 5] != b'\x00':
+                return None
+            return memoryview(raw)[value_start + 5:value_end]
+
+        def __iter__(self):
+            return iter(self._index())
+
+        def __len__(self):
+            return len(self._index())
+
+        def __contains__(self, key):
+            return key in self._index()
+
+        def items(self):
+            return [(key, self[key]) for key in self]
+
+else:
+    RawSON = None
+
+
+class _LazySource(object):
+    """The undecoded fields of a document: ``pending`` maps their names to
+    their ``(db_field, to_python)``."""
+
+    __slots__ = ('son', 'pending', 'owner', 'plan', 'auto_dereference')
+
+    def __init__(self, son, pending, owner, plan, auto_dereference):
+        self.son = son
+        self.pending = pending
+        self.owner = weakref.ref(owner)
+        self.plan = plan
+        self.auto_dereference = auto_dereference
+
+    def load(self, name):
+        """Decode and convert the field ``name``, and set it on the
+        document."""
+        db_field, to_python = self.pending.pop(name)
+        son = self.son
+        if not self.pending:
+            self.son = None
+        owner = self.owner()
+        field = owner._fields[name]
+        field._auto_dereference = self.auto_dereference
+
+        value = None
+        if isinstance(field, _import_class('BinaryField')):
+            value = son.binary(db_field)
+        if value is None:
+            value = son[db_field]
+            if value is not None and to_python is not None:
+                try:
+                    value = to_python(value)
+                except (AttributeError, ValueError) as e:
+                    raise InvalidDocumentError(
+                        'Invalid data to create a `%s` instance.\n%s - %s'
+                        % (owner._class_name, name, e))
+
+        if name in self.plan.plain_names:
+            self.plan.set_value(owner, name, field, value)
+        else:
+            # Set like the constructor does, without marking as changed
+            initialised = owner._initialised
+            owner._initialised = False
+            try:
+                field.__set__(owner, value)
+            finally:
+                owner._initialised = initialised
+
+
+class _LazyData(object):
+    """Mixin of the ``_data`` of the lazily loaded documents, loading their
+    fields on first access."""
+
+    __slots__ = ()
+
+    def __getattr__(self, attr):
+        if attr != '_lazy_source':
+            source = self._lazy_source
+            if source is not None:
+                name = attr
+                if attr.startswith('_reserved_'):
+                    name = attr[len('_reserved_'):]
+                if name in source.pending:
+                    source.load(name)
+                    return getattr(self, attr)
+        try:
+            getattr_ = super(_LazyData, self).__getattr__
+        except AttributeError:
+            raise AttributeError(attr)
+        return getattr_(attr)
+
+    def __setattr__(self, attr, value):
+        if attr != '_lazy_source':
+            self._lazy_forget(attr)
+        super(_LazyData, self).__setattr__(attr, value)
+
+    def __delattr__(self, attr):
+        self._lazy_forget(attr)
+        super(_LazyData, self).__delattr__(attr)
+
+    def _lazy_forget(self, attr):
+        source = self._lazy_source
+        if source is not None:
+            if attr.startswith('_reserved_'):
+                attr = attr[len('_reserved_'):]
+            source.pending.pop(attr, None)
+
+    def _lazy_loaded(self, name):
+        """Whether the field ``name`` has been decoded."""
+        source = self._lazy_source
+        return source is None or name not in source.pending
+
+
+_lazy_classes = {}
+
+
+def lazy_data_class(data_class):
+    """Return the lazy version of the ``_data`` class ``data_class``, a
+    :class:`~mongoengine.base.datastructures.StrictDict` class."""
+    lazy_class = _lazy_classes.get(data_class)
+    if lazy_class is None:
+        lazy_class = type('Lazy' + data_class.__name__,
+                          (_LazyData, data_class),
+                          {'__slots__': ('_lazy_source',)})
+        # StrictDict iterates over the keys in __slots__, which the class
+        # no longer reads once created
+        lazy_class.__slots__ = data_class.__slots__
+        lazy_class = _lazy_classes.setdefault(data_class, lazy_class)
+    return lazy_class
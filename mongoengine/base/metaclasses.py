@@ -1,12 +1,13 @@
 import warnings
 
 from mongoengine.common import _import_class
+from mongoengine.connection import ConnectionError
 from mongoengine.errors import InvalidDocumentError
 from mongoengine.python_support import PY3
 from mongoengine.signals import _signals
 from mongoengine.queryset import (DO_NOTHING, DoesNotExist,
                                   MultipleObjectsReturned,
-                                  QuerySetManager)
+                                  QuerySetManager, AsyncQuerySetManager)
 
 from mongoengine.base.common import _document_registry, ALLOW_INHERITANCE
 from mongoengine.base.fields import BaseField, ComplexBaseField, ObjectIdField
@@ -14,6 +15,24 @@ from mongoengine.base.fields import BaseField, ComplexBaseField, ObjectIdField
 __all__ = ('DocumentMetaclass', 'TopLevelDocumentMetaclass')
 
 
+def _choices_display(field_name, choices):
+    """Return the method returning the display value of the choice of the
+    field ``field_name``, its label when ``choices`` are pairs.
+    """
+    if isinstance(choices[0], (list, tuple)):
+        labels = dict(choices)
+
+        def get_display(self):
+            value = getattr(self, field_name)
+            return labels.get(value, value)
+    else:
+        def get_display(self):
+            return getattr(self, field_name)
+    get_display.__name__ = 'get_%s_display' % field_name
+    get_display._choices = choices
+    return get_display
+
+
 class DocumentMetaclass(type):
     """Metaclass for all documents.
     """
@@ -29,6 +48,8 @@ class DocumentMetaclass(type):
 
         attrs['_is_document'] = attrs.get('_is_document', False)
         attrs['_cached_reference_fields'] = []
+        # Compiled lazily by BaseDocument._from_son
+        attrs['_hydration_plan'] = None
 
         # EmbeddedDocuments could have meta data for inheritance
         if 'meta' in attrs:
@@ -103,6 +124,19 @@ class DocumentMetaclass(type):
                                          (v.creation_counter, v.name)
                                          for v in doc_fields.itervalues()))
 
+        # Add the get_<field>_display methods of the fields with choices,
+        # keeping the ones the class or its bases define
+        for field_name, field in doc_fields.iteritems():
+            method_name = 'get_%s_display' % field_name
+            if not field.choices or method_name in attrs:
+                continue
+            inherited = next((base.__dict__[method_name]
+                              for base in flattened_bases
+                              if method_name in base.__dict__), None)
+            if inherited is None or hasattr(inherited, '_choices'):
+                attrs[method_name] = _choices_display(field_name,
+                                                      field.choices)
+
         #
         # Set document hierarchy
         #
@@ -366,6 +400,8 @@ class TopLevelDocumentMetaclass(DocumentMetaclass):
         # Provide a default queryset unless exists or one has been set
         if 'objects' not in dir(new_class):
             new_class.objects = QuerySetManager()
+        if 'aobjects' not in dir(new_class):
+            new_class.aobjects = AsyncQuerySetManager()
 
         # Validate the fields and set primary key if needed
         for field_name, field in new_class._fields.iteritems():
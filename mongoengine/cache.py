@@ -0,0 +1,245 @@
+"""Process-wide read-through cache of documents.
+
+A document class opts in with the ``cache`` option of its meta::
+
+    class Country(Document):
+        code = StringField(primary_key=True)
+        name = StringField()
+        meta = {'cache': {'backend': 'lru', 'max_size': 50000, 'ttl': 30}}
+
+The documents of the collection are then kept in the cache, as BSON keyed
+by ``_id``, once read by id: :meth:`~mongoengine.queryset.QuerySet.get` and
+:meth:`~mongoengine.queryset.QuerySet.first` on a query on the id only,
+:meth:`~mongoengine.queryset.QuerySet.with_id`,
+:meth:`~mongoengine.queryset.QuerySet.in_bulk` and the dereferencing of the
+references to them read through the cache.  The writes made through
+MongoEngine invalidate the cached documents they may change; entries also
+expire after ``ttl`` seconds, which bounds how stale a document written by
+another process can be.
+
+The ``backend`` is either the name of a registered backend (``'lru'``, an
+in-process LRU, being the default) or a :class:`BaseCache` subclass, the
+other options being passed to its constructor.
+"""
+import threading
+import time
+
+from bson import BSON
+
+from mongoengine.connection import DEFAULT_CONNECTION_NAME
+from mongoengine.errors import InvalidDocumentError
+from mongoengine.python_support import IS_PYMONGO_3
+
+if IS_PYMONGO_3:
+    from bson.codec_options import CodecOptions, DEFAULT_CODEC_OPTIONS
+
+__all__ = ('BaseCache', 'LRUCache', 'register_cache_backend',
+           'get_document_cache')
+
+
+class BaseCache(object):
+    """Base class of the cache backends.  A backend holds the documents of
+    one collection, mapping their ``_id`` to their BSON encoding (a byte
+    string): a backend shared between processes (memcached, redis, ...)
+    only has to prefix the keys with :attr:`namespace` to store them.
+
+    :attr:`hits` and :attr:`misses` count the documents read from the
+    cache and the ones fetched from the database.
+
+    .. versionadded:: 0.10.7
+    """
+
+    def __init__(self, namespace):
+        """
+        :param namespace: the ``<alias>.<collection>`` the cache is used for
+        """
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys):
+        """Return a dict of the cached values of ``keys``, the keys not in
+        the cache being left out."""
+        raise NotImplementedError
+
+    def set_many(self, mapping):
+        """Cache the values of the dict ``mapping``."""
+        raise NotImplementedError
+
+    def delete_many(self, keys):
+        """Remove ``keys`` from the cache."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove all the keys from the cache."""
+        raise NotImplementedError
+
+    def stats(self):
+        """Return the hit and miss counters as a dict."""
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+# Fields of the links of the LRU list
+_PREV, _NEXT, _KEY, _VALUE, _EXPIRES = range(5)
+
+
+class LRUCache(BaseCache):
+    """In-process cache evicting the least recently used documents beyond
+    ``max_size`` of them, and the ones cached for more than ``ttl`` seconds.
+
+    .. versionadded:: 0.10.7
+    """
+
+    def __init__(self, namespace, max_size=10000, ttl=None):
+        super(LRUCache, self).__init__(namespace)
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        # Circular doubly linked list, oldest first, around a sentinel
+        root = []
+        root[:] = [root, root, None, None, None]
+        self._root = root
+        self._links = {}
+
+    def __len__(self):
+        return len(self._links)
+
+    def _unlink(self, link):
+        link[_PREV][_NEXT] = link[_NEXT]
+        link[_NEXT][_PREV] = link[_PREV]
+
+    def _append(self, link):
+        root = self._root
+        last = root[_PREV]
+        link[_PREV] = last
+        link[_NEXT] = root
+        last[_NEXT] = root[_PREV] = link
+
+    def get_many(self, keys):
+        found = {}
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                link = self._links.get(key)
+                if link is None:
+                    continue
+                self._unlink(link)
+                if link[_EXPIRES] is not None and link[_EXPIRES] <= now:
+                    del self._links[key]
+                    continue
+                self._append(link)
+                found[key] = link[_VALUE]
+        return found
+
+    def set_many(self, mapping):
+        expires = None if self.ttl is None else time.time() + self.ttl
+        links = self._links
+        with self._lock:
+            for key, value in mapping.iteritems():
+                link = links.pop(key, None)
+                if link is not None:
+                    self._unlink(link)
+                links[key] = link = [None, None, key, value, expires]
+                self._append(link)
+            while len(links) > self.max_size:
+                oldest = self._root[_NEXT]
+                self._unlink(oldest)
+                del links[oldest[_KEY]]
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                link = self._links.pop(key, None)
+                if link is not None:
+                    self._unlink(link)
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+
+_backends = {'lru': LRUCache}
+_caches = {}
+
+
+def register_cache_backend(name, backend_class):
+    """Make the :class:`BaseCache` subclass ``backend_class`` usable as the
+    ``backend`` of the ``cache`` meta option under ``name``.
+
+    .. versionadded:: 0.10.7
+    """
+    _backends[name] = backend_class
+
+
+def get_document_cache(doc_cls):
+    """Return the cache of the documents of ``doc_cls``, None if the class
+    is not cached.  The classes stored in a same collection share its cache.
+
+    .. versionadded:: 0.10.7
+    """
+    options = doc_cls._meta.get('cache')
+    if not options:
+        return None
+    key = (doc_cls._meta.get('db_alias', DEFAULT_CONNECTION_NAME),
+           doc_cls._get_collection_name())
+    cache = _caches.get(key)
+    if cache is None:
+        options = dict(options)
+        backend = options.pop('backend', 'lru')
+        if isinstance(backend, basestring):
+            if backend not in _backends:
+                raise InvalidDocumentError('Unknown cache backend "%s"'
+                                           % backend)
+            backend = _backends[backend]
+        cache = _caches.setdefault(key, backend('%s.%s' % key, **options))
+    return cache
+
+
+def _decode(data, collection):
+    if IS_PYMONGO_3:
+        options = getattr(collection, 'codec_options', None)
+        if not isinstance(options, CodecOptions):
+            options = DEFAULT_CODEC_OPTIONS
+        return BSON(data).decode(options)
+    tz_aware = getattr(collection, 'tz_aware', False)
+    return BSON(data).decode(tz_aware=tz_aware is True)
+
+
+def fetch_documents(doc_cls, cache, object_ids, collection=None):
+    """Return a dict of the raw documents of ``doc_cls`` with the ids
+    ``object_ids``, read from ``cache`` or else fetched with one query and
+    cached.
+    """
+    if collection is None:
+        collection = doc_cls._get_collection()
+    found = cache.get_many(object_ids)
+    documents = dict((object_id, _decode(data, collection))
+                     for object_id, data in found.iteritems())
+    cache.hits += len(found)
+
+    missing = [object_id for object_id in object_ids
+               if object_id not in found]
+    if missing:
+        cache.misses += len(missing)
+        fetched = {}
+        for son in collection.find({'_id': {'$in': missing}}):
+            documents[son['_id']] = son
+            fetched[son['_id']] = BSON.encode(son)
+        cache.set_many(fetched)
+    return documents
+
+
+def invalidate(doc_cls, object_ids=None):
+    """Remove the documents with the ids ``object_ids`` from the cache of
+    ``doc_cls``, all of them if None.
+    """
+    cache = get_document_cache(doc_cls)
+    if cache is None:
+        return
+    if object_ids is None:
+        cache.clear()
+    else:
+        cache.delete_many(object_ids)
@@ -2,7 +2,7 @@ from pymongo import MongoClient, ReadPreference, uri_parser
 from mongoengine.python_support import IS_PYMONGO_3
 
 __all__ = ['ConnectionError', 'connect', 'register_connection',
-           'DEFAULT_CONNECTION_NAME']
+           'DEFAULT_CONNECTION_NAME', 'get_async_connection', 'get_async_db']
 
 
 DEFAULT_CONNECTION_NAME = 'default'
@@ -19,7 +19,10 @@ class ConnectionError(Exception):
 
 _connection_settings = {}
 _connections = {}
+_command_monitors = {}
 _dbs = {}
+_async_connections = {}
+_async_dbs = {}
 
 
 def register_connection(alias, name=None, host=None, port=None,
@@ -93,6 +96,36 @@ def disconnect(alias=DEFAULT_CONNECTION_NAME):
         del _connections[alias]
     if alias in _dbs:
         del _dbs[alias]
+    _command_monitors.pop(alias, None)
+    if alias in _async_connections:
+        _async_connections.pop(alias).close()
+    if alias in _async_dbs:
+        del _async_dbs[alias]
+
+
+def _forget_connections(settings=None):
+    """Forget the clients of the connections without closing them, new ones
+    being created on next use: a forked process must not use the clients
+    of its parent.  ``settings`` replace the settings of the connections.
+    """
+    if settings is not None:
+        _connection_settings.clear()
+        _connection_settings.update(settings)
+    _connections.clear()
+    _dbs.clear()
+    _command_monitors.clear()
+    _async_connections.clear()
+    _async_dbs.clear()
+
+
+def _get_alias(db):
+    """Return the alias of the connection of the database ``db``, None if
+    it wasn't opened through :func:`get_db`.
+    """
+    for alias, alias_db in _dbs.iteritems():
+        if alias_db is db:
+            return alias
+    return None
 
 
 def get_connection(alias=DEFAULT_CONNECTION_NAME, reconnect=False):
@@ -149,14 +182,34 @@ def get_connection(alias=DEFAULT_CONNECTION_NAME, reconnect=False):
                 connection_settings.pop('authentication_source', None)
                 if conn_settings == connection_settings and _connections.get(db_alias, None):
                     connection = _connections[db_alias]
+                    _command_monitors[alias] = _command_monitors.get(db_alias)
                     break
 
-            _connections[alias] = connection if connection else connection_class(**conn_settings)
+            if not connection:
+                monitor = None
+                if not is_mock:
+                    from mongoengine.monitoring import (CommandMonitor,
+                                                        MONITORING_AVAILABLE)
+                    if MONITORING_AVAILABLE:
+                        monitor = CommandMonitor()
+                        conn_settings['event_listeners'] = list(
+                            conn_settings.get('event_listeners', ())) + [monitor]
+                connection = connection_class(**conn_settings)
+                _command_monitors[alias] = monitor
+            _connections[alias] = connection
         except Exception as e:
             raise ConnectionError("Cannot connect to database %s :\n%s" % (alias, e))
     return _connections[alias]
 
 
+def _get_command_monitor(alias=DEFAULT_CONNECTION_NAME):
+    """Return the :class:`~mongoengine.monitoring.CommandMonitor` of the
+    client of a connection, None if the client isn't monitored.
+    """
+    get_connection(alias)
+    return _command_monitors.get(alias)
+
+
 def get_db(alias=DEFAULT_CONNECTION_NAME, reconnect=False):
     global _dbs
     if reconnect:
@@ -175,6 +228,69 @@ def get_db(alias=DEFAULT_CONNECTION_NAME, reconnect=False):
     return _dbs[alias]
 
 
+def get_async_connection(alias=DEFAULT_CONNECTION_NAME):
+    """Return the asyncio client of a connection: a Motor
+    :class:`~motor.motor_asyncio.AsyncIOMotorClient` created with the
+    settings of the connection, or a wrapper around its mongomock client
+    when the connection is mocked.
+
+    .. versionadded:: 0.10.7
+    """
+    if alias not in _async_connections:
+        if alias not in _connection_settings:
+            msg = 'Connection with alias "%s" has not been defined' % alias
+            if alias == DEFAULT_CONNECTION_NAME:
+                msg = 'You have not defined a default connection'
+            raise ConnectionError(msg)
+        conn_settings = _connection_settings[alias].copy()
+
+        if conn_settings.get('is_mock'):
+            from mongoengine.async_support import AsyncMockClient
+            _async_connections[alias] = AsyncMockClient(get_connection(alias))
+            return _async_connections[alias]
+
+        try:
+            from motor.motor_asyncio import AsyncIOMotorClient
+        except ImportError:
+            raise RuntimeError('You need motor installed to use the asyncio '
+                               'API of MongoEngine.')
+
+        conn_settings.pop('name', None)
+        conn_settings.pop('is_mock', None)
+        # Motor authenticates the connection itself
+        authentication_source = conn_settings.pop('authentication_source',
+                                                  None)
+        if conn_settings['username'] and conn_settings['password']:
+            if authentication_source:
+                conn_settings['authSource'] = authentication_source
+        else:
+            conn_settings.pop('username', None)
+            conn_settings.pop('password', None)
+
+        if 'replicaSet' in conn_settings:
+            conn_settings.pop('port', None)
+            if not isinstance(conn_settings['replicaSet'], basestring):
+                conn_settings.pop('replicaSet', None)
+
+        try:
+            _async_connections[alias] = AsyncIOMotorClient(**conn_settings)
+        except Exception as e:
+            raise ConnectionError("Cannot connect to database %s :\n%s" % (alias, e))
+    return _async_connections[alias]
+
+
+def get_async_db(alias=DEFAULT_CONNECTION_NAME):
+    """Return the asyncio database of a connection, see
+    :func:`get_async_connection`.
+
+    .. versionadded:: 0.10.7
+    """
+    if alias not in _async_dbs:
+        conn = get_async_connection(alias)
+        _async_dbs[alias] = conn[_connection_settings[alias]['name']]
+    return _async_dbs[alias]
+
+
 def connect(db=None, alias=DEFAULT_CONNECTION_NAME, **kwargs):
     """Connect to the database specified by the 'db' argument.
 
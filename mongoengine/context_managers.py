@@ -1,9 +1,12 @@
+import threading
+
 from mongoengine.common import _import_class
-from mongoengine.connection import DEFAULT_CONNECTION_NAME, get_db
+from mongoengine.connection import (DEFAULT_CONNECTION_NAME, get_db,
+                                    _get_command_monitor)
 
 
 __all__ = ("switch_db", "switch_collection", "no_dereference",
-           "no_sub_classes", "query_counter")
+           "no_sub_classes", "query_counter", "session")
 
 
 class switch_db(object):
@@ -162,15 +165,32 @@ class no_sub_classes(object):
 
 
 class query_counter(object):
-    """ Query_counter context manager to get the number of queries. """
+    """ Query_counter context manager to get the number of queries.
+
+    The commands sent through the connection ``alias`` are counted on the
+    client side through PyMongo's command monitoring; with PyMongo 2 or a
+    mocked connection, the server's profiler is used instead.
+
+    .. versionchanged:: 0.10.7
+        Count the commands with PyMongo's command monitoring, added the
+        ``alias`` argument
+    """
 
-    def __init__(self):
+    # Commands not counted as queries
+    ignored_commands = frozenset(['createIndexes', 'killCursors'])
+
+    def __init__(self, alias=DEFAULT_CONNECTION_NAME):
         """ Construct the query_counter. """
         self.counter = 0
-        self.db = get_db()
+        self.db = get_db(alias)
+        self.monitor = _get_command_monitor(alias)
 
     def __enter__(self):
         """ On every with block we need to drop the profile collection. """
+        if self.monitor is not None:
+            self.counter = 0
+            self.monitor.counters.append(self)
+            return self
         self.db.set_profiling_level(0)
         self.db.system.profile.drop()
         self.db.set_profiling_level(2)
@@ -178,8 +198,15 @@ class query_counter(object):
 
     def __exit__(self, t, value, traceback):
         """ Reset the profiling level. """
+        if self.monitor is not None:
+            self.monitor.counters.remove(self)
+            return
         self.db.set_profiling_level(0)
 
+    def _command_started(self, command_name):
+        if command_name not in self.ignored_commands:
+            self.counter += 1
+
     def __eq__(self, value):
         """ == Compare querycounter. """
         counter = self._get_count()
@@ -215,7 +242,134 @@ class query_counter(object):
 
     def _get_count(self):
         """ Get the number of queries. """
+        if self.monitor is not None:
+            return self.counter
         ignore_query = {"ns": {"$ne": "%s.system.indexes" % self.db.name}}
         count = self.db.system.profile.find(ignore_query).count() - self.counter
         self.counter += 1
         return count
+
+
+_session_state = threading.local()
+
+
+def _get_session():
+    """ Return the innermost session active in the current thread, if any. """
+    sessions = getattr(_session_state, 'sessions', None)
+    if sessions:
+        return sessions[-1]
+    return None
+
+
+class session(object):
+    """ session context manager.
+
+    Keeps an identity map of the documents loaded within the context, per
+    collection and primary key: loading a document already loaded (through
+    a query, a reference, :meth:`~mongoengine.queryset.QuerySet.in_bulk`
+    or :meth:`~mongoengine.queryset.QuerySet.with_id`) returns the same
+    instance, without fetching it again when its id is known upfront.  The
+    documents changed within the context are saved on exit, with one bulk
+    write per document class::
+
+        with session():
+            user = User.objects.get(name='Ross')
+            post.author.name = 'Bob'  # No query: post.author is user
+            # user is saved on exit
+
+    Sessions are per thread; nothing is flushed if the block raises.  Only
+    the documents of the collections of their classes are kept: the ones
+    read from another database or collection (e.g. with
+    :meth:`~mongoengine.queryset.QuerySet.using`) or switched with
+    :meth:`~mongoengine.Document.switch_db` aren't.
+
+    .. versionadded:: 0.10.7
+    """
+
+    def __init__(self, flush=True):
+        """ Construct the session context manager.
+
+        :param flush: save the changed documents on exit
+        """
+        self.autoflush = flush
+        self.identity_map = {}
+        self._new = []
+
+    def __enter__(self):
+        """ make the session the active one """
+        if getattr(_session_state, 'sessions', None) is None:
+            _session_state.sessions = []
+        _session_state.sessions.append(self)
+        return self
+
+    def __exit__(self, t, value, traceback):
+        """ flush the changes and deactivate the session """
+        _session_state.sessions.remove(self)
+        if t is None and self.autoflush:
+            self.flush()
+
+    @staticmethod
+    def _key(doc_cls, object_id):
+        return (doc_cls._meta.get('db_alias', DEFAULT_CONNECTION_NAME),
+                doc_cls._get_collection_name(), object_id)
+
+    @staticmethod
+    def _is_switched(document):
+        return document._get_collection() != document.__class__._get_collection()
+
+    @staticmethod
+    def _document_id(document):
+        id_field = document._meta['id_field']
+        return document._fields[id_field].to_mongo(document.pk)
+
+    def get(self, doc_cls, object_id):
+        """ Return the loaded document of the collection of ``doc_cls`` with
+        the (MongoDB) id ``object_id``, None if not loaded. """
+        return self.identity_map.get(self._key(doc_cls, object_id))
+
+    def add(self, document):
+        """ Add a document to the session, new documents being inserted
+        when the session is flushed. """
+        if self._is_switched(document):
+            self.discard(document)
+        elif document.pk is None:
+            if not any(new is document for new in self._new):
+                self._new.append(document)
+        else:
+            key = self._key(document.__class__, self._document_id(document))
+            self.identity_map[key] = document
+            if self._new:
+                self._discard_new(document)
+
+    def _add_loaded(self, document, object_id):
+        self.identity_map[self._key(document.__class__, object_id)] = document
+
+    def discard(self, document):
+        """ Remove a document from the session. """
+        if document.pk is None:
+            self._discard_new(document)
+        else:
+            key = self._key(document.__class__, self._document_id(document))
+            if self.identity_map.get(key) is document:
+                del self.identity_map[key]
+
+    def _discard_new(self, document):
+        self._new = [new for new in self._new if new is not document]
+
+    def flush(self):
+        """ Save the new and changed documents of the session, with one bulk
+        write per document class. """
+        by_class = {}
+        for document in self._new:
+            if not self._is_switched(document):
+                by_class.setdefault(document.__class__, []).append(document)
+        for document in self.identity_map.values():
+            if self._is_switched(document):
+                continue
+            if document._created or document._get_changed_fields():
+                by_class.setdefault(document.__class__, []).append(document)
+        for doc_cls, documents in by_class.iteritems():
+            doc_cls.objects.bulk_save(documents)
+        for document in self._new:
+            self.add(document)
+        self._new = []
@@ -7,7 +7,9 @@ from base import (
     TopLevelDocumentMetaclass, get_document
 )
 from fields import (ReferenceField, ListField, DictField, MapField)
+from cache import fetch_documents, get_document_cache
 from connection import get_db
+from context_managers import _get_session
 from queryset import QuerySet
 from document import Document, EmbeddedDocument
 
@@ -144,7 +146,26 @@ class DeReference(object):
                         if (collection, dbref) not in object_map]
 
                 if doc_type:
-                    references = doc_type._get_db()[collection].find({'_id': {'$in': refs}})
+                    session = _get_session()
+                    if session is not None:
+                        # Use the documents already loaded in the session
+                        missing = []
+                        for ref in refs:
+                            doc = session.get(doc_type, ref)
+                            if doc is None:
+                                missing.append(ref)
+                            else:
+                                object_map[(collection, ref)] = doc
+                        refs = missing
+                    cache = get_document_cache(doc_type)
+                    if refs and cache is not None:
+                        references = fetch_documents(
+                            doc_type, cache, refs,
+                            doc_type._get_db()[collection]).itervalues()
+                    elif refs:
+                        references = doc_type._get_db()[collection].find({'_id': {'$in': refs}})
+                    else:
+                        references = ()
                     for ref in references:
                         doc = doc_type._from_son(ref)
                         object_map[(collection, doc.id)] = doc
@@ -1,10 +1,14 @@
 import warnings
 import pymongo
 import re
+from multiprocessing.pool import ThreadPool
 
 from pymongo.read_preferences import ReadPreference
 from bson.dbref import DBRef
 from mongoengine import signals
+from mongoengine.async_support import (failed, resolved, then,
+                                       with_write_concern)
+from mongoengine.cache import invalidate
 from mongoengine.common import _import_class
 from mongoengine.base import (
     DocumentMetaclass,
@@ -16,17 +20,22 @@ from mongoengine.base import (
     ALLOW_INHERITANCE,
     get_document
 )
+from mongoengine.base.common import _document_registry
 from mongoengine.errors import (InvalidQueryError, InvalidDocumentError,
                                 SaveConditionError)
 from mongoengine.python_support import IS_PYMONGO_3
 from mongoengine.queryset import (OperationError, NotUniqueError,
                                   QuerySet, transform)
-from mongoengine.connection import get_db, DEFAULT_CONNECTION_NAME
-from mongoengine.context_managers import switch_db, switch_collection
+from mongoengine.connection import (get_db, get_async_db,
+                                    DEFAULT_CONNECTION_NAME,
+                                    _get_command_monitor)
+from mongoengine.context_managers import (switch_db, switch_collection,
+                                          _get_session)
 
 __all__ = ('Document', 'EmbeddedDocument', 'DynamicDocument',
            'DynamicEmbeddedDocument', 'OperationError',
-           'InvalidCollectionError', 'NotUniqueError', 'MapReduceDocument')
+           'InvalidCollectionError', 'NotUniqueError', 'MapReduceDocument',
+           'sync_indexes')
 
 
 def includes_cls(fields):
@@ -42,6 +51,140 @@ def includes_cls(fields):
     return first_field == '_cls'
 
 
+# Keys of the indexes ensured by this process, see _index_key, and the
+# (alias, collection full name, document class) whose indexes all were
+_ensured_indexes = set()
+_ensured_documents = set()
+
+
+def _index_key(alias, full_name, fields, opts):
+    """ Key identifying an index created with ``fields`` and ``opts`` in
+    the collection ``full_name`` of the connection ``alias``.
+    """
+    if isinstance(fields, basestring):
+        fields = [(fields, 1)]
+    # The server may report the directions as floats
+    fields = tuple((name, int(direction) if isinstance(direction, float)
+                    else direction) for name, direction in fields)
+    return (alias, full_name, fields, repr(sorted(opts.items())))
+
+
+# The options telling apart the indexes on the same keys
+_INDEX_OPTIONS = ('unique', 'sparse', 'expireAfterSeconds',
+                  'partialFilterExpression')
+
+
+def _index_options(opts):
+    """ The options of an index, from its creation options or its
+    description by ``index_information``, changing what it holds or enforces.
+    """
+    return dict((name, opts[name]) for name in _INDEX_OPTIONS
+                if opts.get(name) is not None and opts.get(name) is not False)
+
+
+def _forget_indexes(alias, full_name):
+    """ Forget the indexes ensured in a collection, e.g. once dropped.
+    """
+    for ensured in (_ensured_indexes, _ensured_documents):
+        for key in [key for key in list(ensured)
+                    if key[:2] == (alias, full_name)]:
+            ensured.discard(key)
+
+
+def _forget_dropped_indexes(database_name, collection_name=None):
+    """ Forget the indexes ensured in the collection ``collection_name``
+    of the database ``database_name``, or in all of its collections if None,
+    on any connection: called when a client sees them dropped.
+    """
+    prefix = database_name + '.'
+    for ensured in (_ensured_indexes, _ensured_documents):
+        for key in list(ensured):
+            if (key[1] == prefix + collection_name if collection_name
+                    else key[1].startswith(prefix)):
+                ensured.discard(key)
+
+
+def _create_index(collection, fields, opts):
+    if IS_PYMONGO_3:
+        collection.create_index(fields, **opts)
+    else:
+        collection.ensure_index(fields, **opts)
+
+
+def sync_indexes(documents=None, concurrency=4):
+    """Create the missing indexes of the given document classes, to be
+    run at deploy time along with ``auto_create_index`` set to False in the
+    documents meta data.  The indexes defined in the meta data are compared
+    with the existing ones, read once per collection, and only the missing
+    ones are created, ``concurrency`` of them at a time.  An
+    :class:`~mongoengine.queryset.OperationError` is raised, before any
+    index is created, if indexes exist on the keys of indexes of the meta
+    data but with other options (``unique``, ``sparse``, ...).
+
+    :param documents: the :class:`~mongoengine.Document` classes, all the
+        registered ones by default
+    :param concurrency: the number of indexes created in parallel
+    :returns: a list of the ``(document class, fields)`` of the created
+        indexes
+
+    .. versionadded:: 0.10.7
+    """
+    if documents is None:
+        documents = [doc_cls for doc_cls in _document_registry.values()
+                     if issubclass(doc_cls, Document) and
+                     not doc_cls._meta.get('abstract')]
+
+    existing = {}
+    commands = []
+    conflicts = []
+    synced = []
+    for doc_cls in documents:
+        collection = doc_cls._get_db()[doc_cls._get_collection_name()]
+        if not collection.is_mongos and collection.read_preference > 1:
+            continue
+        alias = doc_cls._meta.get('db_alias', DEFAULT_CONNECTION_NAME)
+        if collection.full_name not in existing:
+            # The options of the existing indexes, by keys
+            indexes = existing[collection.full_name] = {}
+            for info in collection.index_information().values():
+                keys = _index_key(alias, collection.full_name, info['key'],
+                                  {})[2]
+                indexes.setdefault(keys, []).append(_index_options(info))
+        for fields, opts in doc_cls._index_commands():
+            key = _index_key(alias, collection.full_name, fields, opts)
+            options = existing[collection.full_name].get(key[2])
+            if options is None:
+                if not any(key == command[0] for command in commands):
+                    commands.append((key, doc_cls, collection, fields, opts))
+            elif _index_options(opts) in options:
+                _ensured_indexes.add(key)
+            else:
+                conflicts.append('%s %s' % (doc_cls.__name__, fields))
+        synced.append((alias, collection.full_name, doc_cls))
+
+    if conflicts:
+        raise OperationError('Indexes exist with other options on the keys '
+                             'of: %s' % ', '.join(conflicts))
+
+    def _create(command):
+        key, doc_cls, collection, fields, opts = command
+        _create_index(collection, fields, opts)
+        _ensured_indexes.add(key)
+        return doc_cls, fields
+
+    if concurrency > 1 and len(commands) > 1:
+        pool = ThreadPool(min(concurrency, len(commands)))
+        try:
+            created = pool.map(_create, commands)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        created = [_create(command) for command in commands]
+    _ensured_documents.update(synced)
+    return created
+
+
 class InvalidCollectionError(Exception):
     pass
 
@@ -128,7 +271,9 @@ class Document(BaseDocument):
     :attr:`auto_create_index` in the :attr:`meta` dictionary. If this is set to
     False then indexes will not be created by MongoEngine.  This is useful in
     production systems where index creation is performed as part of a
-    deployment system.
+    deployment system, e.g. with :func:`~mongoengine.sync_indexes`.
+    Otherwise the indexes are created once per process, the first time the
+    collection is used.
 
     By default, _cls will be added to the start of every index (that
     doesn't contain a list) if allow_inheritance is True. This can be
@@ -139,6 +284,16 @@ class Document(BaseDocument):
     in your model will raise a :class:`~mongoengine.FieldDoesNotExist` error.
     This can be disabled by setting :attr:`strict` to ``False``
     in the :attr:`meta` dictionary.
+
+    The documents loaded by the querysets are read-only, as with
+    :meth:`~mongoengine.queryset.QuerySet.readonly`, when
+    :attr:`readonly_default` is ``True`` in the :attr:`meta` dictionary.
+
+    Saving a document validates all of its fields.  Setting
+    :attr:`validation` to ``'changed'`` in the :attr:`meta` dictionary only
+    validates the changed fields of documents already saved (the required
+    fields are still checked for being set); new documents are fully
+    validated.
     """
 
     # The __metaclass__ attribute is removed by 2to3 when running with Python3
@@ -169,6 +324,19 @@ class Document(BaseDocument):
         """Some Model using other db_alias"""
         return get_db(cls._meta.get("db_alias", DEFAULT_CONNECTION_NAME))
 
+    @classmethod
+    def _get_async_db(cls):
+        """Returns the asyncio database of the document, see
+        :func:`~mongoengine.connection.get_async_db`."""
+        return get_async_db(cls._meta.get("db_alias", DEFAULT_CONNECTION_NAME))
+
+    @classmethod
+    def _get_async_collection(cls):
+        """Returns the asyncio collection for the document.  Unlike
+        :meth:`_get_collection` it neither creates capped collections nor
+        indexes."""
+        return cls._get_async_db()[cls._get_collection_name()]
+
     @classmethod
     def _get_collection(cls):
         """Returns the collection for the document."""
@@ -207,7 +375,7 @@ class Document(BaseDocument):
             else:
                 cls._collection = db[collection_name]
             if cls._meta.get('auto_create_index', True):
-                cls.ensure_indexes()
+                cls._ensure_indexes()
         return cls._collection
 
     def modify(self, query={}, **update):
@@ -224,6 +392,9 @@ class Document(BaseDocument):
             database matches the query
         :param update: Django-style update keyword arguments
         """
+        if self._readonly:
+            raise OperationError("Read-only %s documents can not be modified"
+                                 % self._class_name)
 
         if self.pk is None:
             raise InvalidDocumentError("The document does not have a primary key.")
@@ -257,7 +428,9 @@ class Document(BaseDocument):
 
         :param force_insert: only try to create a new document, don't allow
             updates of existing documents
-        :param validate: validates the document; set to ``False`` to skip.
+        :param validate: validates the document (only its changed fields if
+            :attr:`validation` is ``'changed'`` in the meta and the document
+            exists); set to ``False`` to skip.
         :param clean: call the document clean method, requires `validate` to be
             True.
         :param write_concern: Extra keyword arguments are passed down to
@@ -300,28 +473,41 @@ class Document(BaseDocument):
         .. versionchanged:: 0.10.1
             :class: save_condition failure now raises a `SaveConditionError`
         .. versionchanged:: 0.10.7
-            Add signal_kwargs argument
+            Add signal_kwargs argument; read-only documents raise an
+            :class:`OperationError`
         """
+        if self._readonly:
+            raise OperationError("Read-only %s documents can not be saved"
+                                 % self._class_name)
         signal_kwargs = signal_kwargs or {}
-        signals.pre_save.send(self.__class__, document=self, **signal_kwargs)
+        if signals.has_receivers(signals.pre_save, self.__class__):
+            signals.pre_save.send(self.__class__, document=self,
+                                  **signal_kwargs)
 
         if validate:
-            self.validate(clean=clean)
+            self._validate_for_save(clean, force_insert)
 
         if write_concern is None:
             write_concern = {"w": 1}
 
-        doc = self.to_mongo()
-
-        created = ('_id' not in doc or self._created or force_insert)
+        if self._created or force_insert or self.pk is None:
+            doc = self.to_mongo()
+            created = ('_id' not in doc or self._created or force_insert)
+        else:
+            # Only the changes of existing documents are serialized
+            doc = None
+            created = False
 
-        signals.pre_save_post_validation.send(self.__class__, document=self,
-                                              created=created, **signal_kwargs)
+        if signals.has_receivers(signals.pre_save_post_validation,
+                                 self.__class__):
+            signals.pre_save_post_validation.send(
+                self.__class__, document=self, created=created,
+                **signal_kwargs)
 
         try:
             collection = self._get_collection()
             if self._meta.get('auto_create_index', True):
-                self.ensure_indexes()
+                self._ensure_indexes()
             if created:
                 if force_insert:
                     object_id = collection.insert(doc, **write_concern)
@@ -335,23 +521,9 @@ class Document(BaseDocument):
                         object_id = self._qs.filter(pk=pk_as_mongo_obj).first() and \
                                     self._qs.filter(pk=pk_as_mongo_obj).first().pk
             else:
-                object_id = doc['_id']
-                updates, removals = self._delta()
-                # Need to add shard key to query, or you get an error
-                if save_condition is not None:
-                    select_dict = transform.query(self.__class__,
-                                                  **save_condition)
-                else:
-                    select_dict = {}
-                select_dict['_id'] = object_id
-                shard_key = self.__class__._meta.get('shard_key', tuple())
-                for k in shard_key:
-                    path = self._lookup_field(k.split('.'))
-                    actual_key = [p.db_field for p in path]
-                    val = doc
-                    for ak in actual_key:
-                        val = val[ak]
-                    select_dict['.'.join(actual_key)] = val
+                select_dict, update_query = self._build_save_update(
+                    doc, save_condition)
+                object_id = select_dict['_id']
 
                 def is_new_object(last_error):
                     if last_error is not None:
@@ -360,13 +532,7 @@ class Document(BaseDocument):
                             return not updated
                     return created
 
-                update_query = {}
-
-                if updates:
-                    update_query["$set"] = updates
-                if removals:
-                    update_query["$unset"] = removals
-                if updates or removals:
+                if update_query:
                     upsert = save_condition is None
                     last_error = collection.update(select_dict, update_query,
                                                    upsert=upsert, **write_concern)
@@ -390,27 +556,169 @@ class Document(BaseDocument):
                     kwargs.update(cascade_kwargs)
                 kwargs['_refs'] = _refs
                 self.cascade_save(**kwargs)
-        except pymongo.errors.DuplicateKeyError as err:
-            message = u'Tried to save duplicate unique keys (%s)'
-            raise NotUniqueError(message % unicode(err))
         except pymongo.errors.OperationFailure as err:
-            message = 'Could not save document (%s)'
-            if re.match('^E1100[01] duplicate key', unicode(err)):
-                # E11000 - duplicate key error index
-                # E11001 - duplicate key on update
-                message = u'Tried to save duplicate unique keys (%s)'
-                raise NotUniqueError(message % unicode(err))
-            raise OperationError(message % unicode(err))
+            raise self._save_error(err)
+        return self._saved(object_id, created, signal_kwargs)
+
+    def _saved(self, object_id, created, signal_kwargs):
+        """Update the document once written with the id ``object_id``."""
         id_field = self._meta['id_field']
         if created or id_field not in self._meta.get('shard_key', []):
             self[id_field] = self._fields[id_field].to_python(object_id)
 
-        signals.post_save.send(self.__class__, document=self,
-                               created=created, **signal_kwargs)
+        if signals.has_receivers(signals.post_save, self.__class__):
+            signals.post_save.send(self.__class__, document=self,
+                                   created=created, **signal_kwargs)
         self._clear_changed_fields()
         self._created = False
+        invalidate(self.__class__, [object_id])
+        session = _get_session()
+        if session is not None:
+            session.add(self)
         return self
 
+    @staticmethod
+    def _save_error(err):
+        """Returns the error to raise for the pymongo error ``err`` a save
+        failed with."""
+        message = 'Could not save document (%s)'
+        if isinstance(err, pymongo.errors.DuplicateKeyError) or \
+                re.match('^E1100[01] duplicate key', unicode(err)):
+            # E11000 - duplicate key error index
+            # E11001 - duplicate key on update
+            message = u'Tried to save duplicate unique keys (%s)'
+            return NotUniqueError(message % unicode(err))
+        return OperationError(message % unicode(err))
+
+    def asave(self, validate=True, clean=True, write_concern=None,
+              signal_kwargs=None):
+        """Save the :class:`~mongoengine.Document` with asyncio, the way
+        :meth:`save` does, returning a future resolved with the document
+        once written::
+
+            await user.asave()
+
+        Cascading saves, ``force_insert`` and ``save_condition`` are not
+        supported, and indexes are not created.
+
+        :param validate: validates the document; set to ``False`` to skip.
+        :param clean: call the document clean method, requires `validate` to
+            be True.
+        :param write_concern: (optional) options of the write concern, for
+            example ``{'w': 2}``
+        :param signal_kwargs: (optional) kwargs dictionary to be passed to
+            the signal calls.
+
+        .. versionadded:: 0.10.7
+        """
+        signal_kwargs = signal_kwargs or {}
+        if signals.has_receivers(signals.pre_save, self.__class__):
+            signals.pre_save.send(self.__class__, document=self,
+                                  **signal_kwargs)
+
+        if validate:
+            self._validate_for_save(clean)
+
+        if self._created or self.pk is None:
+            doc = self.to_mongo()
+            created = '_id' not in doc or self._created
+        else:
+            doc = None
+            created = False
+
+        if signals.has_receivers(signals.pre_save_post_validation,
+                                 self.__class__):
+            signals.pre_save_post_validation.send(
+                self.__class__, document=self, created=created,
+                **signal_kwargs)
+
+        collection = with_write_concern(self._get_async_collection(),
+                                        write_concern)
+
+        if created:
+            if '_id' in doc:
+                write = collection.replace_one({'_id': doc['_id']}, doc,
+                                               upsert=True)
+            else:
+                write = collection.insert_one(doc)
+        else:
+            select_dict, update_query = self._build_save_update()
+            if not update_query:
+                return resolved(self._saved(select_dict['_id'], False,
+                                            signal_kwargs))
+            write = collection.update_one(select_dict, update_query,
+                                          upsert=True)
+
+        def _written(result):
+            if created and '_id' not in doc:
+                object_id = result.inserted_id
+            elif created:
+                object_id = doc['_id']
+            else:
+                object_id = select_dict['_id']
+            is_new = created or result.upserted_id is not None
+            return self._saved(object_id, is_new, signal_kwargs)
+
+        def _failed(err):
+            if isinstance(err, pymongo.errors.OperationFailure):
+                return self._save_error(err)
+            return err
+        return then(write, _written, _failed)
+
+    def _validate_for_save(self, clean, force_insert=False):
+        """Validate the document before saving it, only checking the
+        changed fields of an existing document if the :attr:`validation`
+        meta option is ``'changed'``.
+        """
+        if (self._meta.get('validation', 'full') != 'changed' or
+                self._created or force_insert or self.pk is None):
+            self.validate(clean=clean)
+            return
+        roots = set(path.split('.', 1)[0]
+                    for path in self._get_changed_fields())
+        reverse_map = self._reverse_db_field_map
+        self.validate(clean=clean, fields=set(reverse_map.get(root, root)
+                                              for root in roots))
+
+    def _build_save_update(self, doc=None, save_condition=None):
+        """Return the ``(query, update)`` pair used to write the changes of
+        an already saved document, ``doc`` being its :meth:`to_mongo` output
+        if already computed.  ``update`` holds the ``$set`` / ``$unset``
+        computed by :meth:`_delta`, the lists changed by appending or
+        removing items being updated with ``$push`` / ``$pullAll`` / ``$pop``
+        instead (see :meth:`_array_updates`), and is empty when there is
+        nothing to write.
+        """
+        shard_key = self.__class__._meta.get('shard_key', tuple())
+        if doc is None:
+            # Only serialize the fields the query is made of
+            doc = self.to_mongo(fields=[self._meta['id_field']] +
+                                [k.split('.')[0] for k in shard_key])
+        updates, removals = self._delta()
+        operators = self._array_updates(updates, removals)
+        # Need to add shard key to query, or you get an error
+        if save_condition is not None:
+            select_dict = transform.query(self.__class__,
+                                          **save_condition)
+        else:
+            select_dict = {}
+        select_dict['_id'] = doc['_id']
+        for k in shard_key:
+            path = self._lookup_field(k.split('.'))
+            actual_key = [p.db_field for p in path]
+            val = doc
+            for ak in actual_key:
+                val = val[ak]
+            select_dict['.'.join(actual_key)] = val
+
+        update_query = {}
+        if updates:
+            update_query["$set"] = updates
+        if removals:
+            update_query["$unset"] = removals
+        update_query.update(operators)
+        return select_dict, update_query
+
     def cascade_save(self, *args, **kwargs):
         """Recursively saves any references /
            generic references on the document"""
@@ -443,8 +751,13 @@ class Document(BaseDocument):
         """
         Returns the queryset to use for updating / reloading / deletions
         """
+        if self._readonly:
+            # The queryset caches its compiled queries on its document
+            return QuerySet(self.__class__, self._get_collection())
         if not hasattr(self, '__objects'):
             self.__objects = QuerySet(self, self._get_collection())
+            # Reloading needs documents tracking their changes
+            self.__objects._readonly = False
         return self.__objects
 
     @property
@@ -499,7 +812,9 @@ class Document(BaseDocument):
             Add signal_kwargs argument
         """
         signal_kwargs = signal_kwargs or {}
-        signals.pre_delete.send(self.__class__, document=self, **signal_kwargs)
+        if signals.has_receivers(signals.pre_delete, self.__class__):
+            signals.pre_delete.send(self.__class__, document=self,
+                                    **signal_kwargs)
 
         # Delete FileFields separately 
         FileField = _import_class('FileField')
@@ -513,7 +828,46 @@ class Document(BaseDocument):
         except pymongo.errors.OperationFailure as err:
             message = u'Could not delete document (%s)' % err.message
             raise OperationError(message)
-        signals.post_delete.send(self.__class__, document=self, **signal_kwargs)
+        session = _get_session()
+        if session is not None:
+            session.discard(self)
+        if signals.has_receivers(signals.post_delete, self.__class__):
+            signals.post_delete.send(self.__class__, document=self,
+                                     **signal_kwargs)
+
+    def adelete(self, signal_kwargs=None, **write_concern):
+        """Delete the :class:`~mongoengine.Document` with asyncio, returning
+        a future resolved once done.  Unlike :meth:`delete` the delete rules
+        are not applied and the files of the file fields are not deleted.
+
+        :parm signal_kwargs: (optional) kwargs dictionary to be passed to
+            the signal calls.
+        :param write_concern: Extra keyword arguments are used as the options
+            of the write concern, for example ``w=2``.
+
+        .. versionadded:: 0.10.7
+        """
+        signal_kwargs = signal_kwargs or {}
+        if signals.has_receivers(signals.pre_delete, self.__class__):
+            signals.pre_delete.send(self.__class__, document=self,
+                                    **signal_kwargs)
+
+        query = self.__class__.aobjects.filter(**self._object_key)._query
+        collection = with_write_concern(self._get_async_collection(),
+                                        write_concern)
+
+        def _deleted(result):
+            invalidate(self.__class__, [query['_id']])
+            if signals.has_receivers(signals.post_delete, self.__class__):
+                signals.post_delete.send(self.__class__, document=self,
+                                         **signal_kwargs)
+
+        def _failed(err):
+            if isinstance(err, pymongo.errors.OperationFailure):
+                message = u'Could not delete document (%s)' % unicode(err)
+                return OperationError(message)
+            return err
+        return then(collection.delete_one(query), _deleted, _failed)
 
     def switch_db(self, db_alias, keep_created=True):
         """
@@ -603,15 +957,28 @@ class Document(BaseDocument):
 
         if not self.pk:
             raise self.DoesNotExist("Document does not exist")
-        obj = self._qs.read_preference(ReadPreference.PRIMARY).filter(
-            **self._object_key).only(*fields).limit(
-            1).select_related(max_depth=max_depth)
-
-        if obj:
-            obj = obj[0]
-        else:
-            raise self.DoesNotExist("Document does not exist")
+        session = _get_session()
+        if session is not None:
+            # Load a fresh copy rather than this document from the session
+            session.discard(self)
+        try:
+            obj = self._qs.read_preference(ReadPreference.PRIMARY).filter(
+                **self._object_key).only(*fields).limit(
+                1).select_related(max_depth=max_depth)
 
+            if obj:
+                obj = obj[0]
+            else:
+                raise self.DoesNotExist("Document does not exist")
+        finally:
+            if session is not None:
+                session.add(self)
+        return self._reload_from(obj, fields)
+
+    def _reload_from(self, obj, fields):
+        """Copy the ``fields`` (all of them if empty) of ``obj``, the
+        document as fetched from the database, to this document.
+        """
         for field in obj._data:
             if not fields or field in fields:
                 try:
@@ -631,6 +998,37 @@ class Document(BaseDocument):
         self._created = False
         return self
 
+    def areload(self, *fields):
+        """Reload the attributes from the database with asyncio, returning
+        a future resolved with the document.  References are not
+        dereferenced.
+
+        :param fields: (optional) args list of fields to reload
+
+        .. versionadded:: 0.10.7
+        """
+        if not self.pk:
+            return failed(self.DoesNotExist("Document does not exist"))
+        queryset = self.__class__.aobjects.read_preference(
+            ReadPreference.PRIMARY).filter(**self._object_key).only(*fields)
+        session = _get_session()
+        if session is not None:
+            # Load a fresh copy rather than this document from the session
+            session.discard(self)
+
+        def _fetched(docs):
+            if session is not None:
+                session.add(self)
+            if not docs:
+                raise self.DoesNotExist("Document does not exist")
+            return self._reload_from(docs[0], fields)
+
+        def _failed(err):
+            if session is not None:
+                session.add(self)
+            return err
+        return then(queryset.limit(1).to_list(1), _fetched, _failed)
+
     def _reload(self, key, value):
         """Used by :meth:`~mongoengine.Document.reload` to ensure the
         correct instance is linked to self.
@@ -693,6 +1091,9 @@ class Document(BaseDocument):
         cls._collection = None
         db = cls._get_db()
         db.drop_collection(col_name)
+        invalidate(cls)
+        _forget_indexes(cls._meta.get('db_alias', DEFAULT_CONNECTION_NAME),
+                        '%s.%s' % (db.name, col_name))
 
     @classmethod
     def create_index(cls, keys, background=False, **kwargs):
@@ -748,21 +1149,54 @@ class Document(BaseDocument):
 
         .. note:: You can disable automatic index creation by setting
                   `auto_create_index` to False in the documents meta data
+
+        .. versionchanged:: 0.10.7
+            The indexes are remembered per process once ensured, the
+            automatic index creation only creating the ones not ensured yet
+            (all of them if the client isn't monitored, see
+            :mod:`mongoengine.monitoring`, as the drops of the collection
+            can't be seen then)
         """
-        background = cls._meta.get('index_background', False)
-        drop_dups = cls._meta.get('index_drop_dups', False)
-        index_opts = cls._meta.get('index_opts') or {}
-        index_cls = cls._meta.get('index_cls', True)
-        if IS_PYMONGO_3 and drop_dups:
+        cls._ensure_indexes(skip_ensured=False)
+
+    @classmethod
+    def _ensure_indexes(cls, skip_ensured=True):
+        collection = cls._get_collection()
+        alias = cls._meta.get('db_alias', DEFAULT_CONNECTION_NAME)
+        if skip_ensured and _get_command_monitor(alias) is None:
+            # Without a monitor, the drops of the collection can't be seen
+            skip_ensured = False
+        document_key = (alias, collection.full_name, cls)
+        if skip_ensured and document_key in _ensured_documents:
+            return
+
+        if IS_PYMONGO_3 and cls._meta.get('index_drop_dups', False):
             msg = "drop_dups is deprecated and is removed when using PyMongo 3+."
             warnings.warn(msg, DeprecationWarning)
 
-        collection = cls._get_collection()
         # 746: when connection is via mongos, the read preference is not necessarily an indication that
         # this code runs on a secondary
         if not collection.is_mongos and collection.read_preference > 1:
             return
 
+        for fields, opts in cls._index_commands():
+            key = _index_key(alias, collection.full_name, fields, opts)
+            if skip_ensured and key in _ensured_indexes:
+                continue
+            _create_index(collection, fields, opts)
+            _ensured_indexes.add(key)
+        _ensured_documents.add(document_key)
+
+    @classmethod
+    def _index_commands(cls):
+        """Returns the ``(fields, options)`` of the indexes to create for
+        the document, as defined in its meta data."""
+        background = cls._meta.get('index_background', False)
+        drop_dups = cls._meta.get('index_drop_dups', False)
+        index_opts = cls._meta.get('index_opts') or {}
+        index_cls = cls._meta.get('index_cls', True)
+
+        commands = []
         # determine if an index which we are creating includes
         # _cls as its first field; if so, we can avoid creating
         # an extra index on _cls, as mongodb will use the existing
@@ -770,42 +1204,36 @@ class Document(BaseDocument):
         cls_indexed = False
 
         # Ensure document-defined indexes are created
-        if cls._meta['index_specs']:
-            index_spec = cls._meta['index_specs']
-            for spec in index_spec:
-                spec = spec.copy()
-                fields = spec.pop('fields')
-                cls_indexed = cls_indexed or includes_cls(fields)
-                opts = index_opts.copy()
-                opts.update(spec)
-
-                # we shouldn't pass 'cls' to the collection.ensureIndex options
-                # because of https://jira.mongodb.org/browse/SERVER-769
-                if 'cls' in opts:
-                    del opts['cls']
-
-                if IS_PYMONGO_3:
-                    collection.create_index(fields, background=background, **opts)
-                else:
-                    collection.ensure_index(fields, background=background,
-                                            drop_dups=drop_dups, **opts)
+        for spec in cls._meta['index_specs'] or []:
+            spec = spec.copy()
+            fields = spec.pop('fields')
+            cls_indexed = cls_indexed or includes_cls(fields)
+            opts = index_opts.copy()
+            opts.update(spec)
+
+            # we shouldn't pass 'cls' to the collection.ensureIndex options
+            # because of https://jira.mongodb.org/browse/SERVER-769
+            if 'cls' in opts:
+                del opts['cls']
+
+            opts['background'] = background
+            if not IS_PYMONGO_3:
+                opts['drop_dups'] = drop_dups
+            commands.append((fields, opts))
 
         # If _cls is being used (for polymorphism), it needs an index,
         # only if another index doesn't begin with _cls
         if (index_cls and not cls_indexed and
                 cls._meta.get('allow_inheritance', ALLOW_INHERITANCE) is True):
-
+            opts = index_opts.copy()
             # we shouldn't pass 'cls' to the collection.ensureIndex options
             # because of https://jira.mongodb.org/browse/SERVER-769
-            if 'cls' in index_opts:
-                del index_opts['cls']
+            if 'cls' in opts:
+                del opts['cls']
+            opts['background'] = background
+            commands.append(('_cls', opts))
 
-            if IS_PYMONGO_3:
-                collection.create_index('_cls', background=background,
-                                        **index_opts)
-            else:
-                collection.ensure_index('_cls', background=background,
-                                        **index_opts)
+        return commands
 
     @classmethod
     def list_indexes(cls):
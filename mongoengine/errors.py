@@ -6,7 +6,7 @@ from mongoengine.python_support import txt_type
 __all__ = ('NotRegistered', 'InvalidDocumentError', 'LookUpError',
            'DoesNotExist', 'MultipleObjectsReturned', 'InvalidQueryError',
            'OperationError', 'NotUniqueError', 'FieldDoesNotExist',
-           'ValidationError', 'SaveConditionError')
+           'ValidationError', 'SaveConditionError', 'BulkWriteError')
 
 
 class NotRegistered(Exception):
@@ -45,6 +45,24 @@ class SaveConditionError(OperationError):
     pass
 
 
+class BulkWriteError(OperationError):
+    """Raised when some of the writes of a bulk operation failed.
+
+    :ivar errors: A list of ``(target, error)`` tuples, one per failed write.
+        ``target`` is the document being inserted, saved or deleted, or the
+        bulk operation itself for query based operations, and ``error`` the
+        :class:`NotUniqueError` or :class:`OperationError` the write would
+        have raised on its own.
+    :ivar result: The counters (``nInserted``, ``nModified``, ...) of the
+        writes that went through.
+    """
+
+    def __init__(self, message, errors=None, result=None):
+        super(BulkWriteError, self).__init__(message)
+        self.errors = errors or []
+        self.result = result or {}
+
+
 class FieldDoesNotExist(Exception):
     """Raised when trying to set a field
     not declared in a :class:`~mongoengine.Document`
@@ -26,13 +26,15 @@ except ImportError:
     Int64 = long
 
 from errors import ValidationError
-from python_support import (PY3, bin_type, txt_type,
+from python_support import (PY3, bin_type, txt_type, buffer_types,
                             str_types, StringIO)
 from base import (BaseField, ComplexBaseField, ObjectIdField, GeoJsonBaseField,
                   get_document, BaseDocument)
 from queryset import DO_NOTHING, QuerySet
 from document import Document, EmbeddedDocument
+from cache import fetch_documents, get_document_cache
 from connection import get_db, DEFAULT_CONNECTION_NAME
+from context_managers import _get_session
 
 try:
     from PIL import Image, ImageOps
@@ -60,6 +62,8 @@ class StringField(BaseField):
     """A unicode string field.
     """
 
+    _identity_types = (unicode,)
+
     def __init__(self, regex=None, max_length=None, min_length=None, **kwargs):
         self.regex = re.compile(regex) if regex else None
         self.max_length = max_length
@@ -186,6 +190,8 @@ class IntField(BaseField):
     """An 32-bit integer field.
     """
 
+    _identity_types = (int,)
+
     def __init__(self, min_value=None, max_value=None, **kwargs):
         self.min_value, self.max_value = min_value, max_value
         super(IntField, self).__init__(**kwargs)
@@ -220,6 +226,8 @@ class LongField(BaseField):
     """An 64-bit integer field.
     """
 
+    _identity_types = (long,)
+
     def __init__(self, min_value=None, max_value=None, **kwargs):
         self.min_value, self.max_value = min_value, max_value
         super(LongField, self).__init__(**kwargs)
@@ -257,6 +265,8 @@ class FloatField(BaseField):
     """An floating point number field.
     """
 
+    _identity_types = (float,)
+
     def __init__(self, min_value=None, max_value=None, **kwargs):
         self.min_value, self.max_value = min_value, max_value
         super(FloatField, self).__init__(**kwargs)
@@ -370,6 +380,8 @@ class BooleanField(BaseField):
     .. versionadded:: 0.1.2
     """
 
+    _identity_types = (bool,)
+
     def to_python(self, value):
         try:
             value = bool(value)
@@ -948,9 +960,19 @@ class ReferenceField(BaseField):
                 cls = get_document(value.cls)
             else:
                 cls = self.document_type
-            value = cls._get_db().dereference(value)
-            if value is not None:
-                instance._data[self.name] = cls._from_son(value)
+            session = _get_session()
+            loaded = session and session.get(cls, value.id)
+            if loaded is not None:
+                instance._data[self.name] = loaded
+            else:
+                cache = get_document_cache(cls)
+                if cache is not None:
+                    value = fetch_documents(cls, cache, [value.id]).get(
+                        value.id)
+                else:
+                    value = cls._get_db().dereference(value)
+                if value is not None:
+                    instance._data[self.name] = cls._from_son(value)
 
         return super(ReferenceField, self).__get__(instance, owner)
 
@@ -1230,7 +1252,16 @@ class GenericReferenceField(BaseField):
     def dereference(self, value):
         doc_cls = get_document(value['_cls'])
         reference = value['_ref']
-        doc = doc_cls._get_db().dereference(reference)
+        session = _get_session()
+        doc = session and session.get(doc_cls, reference.id)
+        if doc is not None:
+            return doc
+        cache = get_document_cache(doc_cls)
+        if cache is not None:
+            doc = fetch_documents(doc_cls, cache, [reference.id]).get(
+                reference.id)
+        else:
+            doc = doc_cls._get_db().dereference(reference)
         if doc is not None:
             doc = doc_cls._from_son(doc)
         return doc
@@ -1284,10 +1315,13 @@ class BinaryField(BaseField):
         return super(BinaryField, self).__set__(instance, value)
 
     def to_mongo(self, value, **kwargs):
+        if isinstance(value, buffer_types):
+            # Read from a lazily loaded document
+            value = value.tobytes()
         return Binary(value)
 
     def validate(self, value):
-        if not isinstance(value, (bin_type, txt_type, Binary)):
+        if not isinstance(value, (bin_type, txt_type, Binary) + buffer_types):
             self.error("BinaryField only accepts instances of "
                        "(%s, %s, Binary)" % (
                            bin_type.__name__, txt_type.__name__))
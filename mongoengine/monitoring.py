@@ -0,0 +1,259 @@
+"""Client-side monitoring of the commands sent to MongoDB.
+
+Each PyMongo client created by :func:`~mongoengine.connection.get_connection`
+gets a :class:`CommandMonitor`, registered through PyMongo's command
+monitoring (PyMongo 3.1 and newer; mocked connections aren't monitored).
+The aliases sharing a client share its monitor.  It sees the collections
+and databases dropped, whose indexes the automatic index creation then
+creates again; otherwise the monitor costs nothing until something
+subscribes to it:
+
+* :func:`get_command_stats` collects the counts, latency histograms and
+  bytes returned of the commands of a connection, and which document class
+  and queryset (or document) method sent them::
+
+      stats = get_command_stats()
+      BlogPost.objects(author=user).count()
+      stats.commands['count']['count']        # 1
+      stats.origins[('BlogPost', 'count', 'count')]   # 1
+
+* :func:`add_slow_command_callback` calls a function with the
+  :class:`CommandRecord` of every command slower than a threshold.
+
+* :class:`~mongoengine.context_managers.query_counter` counts the commands
+  sent within a block.
+"""
+import sys
+import threading
+from collections import namedtuple
+
+from bson import BSON
+
+from mongoengine.connection import (DEFAULT_CONNECTION_NAME,
+                                    _get_command_monitor)
+
+try:
+    from pymongo.monitoring import CommandListener
+except ImportError:
+    CommandListener = None
+
+__all__ = ('CommandMonitor', 'CommandStats', 'CommandRecord',
+           'MONITORING_AVAILABLE', 'HISTOGRAM_BOUNDS', 'get_command_stats',
+           'add_slow_command_callback', 'remove_slow_command_callback')
+
+MONITORING_AVAILABLE = CommandListener is not None
+
+# Upper bounds, in milliseconds, of the buckets of the latency histograms;
+# the last bucket holds the slower commands
+HISTOGRAM_BOUNDS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# The commands dropping a collection or a database, which the indexes
+# ensured by the process are forgotten with
+_DROP_COMMANDS = frozenset(['drop', 'dropDatabase'])
+
+class CommandRecord(namedtuple('CommandRecord', [
+        'database_name', 'command_name', 'command', 'duration_ms', 'failed',
+        'document', 'method'])):
+    """A command sent to MongoDB: ``document`` and ``method`` are the name
+    of the document class and of the queryset (or document) method which
+    sent it, None if it wasn't sent by MongoEngine.
+
+    .. versionadded:: 0.10.7
+    """
+    __slots__ = ()
+
+
+class CommandStats(object):
+    """Statistics of the commands sent through a connection.
+
+    :attr:`commands` maps each command name to a dict of its ``count``,
+    ``failures``, ``total_ms``, ``max_ms``, ``bytes_returned`` and
+    ``histogram``, the counts of the commands per latency bucket (see
+    :data:`HISTOGRAM_BOUNDS`).  :attr:`origins` maps the
+    ``(document class name, method name, command name)`` of the commands
+    sent by MongoEngine to their count.
+
+    .. versionadded:: 0.10.7
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget the commands recorded so far."""
+        with self._lock:
+            self.commands = {}
+            self.origins = {}
+
+    def record(self, command_name, duration_ms, bytes_returned=0,
+               origin=None, failed=False):
+        """Record a command which took ``duration_ms`` milliseconds."""
+        bucket = len(HISTOGRAM_BOUNDS)
+        for i, bound in enumerate(HISTOGRAM_BOUNDS):
+            if duration_ms <= bound:
+                bucket = i
+                break
+        with self._lock:
+            entry = self.commands.get(command_name)
+            if entry is None:
+                entry = self.commands[command_name] = {
+                    'count': 0, 'failures': 0, 'total_ms': 0.0,
+                    'max_ms': 0.0, 'bytes_returned': 0,
+                    'histogram': [0] * (len(HISTOGRAM_BOUNDS) + 1)}
+            entry['count'] += 1
+            if failed:
+                entry['failures'] += 1
+            entry['total_ms'] += duration_ms
+            entry['max_ms'] = max(entry['max_ms'], duration_ms)
+            entry['bytes_returned'] += bytes_returned
+            entry['histogram'][bucket] += 1
+            if origin is not None:
+                key = origin + (command_name,)
+                self.origins[key] = self.origins.get(key, 0) + 1
+
+    def count(self, command_name=None):
+        """Return the number of ``command_name`` commands recorded, of all
+        the commands if None."""
+        if command_name is not None:
+            return self.commands.get(command_name, {}).get('count', 0)
+        return sum(entry['count'] for entry in self.commands.values())
+
+
+def _command_origin():
+    """Return the ``(document class name, method name)`` of the outermost
+    MongoEngine method in the stack of the current thread, None if the
+    command wasn't sent by MongoEngine.
+    """
+    from mongoengine.base import BaseDocument
+    from mongoengine.queryset.base import BaseQuerySet
+
+    origin = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_globals.get('__name__', '').startswith('mongoengine.'):
+            f_locals = frame.f_locals
+            owner = f_locals.get('self', f_locals.get('cls'))
+            doc_cls = None
+            if isinstance(owner, BaseQuerySet):
+                doc_cls = owner._document
+            elif isinstance(owner, BaseDocument):
+                doc_cls = owner.__class__
+            elif isinstance(owner, type) and issubclass(owner, BaseDocument):
+                doc_cls = owner
+            if doc_cls is not None:
+                origin = (doc_cls._class_name, frame.f_code.co_name)
+        elif origin is not None:
+            break
+        frame = frame.f_back
+    return origin
+
+
+class CommandMonitor(CommandListener or object):
+    """PyMongo command listener of a client, feeding its
+    :class:`CommandStats`, slow command callbacks and query counters.
+
+    .. versionadded:: 0.10.7
+    """
+
+    def __init__(self):
+        self.stats = None
+        self.slow_callbacks = []
+        self.counters = []
+        self._pending = {}
+        self._drops = {}
+
+    def started(self, event):
+        if event.command_name in _DROP_COMMANDS:
+            self._drops[event.request_id] = (event.database_name,
+                                             event.command.get('drop'))
+        for counter in self.counters:
+            counter._command_started(event.command_name)
+        if self.stats is None and not self.slow_callbacks:
+            return
+        command = event.command if self.slow_callbacks else None
+        self._pending[event.request_id] = (
+            _command_origin(), event.database_name, command)
+
+    def succeeded(self, event):
+        if self._drops:
+            dropped = self._drops.pop(event.request_id, None)
+            if dropped is not None:
+                # The indexes of a collection dropped have to be created
+                # again
+                from mongoengine.document import _forget_dropped_indexes
+                _forget_dropped_indexes(*dropped)
+        pending = self._pending.pop(event.request_id, None)
+        if pending is not None:
+            self._finished(event, pending, False)
+
+    def failed(self, event):
+        if self._drops:
+            self._drops.pop(event.request_id, None)
+        pending = self._pending.pop(event.request_id, None)
+        if pending is not None:
+            self._finished(event, pending, True)
+
+    def _finished(self, event, pending, failed):
+        origin, database_name, command = pending
+        duration_ms = event.duration_micros / 1000.0
+        stats = self.stats
+        if stats is not None:
+            bytes_returned = 0 if failed else len(BSON.encode(event.reply))
+            stats.record(event.command_name, duration_ms, bytes_returned,
+                         origin, failed)
+        slow_callbacks = [callback for threshold_ms, callback
+                          in self.slow_callbacks
+                          if duration_ms >= threshold_ms]
+        if slow_callbacks:
+            document, method = origin or (None, None)
+            record = CommandRecord(database_name, event.command_name,
+                                   command, duration_ms, failed, document,
+                                   method)
+            for callback in slow_callbacks:
+                callback(record)
+
+
+def get_command_stats(alias=DEFAULT_CONNECTION_NAME):
+    """Return the :class:`CommandStats` of the connection ``alias``,
+    collecting them from the first call on; None if its client can't be
+    monitored.
+
+    .. versionadded:: 0.10.7
+    """
+    monitor = _get_command_monitor(alias)
+    if monitor is None:
+        return None
+    if monitor.stats is None:
+        monitor.stats = CommandStats()
+    return monitor.stats
+
+
+def add_slow_command_callback(callback, threshold_ms=100,
+                              alias=DEFAULT_CONNECTION_NAME):
+    """Call ``callback`` with the :class:`CommandRecord` of the commands of
+    the connection ``alias`` taking ``threshold_ms`` milliseconds or more.
+    Return whether the client of the connection can be monitored.
+
+    .. versionadded:: 0.10.7
+    """
+    monitor = _get_command_monitor(alias)
+    if monitor is None:
+        return False
+    monitor.slow_callbacks.append((threshold_ms, callback))
+    return True
+
+
+def remove_slow_command_callback(callback, alias=DEFAULT_CONNECTION_NAME):
+    """Stop calling ``callback`` on the slow commands of the connection
+    ``alias``.
+
+    .. versionadded:: 0.10.7
+    """
+    monitor = _get_command_monitor(alias)
+    if monitor is not None:
+        monitor.slow_callbacks[:] = [
+            (threshold_ms, registered)
+            for threshold_ms, registered in monitor.slow_callbacks
+            if registered is not callback]
+
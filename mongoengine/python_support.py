@@ -35,3 +35,9 @@ else:
     txt_type = unicode
 
 str_types = (bin_type, txt_type)
+
+try:
+    buffer_types = (memoryview,)
+except NameError:
+    # Python 2.6
+    buffer_types = ()
@@ -2,12 +2,16 @@ from mongoengine.errors import (DoesNotExist, MultipleObjectsReturned,
                                 InvalidQueryError, OperationError,
                                 NotUniqueError)
 
+from mongoengine.queryset.async_queryset import *
+from mongoengine.queryset.bulk import *
 from mongoengine.queryset.field_list import *
 from mongoengine.queryset.manager import *
 from mongoengine.queryset.queryset import *
 from mongoengine.queryset.transform import *
 from mongoengine.queryset.visitor import *
-from mongoengine.queryset import field_list, manager, queryset, transform, visitor
+from mongoengine.queryset import (async_queryset, bulk, field_list, manager,
+                                  queryset, transform, visitor)
 
-__all__ = (field_list.__all__ + manager.__all__ + queryset.__all__ +
-           transform.__all__ + visitor.__all__)
+__all__ = (async_queryset.__all__ + bulk.__all__ + field_list.__all__ +
+           manager.__all__ + queryset.__all__ + transform.__all__ +
+           visitor.__all__)
@@ -0,0 +1,245 @@
+import pymongo.errors
+
+from mongoengine.async_support import (StopAsyncIteration, count_documents,
+                                       failed, resolved, then,
+                                       with_write_concern)
+from mongoengine.errors import NotUniqueError, OperationError
+from mongoengine.queryset.base import BaseQuerySet
+from mongoengine.queryset.queryset import ITER_CHUNK_SIZE
+
+__all__ = ('AsyncQuerySet',)
+
+
+class AsyncQuerySet(BaseQuerySet):
+    """A queryset whose results are fetched with asyncio, through Motor (or
+    its in-process fake for the mocked connections).
+
+    It is built and chained like a :class:`~mongoengine.queryset.QuerySet`,
+    the same query, projection and ordering being sent to the server, but
+    its results are read with :meth:`to_list` or ``async for``, and the
+    methods talking to the database return futures to be awaited::
+
+        users = await User.aobjects(age__gte=18).order_by('name').to_list()
+        async for user in User.aobjects(active=True):
+            ...
+
+    The synchronous methods reading or writing documents, like
+    :meth:`~mongoengine.queryset.QuerySet.count` or
+    :meth:`~mongoengine.queryset.QuerySet.get`, raise :class:`TypeError`.
+
+    .. note:: References are dereferenced synchronously on access, use
+        :meth:`~mongoengine.queryset.QuerySet.no_dereference` to avoid it.
+
+    .. versionadded:: 0.10.7
+    """
+
+    def __iter__(self):
+        raise TypeError("%s can't be iterated synchronously, use `async for` "
+                        "or to_list()" % self.__class__.__name__)
+
+    def __nonzero__(self):
+        raise TypeError("The truth value of an %s is only known once "
+                        "awaited, use afirst()" % self.__class__.__name__)
+
+    def __bool__(self):
+        raise TypeError("The truth value of an %s is only known once "
+                        "awaited, use afirst()" % self.__class__.__name__)
+
+    def __getitem__(self, key):
+        """Support skip and limit using the slicing syntax, the documents
+        being read with :meth:`to_list` (or :meth:`afirst`).
+        """
+        if not isinstance(key, slice):
+            raise TypeError("%s can only be sliced, use afirst() or "
+                            "to_list()" % self.__class__.__name__)
+        if key.step is not None or (key.start or 0) < 0 or \
+                (key.stop or 0) < 0:
+            raise IndexError("%s slices take neither steps nor negative "
+                             "indexes" % self.__class__.__name__)
+        queryset = self.clone()
+        queryset._skip, queryset._limit = key.start, key.stop
+        if key.start and key.stop is not None:
+            queryset._limit = max(key.stop - key.start, 0)
+        return queryset
+
+    def __aiter__(self):
+        return _AsyncQuerySetIterator(self.clone())
+
+    @property
+    def _collection(self):
+        if self._collection_obj is None:
+            self._collection_obj = self._document._get_async_collection()
+        return self._collection_obj
+
+    def to_list(self, length=None):
+        """Return a future resolved with the list of the selected documents.
+
+        :param length: (optional) maximum number of documents to fetch
+        """
+        queryset = self.clone()
+        if queryset._limit == 0 or queryset._none:
+            return resolved([])
+
+        def _loaded(raw_docs):
+            return [queryset._load(raw_doc) for raw_doc in raw_docs]
+        return then(queryset._cursor.to_list(length), _loaded)
+
+    def afirst(self):
+        """Return a future resolved with the first selected document, or
+        ``None`` if no document matches.
+        """
+        queryset = self.clone()
+        if queryset._limit != 0:
+            queryset = queryset.limit(1)
+
+        def _first(docs):
+            return docs[0] if docs else None
+        return then(queryset.to_list(1), _first)
+
+    def acount(self, with_limit_and_skip=False):
+        """Return a future resolved with the number of selected documents.
+
+        :param with_limit_and_skip: (optional) take any :meth:`limit` or
+            :meth:`skip` that has been applied into account
+        """
+        if self._limit == 0 and with_limit_and_skip or self._none:
+            return resolved(0)
+        kwargs = {}
+        if with_limit_and_skip:
+            if self._limit is not None:
+                kwargs['limit'] = self._limit
+            if self._skip is not None:
+                kwargs['skip'] = self._skip
+        if self._hint != -1:
+            kwargs['hint'] = self._hint
+        return count_documents(self._collection, self._query, **kwargs)
+
+    def ain_bulk(self, object_ids):
+        """Return a future resolved with a dict of the documents with the
+        ids ``object_ids``, keyed by id.
+
+        :param object_ids: a list or tuple of ``ObjectId``\ s
+        """
+        cursor = self._collection.find({'_id': {'$in': object_ids}},
+                                       **self._cursor_args)
+
+        def _loaded(raw_docs):
+            return dict((raw_doc['_id'], self._load(raw_doc))
+                        for raw_doc in raw_docs)
+        return then(cursor.to_list(None), _loaded)
+
+    def aupdate(self, upsert=False, multi=True, write_concern=None,
+                full_result=False, **update):
+        """Perform an atomic update on the selected documents, returning a
+        future resolved with the number of documents updated.
+
+        :param upsert: insert a document if none matches
+        :param multi: update all the selected documents, not only the first
+        :param write_concern: (optional) options of the write concern, for
+            example ``{'w': 2}``
+        :param full_result: resolve with the pymongo
+            :class:`~pymongo.results.UpdateResult` rather than the number
+            of documents updated
+        :param update: Django-style update keyword arguments
+        """
+        if not update and not upsert:
+            raise OperationError("No update parameters, would remove data")
+
+        queryset = self.clone()
+        query = queryset._query
+        update = queryset._transform_update(update, upsert)
+        collection = with_write_concern(queryset._collection, write_concern)
+        if multi:
+            result = collection.update_many(query, update, upsert=upsert)
+        else:
+            result = collection.update_one(query, update, upsert=upsert)
+
+        def _updated(result):
+            queryset._invalidate_cached()
+            if full_result:
+                return result
+            return result.raw_result['n']
+
+        def _failed(err):
+            if isinstance(err, pymongo.errors.DuplicateKeyError):
+                return NotUniqueError(u'Update failed (%s)' % unicode(err))
+            if isinstance(err, pymongo.errors.OperationFailure):
+                return OperationError(u'Update failed (%s)' % unicode(err))
+            return err
+        return then(result, _updated, _failed)
+
+    def aupdate_one(self, upsert=False, write_concern=None, **update):
+        """Perform an atomic update on the first selected document, see
+        :meth:`aupdate`.
+        """
+        return self.aupdate(upsert=upsert, multi=False,
+                            write_concern=write_concern, **update)
+
+    def aaggregate(self, *pipeline, **kwargs):
+        """Run an aggregation on the selected documents, returning a future
+        resolved with the list of the resulting documents.
+
+        :param pipeline: list of aggregation commands, the stages applying
+            the queryset params being prepended as for :meth:`aggregate`
+        """
+        pipeline = self._aggregate_pipeline(pipeline)
+        return self._collection.aggregate(pipeline, **kwargs).to_list(None)
+
+
+def _synchronous(name):
+    """Return the method of :class:`AsyncQuerySet` overriding the synchronous
+    method ``name`` of :class:`~mongoengine.queryset.base.BaseQuerySet`."""
+    def method(self, *args, **kwargs):
+        raise TypeError("%s.%s() would talk to the database synchronously, "
+                        "use the asynchronous methods (to_list(), acount(), "
+                        "...)" % (self.__class__.__name__, name))
+    method.__name__ = name
+    return method
+
+
+# The methods of BaseQuerySet reading or writing documents synchronously
+_SYNCHRONOUS_METHODS = (
+    '__len__', 'next', '__next__', 'get', 'create', 'first', 'insert', 'bulk_save',
+    'bulk_write', 'count', 'delete', 'update', 'upsert_one', 'update_one',
+    'modify', 'with_id', 'in_bulk', 'distinct', 'explain', 'to_json',
+    'aggregate', 'map_reduce', 'exec_js', 'aggregate_stats', 'sum',
+    'aggregate_sum', 'average', 'aggregate_average', 'item_frequencies',
+    'iter_batches', 'paginate', 'seek_iter', 'parallel_map', 'parallel_iter',
+    'ensure_index')
+
+for _name in _SYNCHRONOUS_METHODS:
+    setattr(AsyncQuerySet, _name, _synchronous(_name))
+del _name
+
+
+class _AsyncQuerySetIterator(object):
+    """Asynchronous iterator over an :class:`AsyncQuerySet`, fetching the
+    documents in batches of ``ITER_CHUNK_SIZE``.
+    """
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+        self._buffer = []
+        self._exhausted = queryset._limit == 0 or queryset._none
+
+    def __aiter__(self):
+        return self
+
+    def _pop(self):
+        if not self._buffer:
+            self._exhausted = True
+            raise StopAsyncIteration
+        return self.queryset._load(self._buffer.pop())
+
+    def __anext__(self):
+        if not self._buffer and not self._exhausted:
+            def _fetched(raw_docs):
+                raw_docs.reverse()
+                self._buffer = raw_docs
+                return self._pop()
+            return then(self.queryset._cursor.to_list(ITER_CHUNK_SIZE),
+                        _fetched)
+        try:
+            return resolved(self._pop())
+        except Exception as exc:
+            return failed(exc)
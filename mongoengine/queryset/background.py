@@ -0,0 +1,178 @@
+import itertools
+import threading
+import weakref
+from Queue import Empty, Full, Queue
+
+from bson import BSON
+
+from mongoengine.context_managers import _get_session
+
+__all__ = ('BatchPrefetcher', 'TARGET_BATCH_BYTES')
+
+# The size, in bytes of BSON, of the batches of documents loaded in the
+# background when their number isn't given
+TARGET_BATCH_BYTES = 1024 * 1024
+
+# Bounds of the number of documents of an adaptive batch
+MIN_BATCH_SIZE = 10
+MAX_BATCH_SIZE = 10000
+
+# The first adaptive batches hold this many documents
+INITIAL_BATCH_SIZE = 100
+
+# How often, in seconds, a thread waiting for room in the queue checks
+# whether the iteration stopped
+_POLL_INTERVAL = 0.1
+
+# Put in the queue once the cursor is exhausted
+_END = object()
+
+
+def _bson_size(raw_doc):
+    """Return the size of the BSON of a raw document."""
+    raw = getattr(raw_doc, 'raw', None)
+    if raw is not None:
+        return len(raw)
+    return len(BSON.encode(raw_doc))
+
+
+class _Failure(object):
+    """An exception raised in the thread, to raise in the iteration."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+class BatchPrefetcher(object):
+    """Loads the results of the cursor of a queryset in a thread, keeping up
+    to ``depth`` batches of them ready while the current one is processed:
+    the thread waits for the network and loads the next documents as the
+    application works on the previous ones.
+
+    Unless ``batch_size`` is given, the number of documents of a batch is
+    adjusted to the average size of the documents read so far, for the
+    batches to weigh about :data:`TARGET_BATCH_BYTES`.
+
+    The thread only holds a weak reference to the queryset, and stops once
+    the queryset is collected or :meth:`cancel` or :meth:`close` is called.
+
+    Sessions are local to their thread: while a
+    :class:`~mongoengine.context_managers.session` is active, the thread
+    only fetches the raw documents, which are loaded by :meth:`next_batch`
+    for them to join the identity map of the session.
+
+    .. versionadded:: 0.10.7
+    """
+
+    def __init__(self, queryset, depth=2, batch_size=None):
+        self._queue = Queue(max(depth, 1))
+        self._stop = threading.Event()
+        self._done = False
+        # The item the thread was putting in the queue when stopped
+        self._unqueued = None
+        self._queryset_ref = weakref.ref(queryset)
+        self._load_in_thread = _get_session() is None
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(self._queryset_ref, queryset._cursor, batch_size))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _put(self, item, queryset_ref):
+        """Wait for room in the queue to put ``item``; return False if the
+        iteration stopped meanwhile."""
+        while not self._stop.is_set() and queryset_ref() is not None:
+            try:
+                self._queue.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except Full:
+                pass
+        self._unqueued = item
+        return False
+
+    def _run(self, queryset_ref, cursor, batch_size):
+        size = batch_size or INITIAL_BATCH_SIZE
+        average = None
+        try:
+            while not self._stop.is_set():
+                raw_docs = list(itertools.islice(cursor, size))
+                if not raw_docs:
+                    break
+                docs = None
+                if self._load_in_thread:
+                    queryset = queryset_ref()
+                    if queryset is None:
+                        return
+                    docs = queryset._load_batch(raw_docs)
+                    del queryset
+                if not self._put((raw_docs, docs), queryset_ref):
+                    return
+                if batch_size is None:
+                    # Sample one document per batch
+                    sampled = _bson_size(raw_docs[0])
+                    average = sampled if average is None \
+                        else (average * 3 + sampled) / 4.0
+                    size = int(min(MAX_BATCH_SIZE, max(
+                        MIN_BATCH_SIZE, TARGET_BATCH_BYTES // average)))
+        except Exception as e:
+            self._put(_Failure(e), queryset_ref)
+            return
+        self._put(_END, queryset_ref)
+
+    def next_batch(self):
+        """Return the next batch of results, waiting for it to be loaded.
+        Raise StopIteration once the cursor is exhausted, or the exception
+        raised while loading the batch."""
+        if self._done:
+            raise StopIteration
+        while True:
+            try:
+                batch = self._queue.get(timeout=_POLL_INTERVAL)
+                break
+            except Empty:
+                if not self._thread.is_alive() and self._queue.empty():
+                    self._done = True
+                    raise StopIteration
+        if batch is _END:
+            self._done = True
+            raise StopIteration
+        if isinstance(batch, _Failure):
+            self._done = True
+            raise batch.error
+        return self._loaded(batch)
+
+    def _loaded(self, batch):
+        """Return the results of a ``(raw_docs, docs)`` batch."""
+        raw_docs, docs = batch
+        if docs is None or _get_session() is not None:
+            # Load the documents in this thread, into its session
+            docs = self._queryset_ref()._load_batch(raw_docs)
+        return docs
+
+    def cancel(self):
+        """Stop loading the results, and wait for the thread to end."""
+        self._stop.set()
+        self._done = True
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def close(self):
+        """Stop loading the results like :meth:`cancel`, returning the
+        batches of results loaded but not returned by :meth:`next_batch`
+        yet, for the iteration to be resumed from the cursor.
+        """
+        done = self._done
+        self.cancel()
+        if done:
+            return []
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except Empty:
+                break
+        if self._unqueued is not None:
+            items.append(self._unqueued)
+            self._unqueued = None
+        return [self._loaded(item) for item in items
+                if item is not _END and not isinstance(item, _Failure)]
@@ -1,5 +1,6 @@
 from __future__ import absolute_import
 
+import collections
 import copy
 import itertools
 import operator
@@ -15,15 +16,29 @@ import pymongo.errors
 from pymongo.common import validate_read_preference
 
 from mongoengine import signals
-from mongoengine.connection import get_db
-from mongoengine.context_managers import switch_db
+from mongoengine.cache import fetch_documents, get_document_cache, invalidate
+from mongoengine.connection import (DEFAULT_CONNECTION_NAME, _get_alias,
+                                    get_db)
+from mongoengine.context_managers import switch_db, _get_session
 from mongoengine.common import _import_class
 from mongoengine.base.common import get_document
+from mongoengine.base.lazy import LAZY_LOADING_AVAILABLE, RawSON
 from mongoengine.errors import (OperationError, NotUniqueError,
-                                InvalidQueryError, LookUpError)
+                                InvalidQueryError, LookUpError,
+                                BulkWriteError)
 from mongoengine.python_support import IS_PYMONGO_3
 from mongoengine.queryset import transform
+from mongoengine.queryset.background import BatchPrefetcher
+from mongoengine.queryset.bulk import InsertOne, SaveOne
 from mongoengine.queryset.field_list import QueryFieldList
+from mongoengine.queryset.pagination import (Page, decode_token,
+                                             encode_token, seek_query,
+                                             son_value)
+from mongoengine.queryset.parallel import (partition_queries,
+                                           run_partitions, split_points)
+from mongoengine.queryset.pipeline import Pipeline
+from mongoengine.queryset.prefetch import (prefetch_references,
+                                          validate_path)
 from mongoengine.queryset.visitor import Q, QNode
 
 if IS_PYMONGO_3:
@@ -41,6 +56,22 @@ PULL = 4
 
 RE_TYPE = type(re.compile(''))
 
+# The number of documents fetched at a time when iterating a QuerySet
+ITER_CHUNK_SIZE = 100
+
+
+def _hashable(value):
+    """Return ``value`` with its lists turned into tuples and its
+    documents into tuples of their sorted ``(key, value)`` items, to be
+    usable as a dict key.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, _hashable(item))
+                            for key, item in value.iteritems()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    return value
+
 
 class BaseQuerySet(object):
     """A set of results returned from a query. Wraps a MongoDB cursor,
@@ -49,6 +80,16 @@ class BaseQuerySet(object):
     __dereference = False
     _auto_dereference = True
 
+    # The parameters of the queryset, copied by clone() and pickled
+    _copy_props = ('_mongo_query', '_initial_query', '_none', '_query_obj',
+                   '_where_clause', '_loaded_fields', '_ordering', '_snapshot',
+                   '_timeout', '_class_check', '_slave_okay', '_read_preference',
+                   '_iter', '_scalar', '_as_pymongo', '_as_pymongo_coerce',
+                   '_limit', '_skip', '_hint', '_auto_dereference',
+                   '_search_text', 'only_fields', '_max_time_ms',
+                   '_prefetch', '_lazy', '_prefetch_depth',
+                   '_prefetch_batch_size', '_readonly')
+
     def __init__(self, document, collection):
         self._document = document
         self._collection_obj = collection
@@ -85,6 +126,13 @@ class BaseQuerySet(object):
         self._hint = -1  # Using -1 as None is a valid value for hint
         self.only_fields = []
         self._max_time_ms = None
+        self._prefetch = ()
+        self._prefetch_buffer = None
+        self._lazy = False
+        self._prefetch_depth = 0
+        self._prefetch_batch_size = None
+        self._prefetcher = None
+        self._readonly = document._meta.get('readonly_default', False)
 
     def __call__(self, q_obj=None, class_check=True, read_preference=None,
                  **query):
@@ -154,13 +202,17 @@ class BaseQuerySet(object):
                 return queryset._get_scalar(
                     queryset._document._from_son(queryset._cursor[key],
                                                  _auto_dereference=self._auto_dereference,
-                                                 only_fields=self.only_fields))
+                                                 only_fields=self.only_fields,
+                                                 _readonly=self._readonly,
+                                                 _in_session=queryset._in_session()))
 
             if queryset._as_pymongo:
                 return queryset._get_as_pymongo(queryset._cursor[key])
             return queryset._document._from_son(queryset._cursor[key],
                                                 _auto_dereference=self._auto_dereference,
-                                                only_fields=self.only_fields)
+                                                only_fields=self.only_fields,
+                                                _readonly=self._readonly,
+                                                _in_session=queryset._in_session())
 
         raise AttributeError
 
@@ -234,11 +286,18 @@ class BaseQuerySet(object):
         queryset = queryset.order_by().limit(2)
         queryset = queryset.filter(*q_objs, **query)
 
+        msg = ("%s matching query does not exist."
+               % queryset._document._class_name)
+        cache = queryset._get_query_cache()
+        if cache is not None:
+            result = queryset._get_cached(cache)
+            if result is None:
+                raise queryset._document.DoesNotExist(msg)
+            return result
+
         try:
             result = queryset.next()
         except StopIteration:
-            msg = ("%s matching query does not exist."
-                   % queryset._document._class_name)
             raise queryset._document.DoesNotExist(msg)
         try:
             queryset.next()
@@ -260,6 +319,9 @@ class BaseQuerySet(object):
         """Retrieve the first object matching the query.
         """
         queryset = self.clone()
+        cache = queryset._get_query_cache()
+        if cache is not None:
+            return queryset._get_cached(cache)
         try:
             result = queryset[0]
         except IndexError:
@@ -267,7 +329,7 @@ class BaseQuerySet(object):
         return result
 
     def insert(self, doc_or_docs, load_bulk=True,
-               write_concern=None, signal_kwargs=None):
+               write_concern=None, signal_kwargs=None, reload=False):
         """bulk insert documents
 
         :param doc_or_docs: a document or list of documents to be inserted
@@ -282,6 +344,10 @@ class BaseQuerySet(object):
                 each server being written to.
         :parm signal_kwargs: (optional) kwargs dictionary to be passed to
             the signal calls.
+        :param reload (optional): If True (and ``load_bulk`` is True) the
+            inserted documents are read back from the database, picking up
+            any value set server side, instead of returning the given
+            instances
 
         By default returns document instances, set ``load_bulk`` to False to
         return just ``ObjectIds``
@@ -289,6 +355,9 @@ class BaseQuerySet(object):
         .. versionadded:: 0.5
         .. versionchanged:: 0.10.7
             Add signal_kwargs argument
+        .. versionchanged:: 0.10.7
+            With ``load_bulk`` the inserted instances are returned with their
+            ids set rather than read back, unless ``reload`` is True
         """
         Document = _import_class('Document')
 
@@ -311,8 +380,9 @@ class BaseQuerySet(object):
                 raise OperationError(msg)
 
         signal_kwargs = signal_kwargs or {}
-        signals.pre_bulk_insert.send(self._document,
-                                     documents=docs, **signal_kwargs)
+        if signals.has_receivers(signals.pre_bulk_insert, self._document):
+            signals.pre_bulk_insert.send(self._document,
+                                         documents=docs, **signal_kwargs)
 
         raw = [doc.to_mongo() for doc in docs]
         try:
@@ -329,19 +399,122 @@ class BaseQuerySet(object):
                 raise NotUniqueError(message % unicode(err))
             raise OperationError(message % unicode(err))
 
+        has_post_signal = signals.has_receivers(signals.post_bulk_insert,
+                                                self._document)
         if not load_bulk:
-            signals.post_bulk_insert.send(
-                self._document, documents=docs, loaded=False, **signal_kwargs)
+            if has_post_signal:
+                signals.post_bulk_insert.send(
+                    self._document, documents=docs, loaded=False,
+                    **signal_kwargs)
             return return_one and ids[0] or ids
 
-        documents = self.in_bulk(ids)
-        results = []
-        for obj_id in ids:
-            results.append(documents.get(obj_id))
-        signals.post_bulk_insert.send(
-            self._document, documents=results, loaded=True, **signal_kwargs)
+        if reload:
+            documents = self.in_bulk(ids)
+            results = []
+            for obj_id in ids:
+                results.append(documents.get(obj_id))
+        else:
+            id_field = self._document._meta['id_field']
+            to_python = self._document._fields[id_field].to_python
+            for doc, obj_id in zip(docs, ids):
+                doc[id_field] = to_python(obj_id)
+                doc._clear_changed_fields()
+                doc._created = False
+            results = list(docs)
+        if has_post_signal:
+            signals.post_bulk_insert.send(
+                self._document, documents=results, loaded=True,
+                **signal_kwargs)
         return return_one and results[0] or results
 
+    def bulk_save(self, documents, ordered=False, validate=True, clean=True,
+                  write_concern=None, batch_size=None, signal_kwargs=None):
+        """Save many documents with batched bulk writes rather than one round
+        trip per document.
+
+        Each document is written as :meth:`~mongoengine.Document.save`
+        would: new documents are inserted, existing ones are updated with the
+        ``$set`` / ``$unset`` of their changes, and the save signals fire for
+        each of them, the ``pre_save`` ones for a whole batch before it is
+        written and the ``post_save`` ones once it has been.
+
+        :param documents: an iterable of documents of this queryset's class
+        :param ordered: if ``True``, stop at the first failing write; if
+            ``False`` attempt every write and report all the failures
+        :param validate: validates the documents; set to ``False`` to skip
+        :param clean: call the documents' clean methods, requires
+            ``validate`` to be ``True``
+        :param write_concern: extra keyword arguments for the write concern
+            of the bulk writes, e.g. ``{'w': 2}``
+        :param batch_size: the number of documents written per bulk
+            operation, by default the server's maximum write batch size;
+            pymongo further splits the batches to respect the maximum
+            message size
+        :param signal_kwargs: (optional) kwargs dictionary to be passed to
+            the signal calls
+
+        :returns: the summed counters of the bulk writes (``nInserted``,
+            ``nUpserted``, ``nMatched``, ``nModified``, ``nRemoved``)
+        :raises: :class:`~mongoengine.errors.BulkWriteError` listing each
+            document whose write failed along with the
+            :class:`~mongoengine.errors.NotUniqueError` or
+            :class:`~mongoengine.errors.OperationError` it caused.  The
+            documents written before are saved as usual.
+
+        .. versionadded:: 0.10.7
+        """
+        operations = (SaveOne(doc) for doc in documents)
+        return self.bulk_write(operations, ordered=ordered, validate=validate,
+                               clean=clean, write_concern=write_concern,
+                               batch_size=batch_size,
+                               signal_kwargs=signal_kwargs)
+
+    def bulk_write(self, operations, ordered=False, validate=True, clean=True,
+                   write_concern=None, batch_size=None, signal_kwargs=None):
+        """Run a sequence of write operations as batched bulk writes::
+
+            BlogPost.objects.bulk_write([
+                InsertOne(BlogPost(title='New')),
+                SaveOne(post),
+                UpdateMany({'tags': 'mongo'}, {'inc__views': 1}),
+                UpdateOne({'title': 'Stats'}, {'set__views': 0}, upsert=True),
+                DeleteOne(old_post),
+            ])
+
+        The operations (see :mod:`mongoengine.queryset.bulk`) can be given
+        as any iterable and are consumed one batch at a time.  Queries of
+        query based operations are combined with this queryset's filters.
+        Inserts of a batch fire the ``pre_bulk_insert`` /
+        ``post_bulk_insert`` signals together.
+
+        Takes the same arguments as :meth:`bulk_save`, which it backs;
+        ``validate`` and ``clean`` apply to the inserted and saved documents.
+
+        .. versionadded:: 0.10.7
+        """
+        if batch_size is None:
+            batch_size = self._get_bulk_batch_size()
+        signal_kwargs = signal_kwargs or {}
+
+        result = dict((counter, 0) for counter in self._bulk_counters)
+        errors = []
+        operations = iter(operations)
+        while True:
+            batch = list(itertools.islice(operations, batch_size))
+            if not batch:
+                break
+            errors.extend(self._bulk_write_batch(
+                batch, ordered, validate, clean, write_concern,
+                signal_kwargs, result))
+            self._invalidate_written(batch)
+            if errors and ordered:
+                break
+
+        if errors:
+            message = u'%d write(s) of the bulk operation failed' % len(errors)
+            raise BulkWriteError(message, errors=errors, result=result)
+        return result
+
     def count(self, with_limit_and_skip=False):
         """Count the selected elements in the query.
 
@@ -375,9 +548,9 @@ class BaseQuerySet(object):
 
         # Handle deletes where skips or limits have been applied or
         # there is an untriggered delete signal
-        has_delete_signal = signals.signals_available and (
-            signals.pre_delete.has_receivers_for(self._document) or
-            signals.post_delete.has_receivers_for(self._document))
+        has_delete_signal = (
+            signals.has_receivers(signals.pre_delete, self._document) or
+            signals.has_receivers(signals.post_delete, self._document))
 
         call_document_delete = (queryset._skip or queryset._limit or
                                 has_delete_signal) and not _from_doc_delete
@@ -427,6 +600,7 @@ class BaseQuerySet(object):
                     **{'pull_all__%s' % field_name: self})
 
         result = queryset._collection.remove(queryset._query, **write_concern)
+        queryset._invalidate_cached()
         if result:
             return result.get("n")
 
@@ -456,18 +630,11 @@ class BaseQuerySet(object):
 
         queryset = self.clone()
         query = queryset._query
-        update = transform.update(queryset._document, **update)
-
-        # If doing an atomic upsert on an inheritable class
-        # then ensure we add _cls to the update operation
-        if upsert and '_cls' in query:
-            if '$set' in update:
-                update["$set"]["_cls"] = queryset._document._class_name
-            else:
-                update["$set"] = {"_cls": queryset._document._class_name}
+        update = queryset._transform_update(update, upsert)
         try:
             result = queryset._collection.update(query, update, multi=multi,
                                                  upsert=upsert, **write_concern)
+            queryset._invalidate_cached()
             if full_result:
                 return result
             elif result:
@@ -481,6 +648,20 @@ class BaseQuerySet(object):
             raise OperationError(u'Update failed (%s)' % unicode(err))
 
 
+    def _transform_update(self, update, upsert):
+        """Return the MongoDB update of the Django-style ``update``."""
+        query = self._query
+        update = transform.update(self._document, **update)
+
+        # If doing an atomic upsert on an inheritable class
+        # then ensure we add _cls to the update operation
+        if upsert and '_cls' in query:
+            if '$set' in update:
+                update["$set"]["_cls"] = self._document._class_name
+            else:
+                update["$set"] = {"_cls": self._document._class_name}
+        return update
+
     def upsert_one(self, write_concern=None, **update):
         """Overwrite or add the first document matched by the query.
 
@@ -586,13 +767,18 @@ class BaseQuerySet(object):
             raise NotUniqueError(u"Update failed (%s)" % err)
         except pymongo.errors.OperationFailure as err:
             raise OperationError(u"Update failed (%s)" % err)
+        queryset._invalidate_cached()
 
         if full_response:
             if result["value"] is not None:
-                result["value"] = self._document._from_son(result["value"], only_fields=self.only_fields)
+                result["value"] = self._document._from_son(result["value"], only_fields=self.only_fields,
+                                                           _readonly=self._readonly,
+                                                           _in_session=self._in_session())
         else:
             if result is not None:
-                result = self._document._from_son(result, only_fields=self.only_fields)
+                result = self._document._from_son(result, only_fields=self.only_fields,
+                                                  _readonly=self._readonly,
+                                                  _in_session=self._in_session())
 
         return result
 
@@ -609,6 +795,15 @@ class BaseQuerySet(object):
         if not queryset._query_obj.empty:
             msg = "Cannot use a filter whilst using `with_id`"
             raise InvalidQueryError(msg)
+        session = queryset._session()
+        if (session is not None and not queryset._scalar and
+                not queryset._as_pymongo and not queryset._none):
+            id_field = queryset._document._meta['id_field']
+            doc = session.get(queryset._document,
+                              queryset._document._fields[id_field].to_mongo(
+                                  object_id))
+            if isinstance(doc, queryset._document):
+                return doc
         return queryset.filter(pk=object_id).first()
 
     def in_bulk(self, object_ids):
@@ -622,12 +817,34 @@ class BaseQuerySet(object):
         """
         doc_map = {}
 
-        docs = self._collection.find({'_id': {'$in': object_ids}},
-                                     **self._cursor_args)
+        session = self._session()
+        if session is not None and not self._scalar and not self._as_pymongo:
+            # Only fetch the documents not already loaded in the session
+            missing = []
+            for object_id in object_ids:
+                doc = session.get(self._document, object_id)
+                if isinstance(doc, self._document):
+                    doc_map[object_id] = doc
+                else:
+                    missing.append(object_id)
+            if not missing:
+                return doc_map
+            object_ids = missing
+
+        cache = self._document_cache()
+        if cache is not None and not self._loaded_fields:
+            docs = fetch_documents(self._document, cache, object_ids,
+                                   self._collection).itervalues()
+        else:
+            docs = self._collection.find({'_id': {'$in': object_ids}},
+                                         **self._cursor_args)
+        in_session = self._in_session()
         if self._scalar:
             for doc in docs:
                 doc_map[doc['_id']] = self._get_scalar(
-                    self._document._from_son(doc, only_fields=self.only_fields))
+                    self._document._from_son(doc, only_fields=self.only_fields,
+                                             _readonly=self._readonly,
+                                             _in_session=in_session))
         elif self._as_pymongo:
             for doc in docs:
                 doc_map[doc['_id']] = self._get_as_pymongo(doc)
@@ -636,7 +853,8 @@ class BaseQuerySet(object):
                 doc_map[doc['_id']] = self._document._from_son(
                     doc,
                     only_fields=self.only_fields,
-                    _auto_dereference=self._auto_dereference)
+                    _auto_dereference=self._auto_dereference,
+                    _readonly=self._readonly, _in_session=in_session)
 
         return doc_map
 
@@ -685,14 +903,7 @@ class BaseQuerySet(object):
             raise OperationError(
                 '%s is not a subclass of BaseQuerySet' % cls.__name__)
 
-        copy_props = ('_mongo_query', '_initial_query', '_none', '_query_obj',
-                      '_where_clause', '_loaded_fields', '_ordering', '_snapshot',
-                      '_timeout', '_class_check', '_slave_okay', '_read_preference',
-                      '_iter', '_scalar', '_as_pymongo', '_as_pymongo_coerce',
-                      '_limit', '_skip', '_hint', '_auto_dereference',
-                      '_search_text', 'only_fields', '_max_time_ms')
-
-        for prop in copy_props:
+        for prop in self._copy_props:
             val = getattr(self, prop)
             setattr(cls, prop, copy.copy(val))
 
@@ -713,6 +924,56 @@ class BaseQuerySet(object):
         queryset = self.clone()
         return queryset._dereference(queryset, max_depth=max_depth)
 
+    def prefetch(self, *fields):
+        """Fetch the documents referenced by the given fields along with the
+        results, rather than one by one when accessed: for each batch of
+        results, the references are fetched with one query per referenced
+        document class.  Referencing fields of embedded documents and of
+        referenced documents are given with dotted paths::
+
+            BlogPost.objects.prefetch('author', 'tags', 'comments.author')
+
+        Lists and dicts of references and generic references are supported.
+
+        :param fields: fields holding the references to fetch
+
+        .. versionadded:: 0.10.7
+        """
+        for field in fields:
+            validate_path(self._document, field)
+        queryset = self.clone()
+        queryset._prefetch = queryset._prefetch + fields
+        return queryset
+
+    def prefetch_batches(self, depth=2, batch_size=None):
+        """Load the results in a background thread, which keeps up to
+        ``depth`` batches of them ready while the application processes the
+        current one, instead of the results being fetched and loaded
+        synchronously by batches of ``ITER_CHUNK_SIZE``: the network waits
+        and the loading of the documents overlap with their processing::
+
+            for post in BlogPost.objects.prefetch_batches(depth=4):
+                index(post)
+
+        Unless ``batch_size`` is given, the size of the batches adapts to
+        the average size of the documents (about 1 MB of BSON per batch).
+        The results, and the caching of :class:`QuerySet`, are the same as
+        for a normal iteration.  The thread stops when the iteration is
+        stopped early (e.g. by ``break``) or rewound, or when the queryset
+        is garbage collected.  Within a
+        :class:`~mongoengine.context_managers.session`, the documents are
+        loaded by the iterating thread, into the identity map of the session.
+
+        :param depth: the number of batches loaded ahead
+        :param batch_size: the number of documents per batch
+
+        .. versionadded:: 0.10.7
+        """
+        queryset = self.clone()
+        queryset._prefetch_depth = max(depth, 1)
+        queryset._prefetch_batch_size = batch_size
+        return queryset
+
     def limit(self, n):
         """Limit the number of returned documents to `n`. This may also be
         achieved using array-slicing syntax (e.g. ``User.objects[:5]``).
@@ -1007,6 +1268,41 @@ class BaseQuerySet(object):
         queryset._as_pymongo_coerce = coerce_types
         return queryset
 
+    def lazy(self):
+        """Load the documents lazily: they are fetched as raw BSON, each
+        field being decoded and converted on first access.  Reading a few
+        fields of large documents then costs much less CPU and memory.
+
+        The documents otherwise behave as usual, the whole document being
+        decoded by the operations going through all the fields (validation,
+        :meth:`~mongoengine.Document.to_mongo`, ...); the values of the
+        :class:`~mongoengine.fields.BinaryField` are :class:`memoryview`
+        of the raw BSON.  Ignored with PyMongo 2.
+
+        .. versionadded:: 0.10.7
+        """
+        queryset = self.clone()
+        queryset._lazy = True
+        return queryset
+
+    def readonly(self, enabled=True):
+        """Load the documents read-only: their lists and dicts are plain
+        ones, and they keep no state to track their changes, so they use
+        less memory and are faster to load.  Modifying or saving one raises
+        an :class:`~mongoengine.errors.OperationError`.
+
+        The querysets of the documents whose :attr:`meta` sets
+        ``readonly_default`` to ``True`` are read-only unless called with
+        ``readonly(False)``.
+
+        :param enabled: whether to load the documents read-only
+
+        .. versionadded:: 0.10.7
+        """
+        queryset = self.clone()
+        queryset._readonly = enabled
+        return queryset
+
     def max_time_ms(self, ms):
         """Wait `ms` milliseconds before killing the query on the server
 
@@ -1032,24 +1328,85 @@ class BaseQuerySet(object):
             see: http://docs.mongodb.org/manual/core/aggregation-pipeline/
 
         .. versionadded:: 0.9
+        .. versionchanged:: 0.10.7 the pipeline also applies the
+            :meth:`only` / :meth:`exclude` projection of the queryset, and
+            its default ordering when it has a skip or limit
+        """
+        pipeline = self._aggregate_pipeline(pipeline)
+        return self._collection.aggregate(pipeline, cursor={}, **kwargs)
+
+    def pipeline(self):
+        """Return a :class:`~mongoengine.queryset.pipeline.Pipeline` to
+        build an aggregation over the documents of the queryset, stage by
+        stage, using the names of the fields of the document class::
+
+            Order.objects(paid=True).pipeline() \\
+                .group('$customer', total={'$sum': '$price'})
+
+        .. versionadded:: 0.10.7
+        """
+        return Pipeline(self)
+
+    def _aggregate_pipeline(self, pipeline, project=True):
+        """Prepend the stages applying the queryset params to ``pipeline``:
+        its query, ordering, skip, limit and, if ``project``, its field
+        projection.
         """
         initial_pipeline = []
 
         if self._query:
             initial_pipeline.append({'$match': self._query})
 
-        if self._ordering:
-            initial_pipeline.append({'$sort': dict(self._ordering)})
+        ordering = self._ordering
+        if ordering is None and (self._skip is not None or
+                                 self._limit is not None) and \
+                self._document._meta['ordering']:
+            # Which documents are skipped depends on their order
+            ordering = self._get_order_by(self._document._meta['ordering'])
+        if ordering:
+            initial_pipeline.append({'$sort': SON(ordering)})
+
+        if self._skip is not None:
+            initial_pipeline.append({'$skip': self._skip})
 
         if self._limit is not None:
             initial_pipeline.append({'$limit': self._limit})
 
-        if self._skip is not None:
-            initial_pipeline.append({'$skip': self._skip})
+        if project and self._loaded_fields:
+            initial_pipeline.append(
+                {'$project': self._loaded_fields.as_dict()})
 
-        pipeline = initial_pipeline + list(pipeline)
+        return initial_pipeline + list(pipeline)
 
-        return self._collection.aggregate(pipeline, cursor={}, **kwargs)
+    def _run_pipeline(self, pipeline):
+        """Run an aggregation ``pipeline`` and return its results as a
+        list."""
+        result = self._collection.aggregate(pipeline)
+        if IS_PYMONGO_3:
+            return list(result)
+        return result.get('result')
+
+    def _aggregation_path(self, field):
+        """Return the db path of the dotted ``field`` and the db paths of
+        the lists along it, to unwind to reach its values the way the
+        map/reduce functions do.
+        """
+        ListField = _import_class('ListField')
+        db_parts = []
+        lists = []
+        for part in self._document._lookup_field(
+                field.replace('__', '.').split('.')):
+            if isinstance(part, basestring):
+                if part.isdigit() and lists and \
+                        lists[-1] == '.'.join(db_parts):
+                    # An item of a list, not the list
+                    lists.pop()
+                db_parts.append(part)
+                continue
+            db_parts.append(part.db_field)
+            if isinstance(part, ListField):
+                lists.append('.'.join(db_parts))
+        return '.'.join(db_parts), lists
 
     # JS functionality
     def map_reduce(self, map_f, reduce_f, output, finalize_f=None, limit=None,
@@ -1235,6 +1592,110 @@ class BaseQuerySet(object):
         queryset._where_clause = where_clause
         return queryset
 
+    def aggregate_stats(self, sum=None, avg=None, min=None, max=None,
+                        count=False, distinct_count=None):
+        """Compute statistics over the selected documents with one
+        ``$group`` of the aggregation framework, and return them as a dict
+        keyed by the names of the statistics asked for::
+
+            >>> Order.objects(paid=True).aggregate_stats(
+            ...     sum='price', avg=('price', 'rating'), count=True)
+            {'sum': 1234.5, 'avg': {'price': 12.3, 'rating': 4.1},
+             'count': 100}
+
+        The statistics are computed over the documents selected by the
+        queryset, taking its skip and limit into account.  Over a list
+        field (or a field of the embedded documents of a list) they are
+        computed over the items of the lists, as :meth:`sum` and
+        :meth:`average` used to; combining such a field with other
+        statistics requires MongoDB 3.2.
+
+        Each of the statistics but ``count`` takes a field name (using
+        dot-notation for the fields of embedded documents), or a list of
+        them to get a dict of the statistics per field.
+
+        :param sum: the field(s) to sum over, 0 if there is no value
+        :param avg: the field(s) to average over, None if there is no value
+        :param min: the field(s) to get the minimum of
+        :param max: the field(s) to get the maximum of
+        :param count: count the documents
+        :param distinct_count: the field(s) to count the distinct values of
+
+        .. versionadded:: 0.10.7
+        """
+        stats = []
+        singles = {}
+        for stat, fields in (('sum', sum), ('avg', avg), ('min', min),
+                             ('max', max), ('distinct_count', distinct_count)):
+            if fields is None:
+                continue
+            singles[stat] = isinstance(fields, basestring)
+            for field in [fields] if singles[stat] else fields:
+                path, lists = self._aggregation_path(field)
+                stats.append((stat, field, path, lists))
+
+        # Unwinding the lists gives the items to aggregate but repeats the
+        # other values of the documents, so it is only done when all the
+        # statistics are over a same list
+        unwind = []
+        if not count and stats and \
+                len(set(tuple(lists) for _, _, _, lists in stats)) == 1:
+            unwind = stats[0][3]
+        projected = any(lists for _, _, _, lists in stats) and not unwind
+
+        pipeline = self._aggregate_pipeline([], project=False)
+        pipeline.extend({'$unwind': '$' + path} for path in unwind)
+        project = {}
+        group = {'_id': None}
+        if count:
+            group['count'] = {'$sum': 1}
+        for i, (stat, field, path, lists) in enumerate(stats):
+            key = 'v%d' % i
+            source = '$' + path
+            if projected:
+                if lists and stat in ('sum', 'min', 'max'):
+                    project[key] = {'$' + stat: source}
+                elif lists and stat == 'avg':
+                    project[key] = {'$sum': source}
+                    project[key + '_n'] = {'$size': {'$ifNull': [source, []]}}
+                    group[key + '_n'] = {'$sum': '$' + key + '_n'}
+                    stat = 'sum'
+                else:
+                    project[key] = source
+                source = '$' + key
+            accumulator = 'addToSet' if stat == 'distinct_count' else stat
+            group[key] = {'$' + accumulator: source}
+        if project:
+            pipeline.append({'$project': project})
+        pipeline.append({'$group': group})
+
+        results = [] if self._none else self._run_pipeline(pipeline)
+        row = results[0] if results else {}
+
+        values = {}
+        if count:
+            values['count'] = row.get('count', 0)
+        for i, (stat, field, path, lists) in enumerate(stats):
+            key = 'v%d' % i
+            if stat == 'avg' and projected and lists:
+                items = row.get(key + '_n', 0)
+                value = row[key] / float(items) if items else None
+            elif stat == 'distinct_count':
+                distinct = set()
+                for value in row.get(key, ()):
+                    for item in value if projected and lists else [value]:
+                        if not isinstance(item, collections.Hashable):
+                            item = repr(item)
+                        distinct.add(item)
+                value = len(distinct)
+            else:
+                value = row.get(key, 0 if stat == 'sum' else None)
+            if singles[stat]:
+                values[stat] = value
+            else:
+                values.setdefault(stat, {})[field] = value
+        return values
+
     def sum(self, field):
         """Sum over the values of the specified field.
 
@@ -1243,43 +1704,10 @@ class BaseQuerySet(object):
 
         .. versionchanged:: 0.5 - updated to map_reduce as db.eval doesnt work
             with sharding.
+        .. versionchanged:: 0.10.7 - computed by :meth:`aggregate_stats`
+            with the aggregation framework, respecting skip and limit.
         """
-        map_func = """
-            function() {
-                var path = '{{~%(field)s}}'.split('.'),
-                field = this;
-
-                for (p in path) {
-                    if (typeof field != 'undefined')
-                       field = field[path[p]];
-                    else
-                       break;
-                }
-
-                if (field && field.constructor == Array) {
-                    field.forEach(function(item) {
-                        emit(1, item||0);
-                    });
-                } else if (typeof field != 'undefined') {
-                    emit(1, field||0);
-                }
-            }
-        """ % dict(field=field)
-
-        reduce_func = Code("""
-            function(key, values) {
-                var sum = 0;
-                for (var i in values) {
-                    sum += values[i];
-                }
-                return sum;
-            }
-        """)
-
-        for result in self.map_reduce(map_func, reduce_func, output='inline'):
-            return result.value
-        else:
-            return 0
+        return self.aggregate_stats(sum=field)['sum']
 
     def aggregate_sum(self, field):
         """Sum over the values of the specified field.
@@ -1287,20 +1715,9 @@ class BaseQuerySet(object):
         :param field: the field to sum over; use dot-notation to refer to
             embedded document fields
 
-        This method is more performant than the regular `sum`, because it uses
-        the aggregation framework instead of map-reduce.
+        .. versionchanged:: 0.10.7 - same as :meth:`sum`
         """
-        result = self._document._get_collection().aggregate([
-            {'$match': self._query},
-            {'$group': {'_id': 'sum', 'total': {'$sum': '$' + field}}}
-        ])
-        if IS_PYMONGO_3:
-            result = list(result)
-        else:
-            result = result.get('result')
-        if result:
-            return result[0]['total']
-        return 0
+        return self.sum(field)
 
     def average(self, field):
         """Average over the values of the specified field.
@@ -1310,52 +1727,11 @@ class BaseQuerySet(object):
 
         .. versionchanged:: 0.5 - updated to map_reduce as db.eval doesnt work
             with sharding.
+        .. versionchanged:: 0.10.7 - computed by :meth:`aggregate_stats`
+            with the aggregation framework, respecting skip and limit.
         """
-        map_func = """
-            function() {
-                var path = '{{~%(field)s}}'.split('.'),
-                field = this;
-
-                for (p in path) {
-                    if (typeof field != 'undefined')
-                       field = field[path[p]];
-                    else
-                       break;
-                }
-
-                if (field && field.constructor == Array) {
-                    field.forEach(function(item) {
-                        emit(1, {t: item||0, c: 1});
-                    });
-                } else if (typeof field != 'undefined') {
-                    emit(1, {t: field||0, c: 1});
-                }
-            }
-        """ % dict(field=field)
-
-        reduce_func = Code("""
-            function(key, values) {
-                var out = {t: 0, c: 0};
-                for (var i in values) {
-                    var value = values[i];
-                    out.t += value.t;
-                    out.c += value.c;
-                }
-                return out;
-            }
-        """)
-
-        finalize_func = Code("""
-            function(key, value) {
-                return value.t / value.c;
-            }
-        """)
-
-        for result in self.map_reduce(map_func, reduce_func,
-                                      finalize_f=finalize_func, output='inline'):
-            return result.value
-        else:
-            return 0
+        average = self.aggregate_stats(avg=field)['avg']
+        return 0 if average is None else average
 
     def aggregate_average(self, field):
         """Average over the values of the specified field.
@@ -1363,22 +1739,11 @@ class BaseQuerySet(object):
         :param field: the field to average over; use dot-notation to refer to
             embedded document fields
 
-        This method is more performant than the regular `average`, because it
-        uses the aggregation framework instead of map-reduce.
+        .. versionchanged:: 0.10.7 - same as :meth:`average`
         """
-        result = self._document._get_collection().aggregate([
-            {'$match': self._query},
-            {'$group': {'_id': 'avg', 'total': {'$avg': '$' + field}}}
-        ])
-        if IS_PYMONGO_3:
-            result = list(result)
-        else:
-            result = result.get('result')
-        if result:
-            return result[0]['total']
-        return 0
+        return self.average(field)
 
-    def item_frequencies(self, field, normalize=False, map_reduce=True):
+    def item_frequencies(self, field, normalize=False, map_reduce=None):
         """Returns a dictionary of all items present in a field across
         the whole queried set of documents, and their corresponding frequency.
         This is useful for generating tag clouds, or searching documents.
@@ -1391,15 +1756,22 @@ class BaseQuerySet(object):
             counting a manual map reduce call is required.
 
         If the field is a :class:`~mongoengine.fields.ListField`, the items within
-        each list will be counted individually.
+        each list will be counted individually.  With the aggregation framework,
+        the values which are lists or documents are counted under tuples:
+        of their items, and of their sorted ``(key, value)`` pairs.
 
         :param field: the field to use
         :param normalize: normalize the results so they add to 1.0
-        :param map_reduce: Use map_reduce over exec_js
+        :param map_reduce: Use map_reduce (if True) or exec_js (if False)
+            instead of the aggregation framework
 
         .. versionchanged:: 0.5 defaults to map_reduce and can handle embedded
                             document lookups
+        .. versionchanged:: 0.10.7 defaults to the aggregation framework
         """
+        if map_reduce is None:
+            return self._item_frequencies_aggregate(field,
+                                                    normalize=normalize)
         if map_reduce:
             return self._item_frequencies_map_reduce(field,
                                                      normalize=normalize)
@@ -1407,23 +1779,324 @@ class BaseQuerySet(object):
 
     # Iterator helpers
 
+    def iter_batches(self, batch_size=5000, as_pymongo=False):
+        """Iterate over the selected documents by lists of (at most)
+        ``batch_size`` of them, each batch being fetched with one round trip.
+        Unlike iterating over the queryset nothing is cached, only the
+        current batch being held in memory, which suits the scans of large
+        collections::
+
+            for users in User.objects(active=True).iter_batches(1000):
+                export(users)
+
+        Unless the queryset is ordered the documents are read in ``_id``
+        order, so that a scan whose cursor is lost (killed by the server
+        after a timeout, or by a failover) is resumed after the last ``_id``
+        read instead of failing.
+
+        :param batch_size: the number of documents per batch
+        :param as_pymongo: yield the raw documents, as read by pymongo,
+            rather than :class:`~mongoengine.Document` instances
+
+        .. versionadded:: 0.10.7
+        """
+        queryset = self.clone()
+        if queryset._limit == 0 or queryset._none:
+            return
+
+        ordering = queryset._ordering
+        if ordering is None and queryset._document._meta['ordering']:
+            ordering = queryset._get_order_by(
+                queryset._document._meta['ordering'])
+        resumable = not ordering or ordering == [('_id', 1)]
+        if resumable:
+            queryset = queryset.order_by('pk')
+
+        cursor = queryset._cursor
+        cursor.batch_size(batch_size)
+        read = 0
+        last_id = None
+        resumed_at = None
+        while True:
+            try:
+                raw_docs = list(itertools.islice(cursor, batch_size))
+            except (pymongo.errors.CursorNotFound,
+                    pymongo.errors.AutoReconnect):
+                # Don't loop on a scan not progressing between two failures
+                if not resumable or last_id is None or resumed_at == read:
+                    raise
+                resumed_at = read
+                resumed = queryset.filter(pk__gt=last_id)
+                resumed._skip = None
+                if queryset._limit is not None:
+                    resumed._limit = queryset._limit - read
+                    if resumed._limit <= 0:
+                        return
+                cursor = resumed._cursor
+                cursor.batch_size(batch_size)
+                continue
+            if not raw_docs:
+                return
+            read += len(raw_docs)
+            last_id = raw_docs[-1].get('_id')
+
+            if as_pymongo:
+                yield raw_docs
+            else:
+                yield queryset._load_batch(raw_docs)
+
+    def paginate(self, order_by=('pk',), page_size=50, after=None,
+                 before=None):
+        """Return a :class:`~mongoengine.queryset.pagination.Page` of (at
+        most) ``page_size`` documents, selected by a range on the sort keys
+        (keyset pagination) rather than by skipping the previous pages, so
+        that deep pages cost as much as the first one::
+
+            page = Post.objects.paginate(order_by=('-created', 'id'))
+            page = Post.objects.paginate(order_by=('-created', 'id'),
+                                         after=page.next_token)
+            page = Post.objects.paginate(order_by=('-created', 'id'),
+                                         before=page.previous_token)
+
+        The documents are sorted by ``order_by``, the keys ending with the
+        primary key (added if missing) so that the order is total; the
+        index used by the query should match it.  The skip, limit and
+        ordering of the queryset are ignored.
+
+        :param order_by: the sort keys, as given to :meth:`order_by`; they
+            should not be null
+        :param page_size: the number of documents per page
+        :param after: the page starts after this document, or this token
+            (the :attr:`next_token` of the page before)
+        :param before: the page ends before this document, or this token
+            (the :attr:`previous_token` of the page after)
+
+        .. versionadded:: 0.10.7
+        """
+        if after is not None and before is not None:
+            raise InvalidQueryError('Pass either after or before')
+
+        keys = []
+        for key in order_by:
+            direction = pymongo.DESCENDING if key[0] == '-' else \
+                pymongo.ASCENDING
+            keys.append((key.lstrip('+-').replace('.', '__'), direction))
+        db_keys = [db_key for db_key, direction in
+                   self._get_order_by([path for path, direction in keys])]
+        if '_id' not in db_keys:
+            keys.append(('pk', pymongo.ASCENDING))
+            db_keys.append('_id')
+        ordering = [[db_key, direction]
+                    for db_key, (path, direction) in zip(db_keys, keys)]
+
+        Document = _import_class('Document')
+        queryset = self.clone()
+        backwards = before is not None
+        boundary = before if backwards else after
+        if boundary is not None:
+            if isinstance(boundary, basestring):
+                values = decode_token(boundary, ordering)
+            else:
+                if isinstance(boundary, Document):
+                    boundary = boundary.to_mongo()
+                values = [son_value(boundary, db_key) for db_key in db_keys]
+            queryset = queryset.filter(seek_query(keys, values, backwards))
+
+        queryset._cursor_obj = None
+        queryset._ordering = queryset._get_order_by([
+            ('-' if (direction < 0) != backwards else '') + path
+            for path, direction in keys])
+        queryset._skip = None
+        queryset._limit = page_size + 1
+        raw_docs = list(queryset._cursor)
+        has_more = len(raw_docs) > page_size
+        raw_docs = raw_docs[:page_size]
+        if backwards:
+            raw_docs.reverse()
+
+        def token(raw_doc):
+            return encode_token(ordering, [son_value(raw_doc, db_key)
+                                           for db_key in db_keys])
+
+        next_token = previous_token = None
+        if raw_docs:
+            if has_more or backwards:
+                next_token = token(raw_docs[-1])
+            if has_more if backwards else boundary is not None:
+                previous_token = token(raw_docs[0])
+        return Page([queryset._load(raw_doc) for raw_doc in raw_docs],
+                    next_token, previous_token)
+
+    def seek_iter(self, order_by=('pk',), batch_size=1000):
+        """Iterate over the selected documents sorted by ``order_by``,
+        fetching them by pages of ``batch_size`` with :meth:`paginate`: each
+        page is a short query on a range of the index instead of one long
+        running cursor over the whole collection.
+
+        .. versionadded:: 0.10.7
+        """
+        token = None
+        while True:
+            page = self.paginate(order_by, batch_size, after=token)
+            for item in page:
+                yield item
+            token = page.next_token
+            if token is None:
+                return
+
+    def parallel_map(self, func, workers=8, partition='pk', partitions=None,
+                     ordered=False, processes=True, retries=1):
+        """Iterate over the results of ``func`` called on each of the
+        selected documents by a pool of ``workers`` processes (threads if
+        not ``processes``), each one running its own queries::
+
+            def word_count(post):
+                return post.id, len(post.content.split())
+
+            counts = dict(BlogPost.objects(published=True).parallel_map(
+                word_count, workers=4))
+
+        The documents are split into ``partitions`` (by default 4 per worker)
+        disjoint ranges of the values of the ``partition`` field, estimated
+        on a sample of them.  The field should be indexed and hold a single
+        value of the same type in each document (the other documents all
+        fall in the first range).  Each worker gets a pickled copy of the
+        queryset restricted to a range, the processes opening their own
+        connections with the settings of the current ones; ``func`` must
+        then be picklable (e.g. a module level function) and so must its
+        results, and the document classes must be importable by the workers.
+
+        The results of a range are yielded once all computed.  They come in
+        no particular order, unless ``ordered``: the results then follow the
+        order of the ``partition`` field.  A range whose queries fail to
+        reach the server is processed again from its start, up to
+        ``retries`` times, ``func`` being called again on its documents; its
+        results are only yielded once.  Any other exception stops the
+        workers and is raised by the iteration.
+
+        .. versionadded:: 0.10.7
+        """
+        if self._skip is not None or self._limit is not None:
+            raise OperationError(
+                'Cannot split a queryset with a skip or a limit')
+        if partition in ('pk', '_id'):
+            partition = self._document._meta['id_field']
+        db_field, lists = self._aggregation_path(partition)
+        if lists:
+            raise InvalidQueryError(
+                'Cannot split the documents on the list field "%s"'
+                % partition)
+        if self._none:
+            return iter([])
+
+        points = split_points(self, db_field, partitions or workers * 4)
+        querysets = []
+        for query in partition_queries(db_field, points):
+            queryset = self.order_by(partition) if ordered \
+                else self.order_by()
+            if query:
+                # Not merged with the conditions of the queryset on the field
+                queryset._mongo_query = {'$and': [self._query, query]} \
+                    if self._query else query
+            querysets.append(queryset)
+        return run_partitions(querysets, func, workers, ordered, processes,
+                              retries)
+
+    def parallel_iter(self, workers=8, partition='pk', partitions=None,
+                      ordered=False, retries=1):
+        """Iterate over the selected documents fetched by a pool of
+        ``workers`` threads, each one reading a range of the values of the
+        ``partition`` field, as with :meth:`parallel_map`.
+
+        .. versionadded:: 0.10.7
+        """
+        return self.parallel_map(None, workers, partition, partitions,
+                                 ordered, processes=False, retries=retries)
+
     def next(self):
         """Wrap the result in a :class:`~mongoengine.Document` object.
         """
         if self._limit == 0 or self._none:
             raise StopIteration
 
-        raw_doc = self._cursor.next()
+        if self._prefetch_depth:
+            return self._next_from_prefetcher()
+
+        if self._prefetch and not self._as_pymongo:
+            return self._next_prefetched()
+
+        return self._load(self._cursor.next())
+
+    def _load(self, raw_doc):
+        """Convert a raw document to a :class:`~mongoengine.Document`, or
+        to what the queryset returns instead (scalars, raw values).
+        """
         if self._as_pymongo:
             return self._get_as_pymongo(raw_doc)
         doc = self._document._from_son(raw_doc,
-                                       _auto_dereference=self._auto_dereference, only_fields=self.only_fields)
+                                       _auto_dereference=self._auto_dereference, only_fields=self.only_fields,
+                                       _readonly=self._readonly, _in_session=self._in_session())
 
         if self._scalar:
             return self._get_scalar(doc)
 
         return doc
 
+    def _load_batch(self, raw_docs):
+        """Convert a list of raw documents like :meth:`_load`, fetching
+        the references to prefetch of all of them at once.
+        """
+        if not self._prefetch or self._as_pymongo:
+            return [self._load(raw_doc) for raw_doc in raw_docs]
+        in_session = self._in_session()
+        docs = [self._document._from_son(
+                    raw_doc, _auto_dereference=self._auto_dereference,
+                    only_fields=self.only_fields, _readonly=self._readonly,
+                    _in_session=in_session)
+                for raw_doc in raw_docs]
+        prefetch_references(docs, self._prefetch)
+        if self._scalar:
+            docs = [self._get_scalar(doc) for doc in docs]
+        return docs
+
+    def _next_prefetched(self):
+        """Return the next document, fetching the results by batches of
+        ``ITER_CHUNK_SIZE`` to prefetch their references.
+        """
+        if not self._prefetch_buffer:
+            docs = self._load_batch(
+                list(itertools.islice(self._cursor, ITER_CHUNK_SIZE)))
+            if not docs:
+                raise StopIteration
+            self._prefetch_buffer = collections.deque(docs)
+        return self._prefetch_buffer.popleft()
+
+    def _next_from_prefetcher(self):
+        """Return the next result, loaded by a thread with the next
+        batches (see :meth:`prefetch_batches`).
+        """
+        if not self._prefetch_buffer:
+            if self._prefetcher is None:
+                self._prefetcher = BatchPrefetcher(
+                    self, self._prefetch_depth, self._prefetch_batch_size)
+            self._prefetch_buffer = collections.deque(
+                self._prefetcher.next_batch())
+        return self._prefetch_buffer.popleft()
+
+    def _close_prefetcher(self):
+        """Stop the thread loading the results (see
+        :meth:`prefetch_batches`), returning the results it loaded that
+        weren't returned yet.
+        """
+        if self._prefetcher is None:
+            return []
+        results = list(self._prefetch_buffer or ())
+        for batch in self._prefetcher.close():
+            results.extend(batch)
+        self._prefetcher = None
+        self._prefetch_buffer = None
+        return results
+
     def rewind(self):
         """Rewind the cursor to its unevaluated state.
 
@@ -1431,8 +2104,110 @@ class BaseQuerySet(object):
         .. versionadded:: 0.3
         """
         self._iter = False
+        self._prefetch_buffer = None
+        if self._prefetcher is not None:
+            self._prefetcher.cancel()
+            self._prefetcher = None
         self._cursor.rewind()
 
+    def _in_session(self):
+        """Return whether the documents read by the queryset are shared
+        with the active :class:`~mongoengine.context_managers.session`, i.e.
+        the queryset reads the collection of the document class, not another
+        one (e.g. with :meth:`using`).
+        """
+        return self._collection_obj == self._document._get_collection()
+
+    def _session(self):
+        """Return the active :class:`~mongoengine.context_managers.session`
+        if the documents read by the queryset are shared with it, else None.
+        """
+        if not self._in_session():
+            return None
+        return _get_session()
+
+    def _document_cache(self):
+        """Return the cache of the documents (see :mod:`mongoengine.cache`),
+        None if there is none or if the queryset reads another collection
+        than the one of the document class (e.g. with :meth:`using`).
+        """
+        cache = get_document_cache(self._document)
+        if cache is None or not self._in_session():
+            return None
+        return cache
+
+    def _get_query_cache(self):
+        """Return the cache of the documents (see :mod:`mongoengine.cache`)
+        when the query can be answered from it, i.e. it selects a whole
+        document by its id only; None otherwise.
+        """
+        cache = self._document_cache()
+        if (cache is None or self._none or self._limit == 0 or self._skip or
+                self._loaded_fields or self._where_clause or
+                self._as_pymongo or self._scalar):
+            return None
+        query = self._query
+        if '_id' not in query or isinstance(query['_id'], dict):
+            return None
+        if len(query) != (2 if '_cls' in query else 1):
+            return None
+        return cache
+
+    def _get_cached(self, cache):
+        """Return the document selected by a query on its id, read through
+        the document ``cache``, None if there is none.
+        """
+        query = self._query
+        object_id = query['_id']
+        son = fetch_documents(self._document, cache, [object_id],
+                              self._collection).get(object_id)
+        if son is None:
+            return None
+        if '_cls' in query:
+            classes = query['_cls']
+            if isinstance(classes, dict):
+                classes = classes['$in']
+            else:
+                classes = [classes]
+            if son.get('_cls') not in classes:
+                return None
+        return self._document._from_son(
+            son, _auto_dereference=self._auto_dereference,
+            _readonly=self._readonly)
+
+    def _invalidate_cached(self):
+        """Remove the documents the query may select from the document
+        cache, if any.
+        """
+        if get_document_cache(self._document) is None:
+            return
+        object_id = self._query.get('_id')
+        if object_id is None:
+            invalidate(self._document)
+        elif not isinstance(object_id, dict):
+            invalidate(self._document, [object_id])
+        elif list(object_id) == ['$in']:
+            invalidate(self._document, object_id['$in'])
+        else:
+            invalidate(self._document)
+
+    def _invalidate_written(self, operations):
+        """Remove the documents the bulk ``operations`` may have changed
+        from the document cache, if any.
+        """
+        if get_document_cache(self._document) is None:
+            return
+        object_ids = []
+        for operation in operations:
+            doc = operation.document
+            if doc is None:
+                invalidate(self._document)
+                return
+            if doc.pk is not None:
+                id_field = doc._meta['id_field']
+                object_ids.append(doc._fields[id_field].to_mongo(doc.pk))
+        invalidate(self._document, object_ids)
+
     # Properties
 
     @property
@@ -1482,13 +2257,17 @@ class BaseQuerySet(object):
             # In PyMongo 3+, we define the read preference on a collection
             # level, not a cursor level. Thus, we need to get a cloned
             # collection object using `with_options` first.
+            collection = self._collection
             if IS_PYMONGO_3 and self._read_preference is not None:
-                self._cursor_obj = self._collection\
-                    .with_options(read_preference=self._read_preference)\
-                    .find(self._query, **self._cursor_args)
-            else:
-                self._cursor_obj = self._collection.find(self._query,
-                                                         **self._cursor_args)
+                collection = collection.with_options(
+                    read_preference=self._read_preference)
+            if self._lazy and LAZY_LOADING_AVAILABLE and \
+                    not self._as_pymongo:
+                collection = collection.with_options(
+                    codec_options=RawSON.codec_options(
+                        collection.codec_options))
+            self._cursor_obj = collection.find(self._query,
+                                               **self._cursor_args)
             # Apply where clauses to cursor
             if self._where_clause:
                 where_clause = self._sub_js_fields(self._where_clause)
@@ -1518,6 +2297,26 @@ class BaseQuerySet(object):
         """Essential for chained queries with ReferenceFields involved"""
         return self.clone()
 
+    def __getstate__(self):
+        """Pickle the parameters of the queryset, its document class by name
+        and its collection by connection alias and name.
+        """
+        state = dict((prop, getattr(self, prop)) for prop in self._copy_props)
+        collection = self._collection
+        alias = _get_alias(collection.database) or \
+            self._document._meta.get('db_alias', DEFAULT_CONNECTION_NAME)
+        state['_document'] = self._document._class_name
+        state['_collection_obj'] = (alias, collection.name)
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        document = get_document(state.pop('_document'))
+        alias, collection_name = state.pop('_collection_obj')
+        self.__init__(document, get_db(alias)[collection_name])
+        for prop, value in state.iteritems():
+            setattr(self, prop, value)
+
     @property
     def _query(self):
         if self._mongo_query is None:
@@ -1544,6 +2343,31 @@ class BaseQuerySet(object):
 
     # Helper Functions
 
+    def _item_frequencies_aggregate(self, field, normalize=False):
+        path, lists = self._aggregation_path(field)
+        stages = []
+        for list_path in lists:
+            # Missing and null lists count as None, like with map/reduce,
+            # while empty ones are dropped
+            stages.append({'$project': {list_path: {
+                '$ifNull': ['$' + list_path, {'$literal': [None]}]}}})
+            stages.append({'$unwind': '$' + list_path})
+        pipeline = self._aggregate_pipeline(stages, project=False)
+        pipeline.append({'$group': {'_id': '$' + path,
+                                    'count': {'$sum': 1}}})
+        frequencies = {}
+        if not self._none:
+            for result in self._run_pipeline(pipeline):
+                key = _hashable(result['_id'])
+                frequencies[key] = frequencies.get(key, 0) + result['count']
+
+        if normalize:
+            count = sum(frequencies.values())
+            frequencies = dict([(k, float(v) / count)
+                                for k, v in frequencies.items()])
+
+        return frequencies
+
     def _item_frequencies_map_reduce(self, field, normalize=False):
         map_func = """
             function() {
@@ -1814,6 +2638,112 @@ class BaseQuerySet(object):
         setattr(queryset, "_" + method_name, val)
         return queryset
 
+    _bulk_counters = ('nInserted', 'nUpserted', 'nMatched', 'nModified',
+                      'nRemoved')
+
+    def _get_bulk_batch_size(self):
+        """The number of writes the server accepts in a single batch."""
+        database = self._collection.database
+        client = database.client if IS_PYMONGO_3 else database.connection
+        batch_size = getattr(client, 'max_write_batch_size', None)
+        # Clients unaware of the limit return a Database for the attribute
+        if not isinstance(batch_size, (int, long)):
+            batch_size = 1000
+        return batch_size
+
+    def _bulk_write_batch(self, batch, ordered, validate, clean,
+                          write_concern, signal_kwargs, result):
+        """Write a batch of bulk operations, adding its counters to
+        ``result`` and returning the ``(target, error)`` list of the writes
+        which failed.
+        """
+        for operation in batch:
+            document = operation.document
+            if (document is not None and
+                    not isinstance(document, self._document)):
+                msg = ("Some documents to write aren't instances of %s"
+                       % str(self._document))
+                raise OperationError(msg)
+
+        inserted = [op.document for op in batch if isinstance(op, InsertOne)]
+        if inserted and signals.has_receivers(signals.pre_bulk_insert,
+                                              self._document):
+            signals.pre_bulk_insert.send(self._document, documents=inserted,
+                                         **signal_kwargs)
+
+        writes = []
+        noops = []
+        for operation in batch:
+            if operation._prepare(self, validate, clean, signal_kwargs):
+                writes.append(operation)
+            else:
+                noops.append(operation)
+
+        raw_result = {}
+        if writes:
+            if ordered:
+                bulk = self._collection.initialize_ordered_bulk_op()
+            else:
+                bulk = self._collection.initialize_unordered_bulk_op()
+            for operation in writes:
+                operation._add_to(bulk, self)
+
+            try:
+                raw_result = bulk.execute(write_concern)
+            except pymongo.errors.BulkWriteError as err:
+                raw_result = err.details
+            except pymongo.errors.DuplicateKeyError as err:
+                message = u'Tried to save duplicate unique keys (%s)'
+                raise NotUniqueError(message % unicode(err))
+            except pymongo.errors.OperationFailure as err:
+                message = u'Could not perform bulk write (%s)'
+                raise OperationError(message % unicode(err))
+
+        for counter in self._bulk_counters:
+            result[counter] += raw_result.get(counter) or 0
+
+        errors = {}
+        for error in raw_result.get('writeErrors', ()):
+            errors[error['index']] = self._bulk_write_error(error)
+        if errors and ordered:
+            # Nothing after the first failure has been written
+            written = range(min(errors))
+        else:
+            written = [i for i in range(len(writes)) if i not in errors]
+        upserted = set(up['index'] for up in raw_result.get('upserted', ()))
+
+        for index in written:
+            writes[index]._done(index in upserted, signal_kwargs)
+        for operation in noops:
+            operation._done(False, signal_kwargs)
+
+        if inserted and signals.has_receivers(signals.post_bulk_insert,
+                                              self._document):
+            failed = set(id(writes[index].document) for index in errors)
+            if ordered and errors:
+                failed.update(id(op.document) for op in writes[min(errors):])
+            signals.post_bulk_insert.send(
+                self._document, loaded=False,
+                documents=[doc for doc in inserted if id(doc) not in failed],
+                **signal_kwargs)
+
+        if raw_result.get('writeConcernErrors'):
+            message = u'Bulk write concern failed (%s)'
+            raise OperationError(message % raw_result['writeConcernErrors'])
+
+        return [(writes[index].target, errors[index])
+                for index in sorted(errors)]
+
+    def _bulk_write_error(self, error):
+        """Convert a bulk write error into the exception its write would
+        have raised on its own.
+        """
+        if error.get('code') in (11000, 11001, 12582):
+            message = u'Tried to save duplicate unique keys (%s)'
+            return NotUniqueError(message % error.get('errmsg'))
+        message = u'Could not save document (%s)'
+        return OperationError(message % error.get('errmsg'))
+
     # Deprecated
     def ensure_index(self, **kwargs):
         """Deprecated use :func:`Document.ensure_index`"""
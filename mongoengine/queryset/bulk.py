@@ -0,0 +1,247 @@
+from mongoengine import signals
+from mongoengine.errors import OperationError
+from mongoengine.queryset import transform
+from mongoengine.queryset.visitor import QNode
+
+__all__ = ('InsertOne', 'SaveOne', 'UpdateOne', 'UpdateMany', 'DeleteOne',
+           'DeleteMany')
+
+
+class BulkOperation(object):
+    """Base class of the operations accepted by
+    :meth:`~mongoengine.queryset.QuerySet.bulk_write`.
+
+    .. versionadded:: 0.10.7
+    """
+    document = None
+
+    @property
+    def target(self):
+        """What a failed write of this operation is reported against: its
+        document when it has one, the operation itself otherwise.
+        """
+        if self.document is not None:
+            return self.document
+        return self
+
+    def _prepare(self, queryset, validate, clean, signal_kwargs):
+        """Run the steps preceding the write (validation, signals, ...) and
+        return whether there is anything to write.
+        """
+        return True
+
+    def _add_to(self, bulk, queryset):
+        """Add the write to a pymongo bulk operation."""
+        raise NotImplementedError
+
+    def _done(self, upserted, signal_kwargs):
+        """Called once the write went through, ``upserted`` telling whether
+        it inserted a new document.
+        """
+        pass
+
+
+class _QueryOperation(BulkOperation):
+    """Base class of the operations selecting documents with a query, given
+    either as a :class:`~mongoengine.queryset.Q` object or as a dict of
+    Django-style keyword arguments.
+    """
+
+    def __init__(self, query):
+        self.query = query
+
+    def _get_query(self, queryset):
+        if isinstance(self.query, QNode):
+            return queryset.filter(self.query)._query
+        return queryset.filter(**self.query)._query
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.query)
+
+
+class InsertOne(BulkOperation):
+    """Insert a new document.  Inserts of a batch fire the
+    ``pre_bulk_insert`` / ``post_bulk_insert`` signals together.
+    """
+
+    def __init__(self, document):
+        self.document = document
+
+    def _prepare(self, queryset, validate, clean, signal_kwargs):
+        if validate:
+            self.document.validate(clean=clean)
+        self._son = self.document.to_mongo()
+        return True
+
+    def _add_to(self, bulk, queryset):
+        bulk.insert(self._son)
+
+    def _done(self, upserted, signal_kwargs):
+        doc = self.document
+        id_field = doc._meta['id_field']
+        doc[id_field] = doc._fields[id_field].to_python(self._son['_id'])
+        doc._clear_changed_fields()
+        doc._created = False
+
+    def __repr__(self):
+        return 'InsertOne(%r)' % self.document
+
+
+class SaveOne(BulkOperation):
+    """Save a document the way :meth:`~mongoengine.Document.save` does: new
+    documents are inserted, existing ones updated with the ``$set`` /
+    ``$unset`` of their changes.  Save signals fire for each document.
+    """
+
+    def __init__(self, document):
+        self.document = document
+
+    def _prepare(self, queryset, validate, clean, signal_kwargs):
+        doc = self.document
+        doc_cls = doc.__class__
+        if signals.has_receivers(signals.pre_save, doc_cls):
+            signals.pre_save.send(doc_cls, document=doc, **signal_kwargs)
+
+        if validate:
+            doc._validate_for_save(clean)
+
+        if doc._created or doc.pk is None:
+            self._son = son = doc.to_mongo()
+            self._created = '_id' not in son or doc._created
+        else:
+            # Only the changes of existing documents are serialized
+            self._son = None
+            self._created = False
+
+        if signals.has_receivers(signals.pre_save_post_validation, doc_cls):
+            signals.pre_save_post_validation.send(
+                doc_cls, document=doc, created=self._created, **signal_kwargs)
+
+        if self._created:
+            return True
+        self._query, self._update = doc._build_save_update()
+        return bool(self._update)
+
+    def _add_to(self, bulk, queryset):
+        son = self._son
+        if not self._created:
+            bulk.find(self._query).upsert().update_one(self._update)
+        elif '_id' in son:
+            bulk.find({'_id': son['_id']}).upsert().replace_one(son)
+        else:
+            bulk.insert(son)
+
+    def _done(self, upserted, signal_kwargs):
+        doc = self.document
+        doc_cls = doc.__class__
+        created = self._created or upserted
+        id_field = doc._meta['id_field']
+        if created or id_field not in doc._meta.get('shard_key', []):
+            object_id = (self._query['_id'] if self._son is None
+                         else self._son['_id'])
+            doc[id_field] = doc._fields[id_field].to_python(object_id)
+
+        if signals.has_receivers(signals.post_save, doc_cls):
+            signals.post_save.send(doc_cls, document=doc, created=created,
+                                   **signal_kwargs)
+        doc._clear_changed_fields()
+        doc._created = False
+
+    def __repr__(self):
+        return 'SaveOne(%r)' % self.document
+
+
+class UpdateOne(_QueryOperation):
+    """Apply a Django-style update (``{'inc__count': 1}``) to the first
+    document matching ``query``.
+    """
+    multi = False
+
+    def __init__(self, query, update, upsert=False):
+        super(UpdateOne, self).__init__(query)
+        if not update and not upsert:
+            raise OperationError("No update parameters, would remove data")
+        self.update = update
+        self.upsert = upsert
+
+    def _add_to(self, bulk, queryset):
+        query = self._get_query(queryset)
+        update = transform.update(queryset._document, **self.update)
+
+        # If doing an atomic upsert on an inheritable class
+        # then ensure we add _cls to the update operation
+        if self.upsert and '_cls' in query:
+            update.setdefault('$set', {})['_cls'] = \
+                queryset._document._class_name
+
+        selection = bulk.find(query)
+        if self.upsert:
+            selection = selection.upsert()
+        if self.multi:
+            selection.update(update)
+        else:
+            selection.update_one(update)
+
+    def __repr__(self):
+        return '%s(%r, %r, upsert=%r)' % (self.__class__.__name__, self.query,
+                                          self.update, self.upsert)
+
+
+class UpdateMany(UpdateOne):
+    """Apply a Django-style update to all the documents matching
+    ``query``.
+    """
+    multi = True
+
+
+class DeleteOne(_QueryOperation):
+    """Delete a document, or the first document matching a query.  Deleting
+    a document fires its delete signals.
+
+    .. note:: Delete rules are not applied.
+    """
+
+    def __init__(self, document_or_query):
+        if isinstance(document_or_query, (dict, QNode)):
+            super(DeleteOne, self).__init__(document_or_query)
+        else:
+            super(DeleteOne, self).__init__(None)
+            self.document = document_or_query
+
+    def _prepare(self, queryset, validate, clean, signal_kwargs):
+        doc = self.document
+        if doc is not None and signals.has_receivers(signals.pre_delete,
+                                                     doc.__class__):
+            signals.pre_delete.send(doc.__class__, document=doc,
+                                    **signal_kwargs)
+        return True
+
+    def _add_to(self, bulk, queryset):
+        doc = self.document
+        if doc is not None:
+            query = doc._qs.filter(**doc._object_key)._query
+        else:
+            query = self._get_query(queryset)
+        bulk.find(query).remove_one()
+
+    def _done(self, upserted, signal_kwargs):
+        doc = self.document
+        if doc is not None and signals.has_receivers(signals.post_delete,
+                                                     doc.__class__):
+            signals.post_delete.send(doc.__class__, document=doc,
+                                     **signal_kwargs)
+
+    def __repr__(self):
+        if self.document is not None:
+            return 'DeleteOne(%r)' % self.document
+        return super(DeleteOne, self).__repr__()
+
+
+class DeleteMany(_QueryOperation):
+    """Delete all the documents matching ``query``.
+
+    .. note:: Delete rules are not applied.
+    """
+
+    def _add_to(self, bulk, queryset):
+        bulk.find(self._get_query(queryset)).remove()
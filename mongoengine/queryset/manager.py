@@ -1,7 +1,8 @@
 from functools import partial
+from mongoengine.queryset.async_queryset import AsyncQuerySet
 from mongoengine.queryset.queryset import QuerySet
 
-__all__ = ('queryset_manager', 'QuerySetManager')
+__all__ = ('queryset_manager', 'QuerySetManager', 'AsyncQuerySetManager')
 
 
 class QuerySetManager(object):
@@ -33,8 +34,7 @@ class QuerySetManager(object):
             return self
 
         # owner is the document that contains the QuerySetManager
-        queryset_class = owner._meta.get('queryset_class', self.default)
-        queryset = queryset_class(owner, owner._get_collection())
+        queryset = self._get_base_queryset(owner)
         if self.get_queryset:
             arg_count = self.get_queryset.func_code.co_argcount
             if arg_count == 1:
@@ -45,6 +45,26 @@ class QuerySetManager(object):
                 queryset = partial(self.get_queryset, owner, queryset)
         return queryset
 
+    def _get_base_queryset(self, owner):
+        queryset_class = owner._meta.get('queryset_class', self.default)
+        return queryset_class(owner, owner._get_collection())
+
+
+class AsyncQuerySetManager(QuerySetManager):
+    """
+    The manager of the :class:`~mongoengine.queryset.AsyncQuerySet` objects
+    reading documents with asyncio, available as
+    :attr:`~mongoengine.Document.aobjects`.
+
+    .. versionadded:: 0.10.7
+    """
+
+    default = AsyncQuerySet
+
+    def _get_base_queryset(self, owner):
+        # The asyncio collection is looked up when first used
+        return self.default(owner, None)
+
 
 def queryset_manager(func):
     """Decorator that allows you to define custom QuerySet managers on
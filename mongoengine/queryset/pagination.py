@@ -0,0 +1,77 @@
+import base64
+from collections import Mapping
+
+from bson import BSON
+from bson.errors import BSONError
+
+from mongoengine.errors import InvalidQueryError
+from mongoengine.python_support import PY3
+from mongoengine.queryset.visitor import Q
+
+__all__ = ('Page',)
+
+
+class Page(list):
+    """A page of results of
+    :meth:`~mongoengine.queryset.QuerySet.paginate`.
+
+    :attr:`next_token` is the token to pass as ``after`` to get the next
+    page, None on the last page; :attr:`previous_token` the token to pass as
+    ``before`` to get the previous one, None on the first page.
+
+    .. versionadded:: 0.10.7
+    """
+
+    def __init__(self, items, next_token=None, previous_token=None):
+        super(Page, self).__init__(items)
+        self.next_token = next_token
+        self.previous_token = previous_token
+
+
+def son_value(son, db_key):
+    """Return the value of the dotted ``db_key`` of a raw document."""
+    for part in db_key.split('.'):
+        if not isinstance(son, Mapping):
+            return None
+        son = son.get(part)
+    return son
+
+
+def encode_token(ordering, values):
+    """Return the opaque token of the position ``values`` on the
+    ``ordering``, a list of ``[db key, direction]``."""
+    token = base64.urlsafe_b64encode(BSON.encode({'k': ordering,
+                                                  'v': values}))
+    return token.decode('ascii') if PY3 else token
+
+
+def decode_token(token, ordering):
+    """Return the position on the ``ordering`` held by ``token``."""
+    try:
+        if not PY3:
+            token = str(token)
+        elif isinstance(token, str):
+            token = token.encode('ascii')
+        data = BSON(base64.urlsafe_b64decode(token)).decode()
+    except (BSONError, TypeError, ValueError):
+        raise InvalidQueryError('Invalid pagination token')
+    if data.get('k') != ordering or len(data.get('v', ())) != len(ordering):
+        raise InvalidQueryError('The pagination token was not made for '
+                                'this ordering')
+    return data['v']
+
+
+def seek_query(keys, values, backwards=False):
+    """Return the :class:`~mongoengine.queryset.Q` selecting the documents
+    after the position ``values`` of the ``(field path, direction)`` sort
+    keys ``keys``, or before it if ``backwards``: the ones whose first key
+    is beyond, or whose first key is equal and second key beyond, etc.
+    """
+    query = None
+    for i, (path, direction) in enumerate(keys):
+        ascending = (direction > 0) != backwards
+        conditions = dict((keys[j][0], values[j]) for j in range(i))
+        conditions['%s__%s' % (path, 'gt' if ascending else 'lt')] = \
+            values[i]
+        query = Q(**conditions) if query is None else query | Q(**conditions)
+    return query
@@ -0,0 +1,137 @@
+import numbers
+import pickle
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+
+from pymongo.errors import ConnectionFailure, OperationFailure
+
+from mongoengine.base.common import _document_registry
+from mongoengine.connection import _connection_settings, _forget_connections
+from mongoengine.queryset.pagination import son_value
+
+__all__ = ('split_points', 'partition_queries', 'run_partitions')
+
+# The number of values of the partition field sampled per partition to
+# compute the split points
+SAMPLES_PER_PARTITION = 20
+
+
+def _bracket(value):
+    """Return the group of types MongoDB compares ``value`` with."""
+    if isinstance(value, numbers.Number) and not isinstance(value, bool):
+        return numbers.Number
+    return type(value)
+
+
+def split_points(queryset, db_field, count):
+    """Return up to ``count - 1`` increasing values of ``db_field`` splitting
+    the documents selected by ``queryset`` into ``count`` ranges of about
+    the same size.  They are estimated on a random sample of the documents
+    (MongoDB 3.2), or by skipping through them along ``db_field`` on older
+    servers.
+    """
+    if count < 2:
+        return []
+    query = queryset._query
+    try:
+        values = [son_value(son, db_field) for son in queryset._run_pipeline([
+            {'$match': query},
+            {'$sample': {'size': count * SAMPLES_PER_PARTITION}},
+            {'$project': {db_field: 1}},
+            {'$sort': {db_field: 1}}])]
+        step = len(values) / float(count)
+        values = [values[int(i * step)] for i in xrange(1, count)] \
+            if values else []
+    except OperationFailure:
+        collection = queryset._collection
+        total = collection.find(query).count()
+        values = []
+        for i in xrange(1, count):
+            cursor = collection.find(query, {db_field: 1}) \
+                .sort(db_field, 1).skip(total * i // count).limit(1)
+            values.extend(son_value(son, db_field) for son in cursor)
+
+    # The values sort by type first: keeping the ones compared with each
+    # other, the ranges don't overlap
+    values = [value for value in values if value is not None]
+    if not values:
+        return []
+    bracket = _bracket(values[len(values) // 2])
+    points = []
+    for value in values:
+        if _bracket(value) is bracket and (not points or value != points[-1]):
+            points.append(value)
+    return points
+
+
+def partition_queries(db_field, points):
+    """Return the queries of the disjoint ranges of ``db_field`` delimited
+    by the split ``points``, the first range also matching the documents
+    without a value comparable with them.
+    """
+    if not points:
+        return [{}]
+    queries = [{db_field: {'$not': {'$gte': points[0]}}}]
+    for i, lower in enumerate(points):
+        condition = {'$gte': lower}
+        if i + 1 < len(points):
+            condition['$lt'] = points[i + 1]
+        queries.append({db_field: condition})
+    return queries
+
+
+def _init_worker(settings):
+    """Set up a worker process to open its own connections."""
+    _forget_connections(settings)
+    for document in _document_registry.itervalues():
+        if document.__dict__.get('_collection') is not None:
+            document._collection = None
+
+
+def _run_partition(task):
+    """Return the results of ``func`` on the items of a partition, running
+    it again from the start up to ``retries`` times on connection failures.
+    """
+    queryset, func, retries = task
+    attempt = 0
+    while True:
+        partition = queryset.clone()
+        results = []
+        try:
+            while True:
+                try:
+                    item = partition.next()
+                except StopIteration:
+                    return results
+                results.append(item if func is None else func(item))
+        except ConnectionFailure:
+            attempt += 1
+            if attempt > retries:
+                raise
+
+
+def run_partitions(querysets, func, workers, ordered=False, processes=True,
+                   retries=1):
+    """Yield the results of ``func`` on the items of the ``querysets`` (the
+    items themselves if ``func`` is None) run by a pool of ``workers``
+    processes, or threads if not ``processes``.
+
+    The results of a partition are yielded once all computed, in the order
+    of the ``querysets`` if ``ordered``, else as the partitions complete.
+    """
+    tasks = [(queryset, func, retries) for queryset in querysets]
+    if processes:
+        # Fail here rather than in the pool
+        pickle.dumps(tasks[0], pickle.HIGHEST_PROTOCOL)
+        pool = Pool(min(workers, len(tasks)), _init_worker,
+                    (dict(_connection_settings),))
+    else:
+        pool = ThreadPool(min(workers, len(tasks)))
+    try:
+        imap = pool.imap if ordered else pool.imap_unordered
+        for results in imap(_run_partition, tasks):
+            for result in results:
+                yield result
+    finally:
+        pool.terminate()
+        pool.join()
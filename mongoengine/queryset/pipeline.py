@@ -0,0 +1,179 @@
+from collections import namedtuple
+
+from bson import SON
+
+from mongoengine.base.common import get_document
+from mongoengine.errors import LookUpError
+from mongoengine.queryset.visitor import Q
+
+__all__ = ('Pipeline',)
+
+
+class Pipeline(object):
+    """An aggregation pipeline over the documents of a queryset, built
+    stage by stage with
+    :meth:`~mongoengine.queryset.QuerySet.pipeline`::
+
+        rows = BlogPost.objects(published=True).pipeline() \\
+            .unwind('tags') \\
+            .group('$tags', count={'$sum': 1}, rating={'$avg': '$rating'}) \\
+            .sort('-count') \\
+            .limit(10)
+        top_tags = [(row.id, row.count) for row in rows.named()]
+
+    The stages run after the ones applying the filters, ordering, skip,
+    limit and :meth:`~mongoengine.queryset.QuerySet.only` projection of the
+    queryset.  Until a stage reshapes the documents (``group``, ``project``
+    or a raw stage), field names use the Python names of the document
+    class, with ``__`` or ``.`` separating the fields of embedded
+    documents, and the ``'$field'`` references of the expressions are
+    translated to db fields too.
+
+    The builder methods return a new pipeline, and iterating over it runs
+    it and yields the raw results; :meth:`documents` and :meth:`named` wrap
+    them as they are read from the cursor.
+
+    .. versionadded:: 0.10.7
+    """
+
+    def __init__(self, queryset, stages=(), translate=True):
+        self._queryset = queryset
+        self._stages = list(stages)
+        self._translate = translate
+
+    def _add(self, stage, translate=None):
+        if translate is None:
+            translate = self._translate
+        return Pipeline(self._queryset, self._stages + [stage],
+                        self._translate and translate)
+
+    def _db_path(self, field):
+        """Return the db path of ``field``, unchanged if it isn't a field of
+        the document class (or no longer is one)."""
+        if not self._translate:
+            return field
+        try:
+            return self._queryset._aggregation_path(field)[0]
+        except LookUpError:
+            return field
+
+    def _expression(self, expression):
+        """Translate the ``'$field'`` references of ``expression``."""
+        if isinstance(expression, basestring):
+            if expression.startswith('$') and \
+                    not expression.startswith('$$'):
+                return '$' + self._db_path(expression[1:])
+            return expression
+        if isinstance(expression, dict):
+            return dict((key, self._expression(value))
+                        for key, value in expression.iteritems())
+        if isinstance(expression, (list, tuple)):
+            return [self._expression(value) for value in expression]
+        return expression
+
+    @property
+    def stages(self):
+        """The stages of the pipeline, preceded by the ones applying the
+        queryset."""
+        return self._queryset._aggregate_pipeline(self._stages)
+
+    def match(self, *q_objs, **query):
+        """Add a ``$match`` stage of the documents matching the query, as
+        given to :meth:`~mongoengine.queryset.QuerySet.filter`."""
+        query = Q(**query)
+        for q_obj in q_objs:
+            query &= q_obj
+        query = query.to_query(self._queryset._document)
+        return self._add({'$match': query})
+
+    def group(self, _id=None, **accumulators):
+        """Add a ``$group`` stage grouping the documents by the ``_id``
+        expression (e.g. ``'$author'``, or a dict of expressions for a
+        compound key) and computing each keyword argument with its
+        accumulator (e.g. ``total={'$sum': '$price'}``)."""
+        group = {'_id': self._expression(_id)}
+        for name, accumulator in accumulators.iteritems():
+            group[name] = self._expression(accumulator)
+        return self._add({'$group': group}, translate=False)
+
+    def unwind(self, field, preserve_null_and_empty_arrays=False):
+        """Add an ``$unwind`` stage of the list ``field``, keeping the
+        documents where the list is missing or empty if
+        ``preserve_null_and_empty_arrays`` (MongoDB 3.2)."""
+        path = '$' + self._db_path(field)
+        if preserve_null_and_empty_arrays:
+            return self._add({'$unwind': {
+                'path': path, 'preserveNullAndEmptyArrays': True}})
+        return self._add({'$unwind': path})
+
+    def lookup(self, from_, local_field, foreign_field='id', as_=None):
+        """Add a ``$lookup`` stage (MongoDB 3.2) joining the documents of
+        ``from_`` (a document class or its name) whose ``foreign_field``
+        equals the ``local_field`` of the document, in the list ``as_``
+        (named like ``local_field`` by default)."""
+        if isinstance(from_, basestring):
+            from_ = get_document(from_)
+        foreign_field = from_.objects._aggregation_path(foreign_field)[0]
+        local_field = self._db_path(local_field)
+        return self._add({'$lookup': {
+            'from': from_._get_collection_name(),
+            'localField': local_field,
+            'foreignField': foreign_field,
+            'as': as_ or local_field}})
+
+    def project(self, *fields, **expressions):
+        """Add a ``$project`` stage keeping the ``fields`` and computing
+        each keyword argument with its expression."""
+        project = dict((self._db_path(field), 1) for field in fields)
+        for name, expression in expressions.iteritems():
+            project[name] = self._expression(expression)
+        return self._add({'$project': project}, translate=False)
+
+    def sort(self, *keys):
+        """Add a ``$sort`` stage on the ``keys``, as given to
+        :meth:`~mongoengine.queryset.QuerySet.order_by`."""
+        ordering = []
+        for key in keys:
+            direction = 1
+            if key[:1] in ('-', '+'):
+                direction = -1 if key[0] == '-' else 1
+                key = key[1:]
+            ordering.append((self._db_path(key), direction))
+        return self._add({'$sort': SON(ordering)})
+
+    def skip(self, number):
+        """Add a ``$skip`` stage."""
+        return self._add({'$skip': number})
+
+    def limit(self, number):
+        """Add a ``$limit`` stage."""
+        return self._add({'$limit': number})
+
+    def stage(self, stage):
+        """Add a raw ``stage``, whose field names aren't translated."""
+        return self._add(stage, translate=False)
+
+    def __iter__(self):
+        return iter(self._queryset.aggregate(*self._stages))
+
+    def documents(self, document=None):
+        """Iterate over the results as instances of ``document``, the
+        document class of the queryset by default."""
+        document = document or self._queryset._document
+        auto_dereference = self._queryset._auto_dereference
+        readonly = self._queryset._readonly
+        for son in self:
+            yield document._from_son(son, _auto_dereference=auto_dereference,
+                                     _readonly=readonly)
+
+    def named(self, typename='Row'):
+        """Iterate over the results as named tuples of their fields
+        (``_id`` being named ``id``)."""
+        types = {}
+        for son in self:
+            keys = tuple(son)
+            row_type = types.get(keys)
+            if row_type is None:
+                row_type = types[keys] = namedtuple(
+                    typename, ['id' if key == '_id' else key for key in keys])
+            yield row_type(*[son[key] for key in keys])
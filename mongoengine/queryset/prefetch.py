@@ -0,0 +1,185 @@
+from bson import DBRef, SON
+
+from mongoengine.base.common import get_document
+from mongoengine.base.datastructures import BaseDict, BaseList
+from mongoengine.common import _import_class
+from mongoengine.errors import InvalidQueryError
+
+__all__ = ('prefetch_references', 'validate_path')
+
+
+def _unwrap(field):
+    """Return the field of the items of ``field`` when it is a list or a
+    dict of them, ``field`` itself otherwise.
+    """
+    while getattr(field, 'field', None) is not None:
+        field = field.field
+    return field
+
+
+def validate_path(document, path):
+    """Check that the references of the dotted ``path`` of ``document`` can
+    be prefetched: each part but the last has to be an embedded document or
+    a reference, and the last one a reference, possibly in a list or a dict.
+    """
+    ReferenceField = _import_class('ReferenceField')
+    GenericReferenceField = _import_class('GenericReferenceField')
+    EmbeddedDocumentField = _import_class('EmbeddedDocumentField')
+
+    parts = path.split('.')
+    for i, part in enumerate(parts):
+        if document is None:
+            # Past a generic reference: can only be checked on the documents
+            return
+        field = document._fields.get(part)
+        if field is None:
+            raise InvalidQueryError('Cannot prefetch "%s": %s has no field '
+                                    '"%s"' % (path, document.__name__, part))
+        field = _unwrap(field)
+        if isinstance(field, GenericReferenceField):
+            document = None
+        elif isinstance(field, (ReferenceField, EmbeddedDocumentField)):
+            if (i == len(parts) - 1 and
+                    isinstance(field, EmbeddedDocumentField)):
+                break
+            document = field.document_type
+        else:
+            break
+    else:
+        return
+    raise InvalidQueryError('Cannot prefetch "%s": "%s" is not a reference'
+                            % (path, part))
+
+
+def prefetch_references(documents, paths):
+    """Replace the references of ``documents`` found at the dotted ``paths``
+    with the documents they point to.  The paths are walked level by level,
+    the references of a level being fetched with one ``$in`` query per
+    referenced class.
+    """
+    tree = {}
+    for path in paths:
+        node = tree
+        for part in path.split('.'):
+            node = node.setdefault(part, {})
+
+    level = [(documents, tree)]
+    while level:
+        steps = [_FieldStep(holders, name, subtree)
+                 for holders, tree in level
+                 for name, subtree in tree.iteritems()]
+
+        ids_by_class = {}
+        for step in steps:
+            for doc_cls, ids in step.ids_by_class.iteritems():
+                ids_by_class.setdefault(doc_cls, set()).update(ids)
+        fetched = {}
+        for doc_cls, ids in ids_by_class.iteritems():
+            for pk, doc in doc_cls.objects.in_bulk(list(ids)).iteritems():
+                fetched[(doc_cls, pk)] = doc
+
+        level = []
+        for step in steps:
+            values = step.attach(fetched)
+            if step.subtree and values:
+                level.append((values, step.subtree))
+
+
+def _iter_items(value):
+    if isinstance(value, dict) and '_ref' not in value:
+        return value.itervalues()
+    if isinstance(value, (list, tuple)):
+        return value
+    return (value,)
+
+
+def _reference_key(field, value):
+    """Return the ``(document class, id)`` the raw reference ``value`` of
+    ``field`` points to, None when ``value`` is not one.
+    """
+    ReferenceField = _import_class('ReferenceField')
+    GenericReferenceField = _import_class('GenericReferenceField')
+    Document = _import_class('Document')
+    if value is None or isinstance(value, Document):
+        return None
+    if isinstance(field, GenericReferenceField):
+        if isinstance(value, (dict, SON)) and '_ref' in value:
+            return get_document(value['_cls']), value['_ref'].id
+    elif isinstance(field, ReferenceField):
+        if isinstance(value, DBRef):
+            return field.document_type, value.id
+        return field.document_type, value
+    return None
+
+
+class _FieldStep(object):
+    """The references held by the field ``name`` of the documents
+    ``holders``, ``subtree`` being the paths to prefetch below it.
+    """
+
+    def __init__(self, holders, name, subtree):
+        ReferenceField = _import_class('ReferenceField')
+        GenericReferenceField = _import_class('GenericReferenceField')
+
+        self.name = name
+        self.subtree = subtree
+        # Values of non-reference fields, i.e. embedded documents
+        self.values = []
+        self.found = []
+        self.ids_by_class = {}
+        for holder in holders:
+            field = holder._fields.get(name)
+            value = holder._data.get(name)
+            if field is None or value is None:
+                continue
+            item_field = _unwrap(field)
+            if not isinstance(item_field, (ReferenceField,
+                                           GenericReferenceField)):
+                self.values.extend(_iter_items(value))
+                continue
+            self.found.append((holder, item_field, value))
+            for item in _iter_items(value):
+                key = _reference_key(item_field, item)
+                if key is not None:
+                    self.ids_by_class.setdefault(key[0], set()).add(key[1])
+
+    def attach(self, fetched):
+        """Replace the references with the ``fetched`` documents, keyed by
+        ``(document class, id)``, and return the documents the field now
+        holds.
+        """
+        Document = _import_class('Document')
+        EmbeddedDocument = _import_class('EmbeddedDocument')
+
+        def _resolve(item_field, item):
+            key = _reference_key(item_field, item)
+            if key is None:
+                return item
+            if key in fetched:
+                return fetched[key]
+            if isinstance(item, (dict, SON)):
+                # Missing generic reference, as GenericReferenceField does
+                return None
+            return item
+
+        name = self.name
+        values = self.values
+        for holder, item_field, value in self.found:
+            if isinstance(value, (list, tuple)):
+                value = BaseList([_resolve(item_field, item)
+                                  for item in value], holder, name)
+                value._dereferenced = True
+                values.extend(value)
+            elif isinstance(value, dict) and '_ref' not in value:
+                value = BaseDict(dict((k, _resolve(item_field, v))
+                                      for k, v in value.iteritems()),
+                                 holder, name)
+                value._dereferenced = True
+                values.extend(value.itervalues())
+            else:
+                value = _resolve(item_field, value)
+                values.append(value)
+            holder._data[name] = value
+
+        return [value for value in values
+                if isinstance(value, (Document, EmbeddedDocument))]
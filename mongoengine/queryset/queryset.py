@@ -1,13 +1,12 @@
 from mongoengine.errors import OperationError
 from mongoengine.queryset.base import (BaseQuerySet, DO_NOTHING, NULLIFY,
-                                       CASCADE, DENY, PULL)
+                                       CASCADE, DENY, PULL, ITER_CHUNK_SIZE)
 
 __all__ = ('QuerySet', 'QuerySetNoCache', 'DO_NOTHING', 'NULLIFY', 'CASCADE',
            'DENY', 'PULL')
 
 # The maximum number of items to display in a QuerySet.__repr__
 REPR_OUTPUT_SIZE = 20
-ITER_CHUNK_SIZE = 100
 
 
 class QuerySet(BaseQuerySet):
@@ -69,15 +68,21 @@ class QuerySet(BaseQuerySet):
         if self._result_cache is None:
             self._result_cache = []
         pos = 0
-        while True:
-            upper = len(self._result_cache)
-            while pos < upper:
-                yield self._result_cache[pos]
-                pos += 1
-            if not self._has_more:
-                raise StopIteration
-            if len(self._result_cache) <= pos:
-                self._populate_cache()
+        try:
+            while True:
+                upper = len(self._result_cache)
+                while pos < upper:
+                    yield self._result_cache[pos]
+                    pos += 1
+                if not self._has_more:
+                    raise StopIteration
+                if len(self._result_cache) <= pos:
+                    self._populate_cache()
+        except GeneratorExit:
+            # Stopped early: the results loaded in the background are
+            # cached for the next iterations
+            self._result_cache.extend(self._close_prefetcher())
+            raise
 
     def _populate_cache(self):
         """
@@ -153,8 +158,21 @@ class QuerySetNoCache(BaseQuerySet):
         if queryset._iter:
             queryset = self.clone()
         queryset.rewind()
+        if queryset._prefetch_depth:
+            return queryset._iter_prefetched()
         return queryset
 
+    def _iter_prefetched(self):
+        """A generator over the results loaded in the background, stopping
+        the thread loading them once closed."""
+        try:
+            while True:
+                yield self.next()
+        except StopIteration:
+            return
+        finally:
+            self.rewind()
+
 
 class QuerySetNoDeRef(QuerySet):
     """Special no_dereference QuerySet"""
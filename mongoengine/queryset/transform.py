@@ -9,7 +9,7 @@ from mongoengine.common import _import_class
 from mongoengine.errors import InvalidQueryError
 from mongoengine.python_support import IS_PYMONGO_3
 
-__all__ = ('query', 'update')
+__all__ = ('query', 'update', 'get_query_plan_stats')
 
 COMPARISON_OPERATORS = ('ne', 'gt', 'gte', 'lt', 'lte', 'in', 'nin', 'mod',
                         'all', 'size', 'exists', 'not', 'elemMatch', 'type')
@@ -26,8 +26,109 @@ MATCH_OPERATORS = (COMPARISON_OPERATORS + GEO_OPERATORS +
                    STRING_OPERATORS + CUSTOM_OPERATORS)
 
 
+# Operators comparing the field with a single value
+SINGULAR_OPERATORS = (None, 'ne', 'gt', 'gte', 'lt', 'lte', 'not') + \
+    STRING_OPERATORS
+
+# Number of query plans kept per document class
+QUERY_PLAN_CACHE_SIZE = 1000
+
+_query_plan_stats = {'hits': 0, 'misses': 0}
+
+
+def get_query_plan_stats():
+    """Return the hit and miss counters of the cache of the query plans,
+    i.e. how the keyword arguments of the queries are transformed.
+
+    .. versionadded:: 0.10.7
+    """
+    return dict(_query_plan_stats)
+
+
+def _query_plan(_doc_cls, key):
+    """Return the (cached) plan of the transformation of the keyword
+    argument ``key`` of a query on ``_doc_cls``, see :func:`_compile_key`.
+    """
+    if _doc_cls is None:
+        return _compile_key(None, key)
+    # Stored on each class: a subclass has its own fields
+    plans = _doc_cls.__dict__.get('_query_plans')
+    if plans is None:
+        plans = {}
+        _doc_cls._query_plans = plans
+    plan = plans.get(key)
+    if plan is None:
+        _query_plan_stats['misses'] += 1
+        if len(plans) >= QUERY_PLAN_CACHE_SIZE:
+            plans.clear()
+        plan = plans[key] = _compile_key(_doc_cls, key)
+    else:
+        _query_plan_stats['hits'] += 1
+    return plan
+
+
+def _compile_key(_doc_cls, key):
+    """Parse the keyword argument ``key`` of a query, returning the
+    ``(db key, operator, negate, field)`` tuple of the dotted key of the
+    database, the operator (None for equality), whether the operator is
+    negated and the field the values are converted with (None without
+    ``_doc_cls``).
+    """
+    parts = key.rsplit('__')
+    indices = [(i, p) for i, p in enumerate(parts) if p.isdigit()]
+    parts = [part for part in parts if not part.isdigit()]
+    # Check for an operator and transform to mongo-style if there is
+    op = None
+    if len(parts) > 1 and parts[-1] in MATCH_OPERATORS:
+        op = parts.pop()
+
+    # Allw to escape operator-like field name by __
+    if len(parts) > 1 and parts[-1] == "":
+        parts.pop()
+
+    negate = False
+    if len(parts) > 1 and parts[-1] == 'not':
+        parts.pop()
+        negate = True
+
+    field = None
+    if _doc_cls:
+        # Switch field names to proper names [set in Field(name='foo')]
+        try:
+            fields = _doc_cls._lookup_field(parts)
+        except Exception as e:
+            raise InvalidQueryError(e)
+        parts = []
+
+        CachedReferenceField = _import_class('CachedReferenceField')
+
+        cleaned_fields = []
+        for field in fields:
+            append_field = True
+            if isinstance(field, basestring):
+                parts.append(field)
+                append_field = False
+            # is last and CachedReferenceField
+            elif isinstance(field, CachedReferenceField) and fields[-1] == field:
+                parts.append('%s._id' % field.db_field)
+            else:
+                parts.append(field.db_field)
+
+            if append_field:
+                cleaned_fields.append(field)
+
+        field = cleaned_fields[-1]
+
+    for i, part in indices:
+        parts.insert(i, part)
+    return '.'.join(parts), op, negate, field
+
+
 def query(_doc_cls=None, **kwargs):
     """Transform a query from Django-style format to Mongo format.
+
+    .. versionchanged:: 0.10.7
+        The parsing of the keyword arguments is cached per document class
     """
     mongo_query = {}
     merge_query = defaultdict(list)
@@ -36,54 +137,11 @@ def query(_doc_cls=None, **kwargs):
             mongo_query.update(value)
             continue
 
-        parts = key.rsplit('__')
-        indices = [(i, p) for i, p in enumerate(parts) if p.isdigit()]
-        parts = [part for part in parts if not part.isdigit()]
-        # Check for an operator and transform to mongo-style if there is
-        op = None
-        if len(parts) > 1 and parts[-1] in MATCH_OPERATORS:
-            op = parts.pop()
-
-        # Allw to escape operator-like field name by __
-        if len(parts) > 1 and parts[-1] == "":
-            parts.pop()
-
-        negate = False
-        if len(parts) > 1 and parts[-1] == 'not':
-            parts.pop()
-            negate = True
+        key, op, negate, field = _query_plan(_doc_cls, key)
 
         if _doc_cls:
-            # Switch field names to proper names [set in Field(name='foo')]
-            try:
-                fields = _doc_cls._lookup_field(parts)
-            except Exception as e:
-                raise InvalidQueryError(e)
-            parts = []
-
-            CachedReferenceField = _import_class('CachedReferenceField')
-
-            cleaned_fields = []
-            for field in fields:
-                append_field = True
-                if isinstance(field, basestring):
-                    parts.append(field)
-                    append_field = False
-                # is last and CachedReferenceField
-                elif isinstance(field, CachedReferenceField) and fields[-1] == field:
-                    parts.append('%s._id' % field.db_field)
-                else:
-                    parts.append(field.db_field)
-
-                if append_field:
-                    cleaned_fields.append(field)
-
             # Convert value to proper value
-            field = cleaned_fields[-1]
-
-            singular_ops = [None, 'ne', 'gt', 'gte', 'lt', 'lte', 'not']
-            singular_ops += STRING_OPERATORS
-            if op in singular_ops:
+            if op in SINGULAR_OPERATORS:
                 if isinstance(field, basestring):
                     if (op in STRING_OPERATORS and
                             isinstance(value, basestring)):
@@ -94,6 +152,8 @@ def query(_doc_cls=None, **kwargs):
                 else:
                     value = field.prepare_query_value(op, value)
 
+                    CachedReferenceField = _import_class(
+                        'CachedReferenceField')
                     if isinstance(field, CachedReferenceField) and value:
                         value = value['_id']
 
@@ -123,9 +183,6 @@ def query(_doc_cls=None, **kwargs):
         if negate:
             value = {'$not': value}
 
-        for i, part in indices:
-            parts.insert(i, part)
-        key = '.'.join(parts)
         if op is None or key not in mongo_query:
             mongo_query[key] = value
         elif key in mongo_query:
@@ -5,7 +5,8 @@ __all__ = ['pre_init', 'post_init', 'pre_save', 'pre_save_post_validation',
 
 signals_available = False
 try:
-    from blinker import Namespace
+    from blinker import ANY, Namespace as _BlinkerNamespace, NamedSignal
+    from blinker.base import ANY_ID
 
     signals_available = True
 except ImportError:
@@ -34,6 +35,55 @@ except ImportError:
             temporarily_connected_to = _fail
         del _fail
 
+# Ids of the senders each signal has receivers for, keyed by signal name.
+# ``None`` stands for receivers connected to any sender.  Kept up to date on
+# connect / disconnect so that hot paths can skip sending (and building the
+# arguments of) signals nobody listens to.
+_receivers_registry = {}
+
+
+def has_receivers(signal, sender):
+    """Return True if ``signal`` has receivers connected for ``sender``,
+    either specifically or for any sender.
+
+    Unlike ``Signal.has_receivers_for`` this is safe to call when blinker is
+    not installed, in which case it always returns False.
+    """
+    senders = _receivers_registry.get(signal.name)
+    return bool(senders) and (None in senders or id(sender) in senders)
+
+
+if signals_available:
+    class _RegisteredSignal(NamedSignal):
+        """A blinker signal recording its senders in the receivers
+        registry.
+        """
+
+        def connect(self, receiver, sender=ANY, weak=True):
+            receiver = super(_RegisteredSignal, self).connect(
+                receiver, sender=sender, weak=weak)
+            self._update_registry()
+            return receiver
+
+        def disconnect(self, receiver, sender=ANY):
+            super(_RegisteredSignal, self).disconnect(receiver, sender=sender)
+            self._update_registry()
+
+        def _update_registry(self):
+            senders = set()
+            if self.receivers:
+                for sender_id, receivers in self._by_sender.items():
+                    if receivers:
+                        senders.add(None if sender_id == ANY_ID else sender_id)
+            _receivers_registry[self.name] = frozenset(senders)
+
+    class Namespace(_BlinkerNamespace):
+        def signal(self, name, doc=None):
+            try:
+                return self[name]
+            except KeyError:
+                return self.setdefault(name, _RegisteredSignal(name, doc))
+
 # the namespace for code signals.  If you are not mongoengine code, do
 # not put signals in here.  Create your own namespace instead.
 _signals = Namespace()
@@ -865,5 +865,113 @@ class DeltaTest(unittest.TestCase):
         self.assertEqual('oops', delta[0]["users.007.rolist"][0]["type"])
         self.assertEqual(uinfo.id, delta[0]["users.007.info"])
 
+    def test_delta_serializes_changed_fields_only(self):
+        """Ensure saving changes only serializes the changed fields."""
+        serialized = []
+
+        class TrackedListField(ListField):
+            def to_mongo(self, value, *args, **kwargs):
+                serialized.append(self.name)
+                return super(TrackedListField, self).to_mongo(
+                    value, *args, **kwargs)
+
+        class Post(Document):
+            title = StringField()
+            tags = TrackedListField(StringField())
+            comments = TrackedListField(StringField())
+
+        Post.drop_collection()
+        post = Post(title='Test', tags=['a'], comments=['b']).save()
+
+        del serialized[:]
+        post.title = 'New title'
+        post.tags.append('c')
+        self.assertEqual(post._delta(), ({'title': 'New title',
+                                          'tags': ['a', 'c']}, {}))
+        post.save()
+        self.assertEqual(set(serialized), set(['tags']))
+
+        post.reload()
+        self.assertEqual(post.title, 'New title')
+        self.assertEqual(post.tags, ['a', 'c'])
+        self.assertEqual(post.comments, ['b'])
+
+    def test_array_updates(self):
+        """Ensure appending to or removing values from a list updates the
+        array rather than setting the whole list.
+        """
+        class Post(Document):
+            tags = ListField(StringField(), db_field='t')
+            scores = ListField(IntField())
+
+        Post.drop_collection()
+        Post(tags=['a', 'b'], scores=[1, 2, 3]).save()
+
+        post = Post.objects.get()
+        post.tags.append('c')
+        post.tags.extend(['d'])
+        self.assertEqual(post._build_save_update()[1],
+                         {'$push': {'t': {'$each': ['c', 'd']}}})
+        # A concurrent append isn't lost
+        other = Post.objects.get()
+        other.tags.append('e')
+        other.save()
+        post.save()
+        self.assertEqual(Post.objects.get().tags, ['a', 'b', 'e', 'c', 'd'])
+
+        post = Post.objects.get()
+        post.tags.remove('a')
+        self.assertEqual(post._build_save_update()[1],
+                         {'$pullAll': {'t': ['a']}})
+        post.save()
+        self.assertEqual(Post.objects.get().tags, ['b', 'e', 'c', 'd'])
+
+        post.scores.pop()
+        self.assertEqual(post._build_save_update()[1],
+                         {'$pop': {'scores': 1}})
+
+        post = Post.objects.get()
+        post.scores[1] = 5
+        self.assertEqual(post._build_save_update()[1],
+                         {'$set': {'scores.1': 5}})
+
+        # Changes not written as a single update of the array
+        post = Post.objects.get()
+        post.scores.insert(0, 0)
+        post.scores.append(4)
+        self.assertEqual(post._build_save_update()[1],
+                         {'$set': {'scores': [0, 1, 2, 3, 4]}})
+        post = Post.objects.get()
+        post.scores = [7]
+        post.scores.append(8)
+        self.assertEqual(post._build_save_update()[1],
+                         {'$set': {'scores': [7, 8]}})
+
+    def test_array_updates_assigned_list(self):
+        """Ensure the changes of a list assigned from another field or
+        document set the whole list.
+        """
+        class Post(Document):
+            tags = ListField(StringField())
+            other = ListField(StringField())
+
+        Post.drop_collection()
+        Post(tags=['a1', 'a2']).save()
+        Post(tags=['b1'], other=['t']).save()
+
+        a, b = Post.objects.order_by('tags')
+        b.tags = a.tags
+        b.tags.append('x')
+        b.save()
+        self.assertEqual(Post.objects.get(pk=b.pk).tags, ['a1', 'a2', 'x'])
+        self.assertEqual(Post.objects.get(pk=a.pk).tags, ['a1', 'a2'])
+
+        b = Post.objects.get(pk=b.pk)
+        b.tags = b.other
+        b.tags.append('y')
+        b.save()
+        b = Post.objects.get(pk=b.pk)
+        self.assertEqual(b.tags, ['t', 'y'])
+
 if __name__ == '__main__':
     unittest.main()
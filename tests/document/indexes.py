@@ -11,7 +11,8 @@ from nose.plugins.skip import SkipTest
 from datetime import datetime
 
 from mongoengine import *
-from mongoengine.connection import get_db, get_connection
+from mongoengine.connection import (get_db, get_connection,
+                                    _get_command_monitor)
 
 __all__ = ("IndexesTest", )
 
@@ -1021,6 +1022,63 @@ class IndexesTest(unittest.TestCase):
         index_info = TestDoc._get_collection().index_information()
         self.assertTrue('shard_1_1__cls_1_txt_1_1' in index_info)
 
+    def test_sync_indexes(self):
+        """Ensure sync_indexes creates the missing indexes only, and that
+        the indexes ensured are not created again on save.
+        """
+        class BlogPost(Document):
+            title = StringField()
+            tags = ListField(StringField())
+            meta = {'indexes': ['title', 'tags'], 'auto_create_index': False}
+
+        class Author(Document):
+            name = StringField()
+            meta = {'indexes': ['name'], 'auto_create_index': False}
+
+        BlogPost._get_collection().create_index('title')
+        created = sync_indexes([BlogPost, Author], concurrency=2)
+        self.assertEqual(sorted((doc_cls.__name__, fields)
+                                for doc_cls, fields in created),
+                         [('Author', [('name', 1)]),
+                          ('BlogPost', [('tags', 1)])])
+        self.assertEqual(BlogPost.compare_indexes(),
+                         {'missing': [], 'extra': []})
+        self.assertEqual(sync_indexes([BlogPost, Author]), [])
+
+        class Tag(Document):
+            name = StringField()
+            meta = {'indexes': ['name']}
+
+        Tag(name='mongo').save()
+        Tag._get_collection().drop_indexes()
+        Tag(name='python').save()
+        if _get_command_monitor() is not None:
+            # Unmonitored clients can't see the drops, and ensure the
+            # indexes on every save
+            self.assertEqual(Tag.compare_indexes()['missing'],
+                             [[('name', 1)]])
+        Tag.ensure_indexes()
+        self.assertEqual(Tag.compare_indexes()['missing'], [])
+
+    def test_sync_indexes_options(self):
+        """Ensure sync_indexes raises on the indexes existing on the same
+        keys but with other options, instead of taking them as created.
+        """
+        class Account(Document):
+            email = StringField()
+            meta = {'indexes': [{'fields': ['email'], 'unique': True}],
+                    'auto_create_index': False}
+
+        Account.drop_collection()
+        Account._get_collection().create_index('email')
+        self.assertRaises(OperationError, sync_indexes, [Account])
+        self.assertFalse(Account._get_collection().index_information()[
+            'email_1'].get('unique'))
+
+        Account._get_collection().drop_indexes()
+        Account._get_collection().create_index('email', unique=True)
+        self.assertEqual(sync_indexes([Account]), [])
+
 
 if __name__ == '__main__':
     unittest.main()
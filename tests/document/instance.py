@@ -21,7 +21,7 @@ from mongoengine.errors import (NotRegistered, InvalidDocumentError,
                                 FieldDoesNotExist, SaveConditionError)
 from mongoengine.queryset import NULLIFY, Q
 from mongoengine.connection import get_db
-from mongoengine.base import get_document
+from mongoengine.base import get_document, RawSON
 from mongoengine.context_managers import switch_db, query_counter
 from mongoengine import signals
 
@@ -3131,6 +3131,80 @@ class InstanceTest(unittest.TestCase):
         self.assertEquals(p.id, None)
         p.id = "12345"  # in case it is not working: "OperationError: Shard Keys are immutable..." will be raised here
 
+    def test_from_son_hydration_plan(self):
+        class Comment(EmbeddedDocument):
+            text = StringField()
+
+        class BlogPost(Document):
+            title = StringField(db_field='t')
+            views = IntField(default=0)
+            tags = ListField(StringField(), default=lambda: ['new'])
+            comment = EmbeddedDocumentField(Comment)
+
+        son = {'_id': ObjectId(), 't': u'Hello', 'comment': {'text': u'Hi'}}
+        post = BlogPost._from_son(son)
+        expected = BlogPost._from_son_init(son, True, [], False)
+
+        self.assertTrue(BlogPost._hydration_plan.supported)
+        self.assertEqual(post._data, expected._data)
+        self.assertEqual(post._changed_fields, expected._changed_fields)
+        self.assertEqual(post._changed_fields, ['tags'])
+        self.assertEqual(post.title, 'Hello')
+        self.assertEqual(post.views, 0)
+        self.assertFalse(post._created)
+        self.assertTrue(post._initialised)
+        self.assertEqual(post.comment._instance, post)
+
+        # Unknown fields still raise through the constructor
+        self.assertRaises(FieldDoesNotExist, BlogPost._from_son,
+                          {'_id': ObjectId(), 'missing': 1})
+
+    def test_from_son_hydration_plan_rebuilt(self):
+        class Person(Document):
+            name = StringField()
+
+        Person._from_son({'name': u'Ross'})
+        plan = Person._hydration_plan
+        Person._from_son({'name': u'Ross'})
+        self.assertTrue(Person._hydration_plan is plan)
+
+        age = IntField(default=30)
+        age.name = age.db_field = 'age'
+        Person._fields['age'] = age
+        person = Person._from_son({'name': u'Ross'})
+        self.assertFalse(Person._hydration_plan is plan)
+        self.assertEqual(person._data.get('age'), 30)
+
+    def test_from_raw_son_lazy(self):
+        if RawSON is None:
+            raise unittest.SkipTest('RawBSONDocument requires PyMongo 3')
+
+        class Comment(EmbeddedDocument):
+            text = StringField()
+
+        class BlogPost(Document):
+            title = StringField(db_field='t')
+            tags = ListField(StringField())
+            comment = EmbeddedDocumentField(Comment)
+            thumbnail = BinaryField()
+
+        son = {'_id': ObjectId(), 't': u'Hello', 'tags': [u'a', u'b'],
+               'comment': {'text': u'Hi'}, 'thumbnail': bson.Binary(b'png')}
+        post = BlogPost._from_son(RawSON(bson.BSON.encode(son)))
+
+        self.assertEqual(sorted(post._data._lazy_source.pending),
+                         ['comment', 'id', 'tags', 'thumbnail', 'title'])
+        self.assertEqual(post.title, 'Hello')
+        self.assertFalse(post._data._lazy_loaded('tags'))
+        self.assertEqual(post._get_changed_fields(), [])
+        self.assertEqual(post.comment._instance, post)
+        self.assertEqual(post.thumbnail.tobytes(), b'png')
+
+        post.tags.append(u'c')
+        self.assertEqual(post._delta(), ({'tags': [u'a', u'b', u'c']}, {}))
+        son['tags'].append(u'c')
+        self.assertEqual(post.to_mongo(), BlogPost._from_son(son).to_mongo())
+
     def test_null_field(self):
         # 734
         class User(Document):
@@ -212,6 +212,42 @@ class ValidatorErrorTest(unittest.TestCase):
         except ValidationError as e:
             self.fail("ValidationError raised: %s" % e.message)
 
+    def test_validate_changed_fields(self):
+        """Ensure only the changed fields of saved documents are validated
+        when the validation meta option is 'changed'.
+        """
+        class Comment(EmbeddedDocument):
+            body = StringField(max_length=10)
+
+        class Post(Document):
+            title = StringField(required=True)
+            rank = IntField(min_value=0)
+            comments = ListField(EmbeddedDocumentField(Comment))
+            meta = {'validation': 'changed'}
+
+        Post.drop_collection()
+        post = Post(title='Test', comments=[Comment(body='Too long body')])
+        self.assertRaises(ValidationError, post.save)
+        post.save(validate=False)
+
+        # The invalid comments are left unchecked
+        post.rank = 1
+        post.save()
+        post.rank = -1
+        self.assertRaises(ValidationError, post.save)
+        post.rank = 1
+
+        post.comments[0].body = 'Still too long'
+        self.assertRaises(ValidationError, post.save)
+        post.comments[0].body = 'Short'
+
+        # Required fields are still checked
+        post.title = None
+        self.assertRaises(ValidationError, post.save)
+        post.title = 'Title'
+        post.save()
+        self.assertEqual(Post.objects.get().comments[0].body, 'Short')
+
 
 if __name__ == '__main__':
     unittest.main()
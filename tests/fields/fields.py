@@ -1060,6 +1060,29 @@ class FieldTest(unittest.TestCase):
         foo.bars.append(bar)
         self.assertEqual(repr(foo.bars), '[<Bar: Bar object>]')
 
+    def test_list_field_scalar_conversion(self):
+        """Ensure lists of scalars are converted item by item only when
+        needed."""
+        class Series(Document):
+            floats = ListField(FloatField())
+            ints = ListField(IntField())
+            longs = ListField(LongField())
+
+        floats = [0.5, 1.5]
+        series = Series._from_son({'floats': floats, 'ints': [1, True],
+                                   'longs': [1, 2]})
+        self.assertEqual(series._data['floats'], floats)
+        self.assertFalse(series._data['floats'] is floats)
+        self.assertEqual(series._data['ints'], [1, 1])
+        self.assertEqual(type(series._data['ints'][1]), int)
+
+        series.floats = [1, 0.5]
+        son = series.to_mongo()
+        self.assertEqual([type(value) for value in son['floats']],
+                         [float, float])
+        self.assertEqual([type(value) for value in son['longs']],
+                         [Int64, Int64])
+
     def test_list_field_strict(self):
         """Ensure that list field handles validation if provided a strict field type."""
 
@@ -2997,6 +3020,30 @@ class FieldTest(unittest.TestCase):
 
         Shirt.drop_collection()
 
+    def test_choices_get_field_display_defined_once(self):
+        """Ensure the display methods are defined with the class, keeping
+        the ones the documents define.
+        """
+        class Shirt(Document):
+            size = StringField(choices=(('S', 'Small'), ('M', 'Medium')))
+            style = StringField(choices=(('B', 'Baggy'), ('W', 'Wide')))
+            meta = {'allow_inheritance': True}
+
+            def get_style_display(self):
+                return 'Style %s' % self.style
+
+        class Polo(Shirt):
+            pass
+
+        display = Shirt.__dict__['get_size_display']
+        shirt = Shirt._from_son({'size': 'M', 'style': 'B'})
+        self.assertEqual(shirt.get_size_display(), 'Medium')
+        self.assertEqual(shirt.get_style_display(), 'Style B')
+        self.assertTrue(Shirt.__dict__['get_size_display'] is display)
+        self.assertFalse('get_size_display' in shirt.__dict__)
+        self.assertEqual(Polo(size='S', style='W').get_style_display(),
+                         'Style W')
+
     def test_simple_choices_validation_invalid_value(self):
         """Ensure that error messages are correct.
         """
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import pickle
 import sys
 sys.path[0:0] = [""]
 
@@ -16,9 +17,10 @@ from pymongo.read_preferences import ReadPreference
 from bson import ObjectId, DBRef
 
 from mongoengine import *
+from mongoengine import signals
 from mongoengine.connection import get_connection, get_db
 from mongoengine.python_support import PY3, IS_PYMONGO_3
-from mongoengine.context_managers import query_counter, switch_db
+from mongoengine.context_managers import query_counter, session, switch_db
 from mongoengine.queryset import (QuerySet, QuerySetManager,
                                   MultipleObjectsReturned, DoesNotExist,
                                   queryset_manager)
@@ -34,6 +36,10 @@ class db_ops_tracker(query_counter):
         return list(self.db.system.profile.find(ignore_query))
 
 
+def _square(item):
+    return item.number ** 2
+
+
 def skip_older_mongodb(f):
     def _inner(*args, **kwargs):
         connection = get_connection()
@@ -793,6 +799,19 @@ class QuerySetTest(unittest.TestCase):
             self.assertEqual(q, 0)
 
             Blog.objects.insert(blogs)
+            if mongodb_version < (2, 6):
+                self.assertEqual(q, 1)
+            else:
+                # no read back of the inserted documents
+                self.assertEqual(q, 99)
+
+        Blog.drop_collection()
+        Blog.ensure_indexes()
+
+        with query_counter() as q:
+            self.assertEqual(q, 0)
+
+            Blog.objects.insert(blogs, reload=True)
             if mongodb_version < (2, 6):
                 self.assertEqual(q, 2)  # 1 for insert, and 1 for in bulk fetch
             else:
@@ -807,9 +826,15 @@ class QuerySetTest(unittest.TestCase):
         post2 = Post(comments=[comment2, comment2])
         blog1 = Blog(title="code", posts=[post1, post2])
         blog2 = Blog(title="mongodb", posts=[post2, post1])
-        blog1, blog2 = Blog.objects.insert([blog1, blog2])
+        inserted = Blog.objects.insert([blog1, blog2])
+        self.assertTrue(inserted[0] is blog1)
+        self.assertTrue(inserted[1] is blog2)
         self.assertEqual(blog1.title, "code")
         self.assertEqual(blog2.title, "mongodb")
+        self.assertTrue(isinstance(blog1.id, ObjectId))
+        self.assertFalse(blog1._created)
+        self.assertEqual(blog1._get_changed_fields(), [])
+        self.assertEqual(Blog.objects.get(id=blog2.id).title, "mongodb")
 
         self.assertEqual(Blog.objects.count(), 2)
 
@@ -866,6 +891,72 @@ class QuerySetTest(unittest.TestCase):
                                                            'continue_on_error': True})
         self.assertEqual(Blog.objects.count(), 3)
 
+    def test_bulk_save(self):
+        """Ensure that bulk_save inserts new and updates changed documents
+        """
+        class Blog(Document):
+            title = StringField(unique=True)
+            views = IntField(default=0)
+
+        Blog.drop_collection()
+
+        blogs = [Blog(title='Blog %d' % i) for i in range(5)]
+        result = Blog.objects.bulk_save(blogs)
+        self.assertEqual(result['nInserted'], 5)
+        self.assertEqual(Blog.objects.count(), 5)
+        for blog in blogs:
+            self.assertTrue(blog.id is not None)
+            self.assertFalse(blog._created)
+            self.assertEqual(blog._get_changed_fields(), [])
+
+        blogs[0].views = 10
+        blogs[1].title = 'Renamed'
+        result = Blog.objects.bulk_save(blogs, batch_size=2)
+        self.assertEqual(result['nModified'], 2)
+        self.assertEqual(Blog.objects.get(id=blogs[0].id).views, 10)
+        self.assertEqual(Blog.objects.get(id=blogs[1].id).title, 'Renamed')
+
+        # Unique errors are reported against the failing document
+        duplicate = Blog(title='Blog 2')
+        extra = Blog(title='Blog 9')
+        with self.assertRaises(BulkWriteError) as ctx:
+            Blog.objects.bulk_save([duplicate, extra], ordered=False)
+        self.assertEqual(len(ctx.exception.errors), 1)
+        document, error = ctx.exception.errors[0]
+        self.assertTrue(document is duplicate)
+        self.assertTrue(isinstance(error, NotUniqueError))
+        self.assertFalse(extra._created)
+        self.assertEqual(Blog.objects.count(), 6)
+
+    def test_bulk_write(self):
+        """Ensure that bulk_write runs the given operations
+        """
+        class Blog(Document):
+            title = StringField()
+            views = IntField(default=0)
+
+        Blog.drop_collection()
+
+        first, second = Blog(title='First').save(), Blog(title='Second').save()
+        second.views = 5
+
+        result = Blog.objects.bulk_write([
+            InsertOne(Blog(title='Third')),
+            SaveOne(second),
+            UpdateMany({'title__in': ['First', 'Third']}, {'inc__views': 2}),
+            UpdateOne(Q(title='Fourth'), {'set__views': 1}, upsert=True),
+            DeleteOne(first),
+        ], ordered=True)
+
+        self.assertEqual(result['nInserted'], 1)
+        self.assertEqual(result['nUpserted'], 1)
+        self.assertEqual(result['nRemoved'], 1)
+        self.assertEqual(sorted((b.title, b.views) for b in Blog.objects),
+                         [('Fourth', 1), ('Second', 5), ('Third', 2)])
+
+        Blog.objects(title='Fourth').bulk_write([DeleteMany({})])
+        self.assertEqual(Blog.objects.count(), 2)
+
     def test_get_changed_fields_query_count(self):
 
         class Person(Document):
@@ -2754,6 +2845,30 @@ class QuerySetTest(unittest.TestCase):
             'val', map_reduce=True, normalize=True)
         self.assertEqual(freqs, {1: 50.0 / 70, 2: 20.0 / 70})
 
+    def test_item_frequencies_aggregate(self):
+        """Ensure the aggregation counts the documents without the list
+        under None but not the empty lists, and the unhashable values as
+        tuples.
+        """
+        class Test(Document):
+            tags = ListField(StringField())
+            d = DictField()
+            ll = ListField(ListField(IntField()))
+
+        Test.drop_collection()
+
+        Test(tags=['a', 'b'], d={'x': 1, 'y': [2]}, ll=[[1, 2], [3]]).save()
+        Test(tags=['a'], d={'y': [2], 'x': 1}, ll=[[1, 2]]).save()
+        Test(tags=[]).save()
+        Test._get_collection().insert({'tags': None})
+
+        self.assertEqual(Test.objects.item_frequencies('tags'),
+                         {'a': 2, 'b': 1, None: 1})
+        self.assertEqual(Test.objects.item_frequencies('d'),
+                         {(('x', 1), ('y', (2,))): 2, (): 1, None: 1})
+        self.assertEqual(Test.objects.item_frequencies('ll'),
+                         {(1, 2): 2, (3,): 1, None: 1})
+
     def test_average(self):
         """Ensure that field can be averaged correctly.
         """
@@ -3003,6 +3118,44 @@ class QuerySetTest(unittest.TestCase):
             Doc.objects.sum('values'),
             1360)
 
+    def test_aggregate_stats(self):
+        """Ensure several statistics are computed in one aggregation.
+        """
+        class Doc(Document):
+            name = StringField()
+            price = IntField()
+            values = ListField(IntField())
+
+        Doc.drop_collection()
+
+        Doc(name='a', price=10, values=[1, 2]).save()
+        Doc(name='b', price=20, values=[3]).save()
+        Doc(name='a', price=30, values=[]).save()
+
+        self.assertEqual(
+            Doc.objects.aggregate_stats(
+                sum='price', avg=['price'], min='price', max='price',
+                count=True, distinct_count='name'),
+            {'sum': 60, 'avg': {'price': 20}, 'min': 10, 'max': 30,
+             'count': 3, 'distinct_count': 2})
+        self.assertEqual(
+            Doc.objects.order_by('price').skip(1).limit(1).aggregate_stats(
+                sum='price', count=True),
+            {'sum': 20, 'count': 1})
+        self.assertEqual(
+            Doc.objects.none().aggregate_stats(
+                sum='price', avg='price', count=True),
+            {'sum': 0, 'avg': None, 'count': 0})
+
+        # List fields are aggregated over their items
+        self.assertEqual(
+            Doc.objects.aggregate_stats(sum='values', avg='values'),
+            {'sum': 6, 'avg': 2})
+        self.assertEqual(Doc.objects.item_frequencies('values'),
+                         {1: 1, 2: 1, 3: 1})
+        self.assertEqual(Doc.objects.item_frequencies('name'),
+                         {'a': 2, 'b': 1})
+
     def test_distinct(self):
         """Ensure that the QuerySet.distinct method works.
         """
@@ -4323,6 +4476,103 @@ class QuerySetTest(unittest.TestCase):
 
         self.assertEqual(doc_objects, Doc.objects.from_json(json_data))
 
+    def test_lazy(self):
+        class User(Document):
+            name = StringField(db_field='n')
+            friends = ListField(StringField())
+            avatar = BinaryField()
+
+        User.drop_collection()
+        User(name='Bob', friends=['Ada', 'Alan'], avatar=b'gif').save()
+
+        user = User.objects.lazy().get(name='Bob')
+        self.assertEqual(user.name, 'Bob')
+        self.assertEqual(user.avatar.tobytes(), b'gif')
+        self.assertEqual(User.objects.lazy().scalar('name').first(), 'Bob')
+
+        user.friends.append('Grace')
+        user.save()
+        self.assertEqual(User.objects.get().friends, ['Ada', 'Alan', 'Grace'])
+
+    def test_readonly(self):
+        class Address(EmbeddedDocument):
+            city = StringField()
+
+        class User(Document):
+            name = StringField()
+            friends = ListField(StringField())
+            address = EmbeddedDocumentField(Address)
+
+        class Archive(Document):
+            name = StringField()
+            meta = {'readonly_default': True}
+
+        User.drop_collection()
+        Archive.drop_collection()
+        User(name='Bob', friends=['Ada'], address=Address(city='Rome')).save()
+        Archive(name='2015').save()
+
+        user = User.objects.readonly().get()
+        self.assertEqual(user.name, 'Bob')
+        self.assertEqual(type(user.friends), list)
+        self.assertEqual(user.address.city, 'Rome')
+        self.assertFalse(hasattr(user, '_changed_fields'))
+        self.assertRaises(OperationError, setattr, user, 'name', 'Ada')
+        self.assertRaises(OperationError, setattr, user.address, 'city', 'Oslo')
+        self.assertRaises(OperationError, user.save)
+
+        # Documents constructed or loaded afterwards can be changed
+        user = User(name='Ada', address={'city': 'Oslo'})
+        user.address.city = 'Rome'
+        self.assertFalse(User.objects.get(name='Bob').address._readonly)
+
+        self.assertFalse(User.objects.first()._readonly)
+        self.assertTrue(Archive.objects.first()._readonly)
+        archive = Archive.objects.readonly(False).first()
+        archive.name = '2016'
+        archive.save()
+        self.assertEqual(Archive.objects.first().name, '2016')
+
+    def test_readonly_constructor(self):
+        """Ensure the read-only documents loaded through their constructor
+        and their nested lists and dicts are neither linked nor tracked.
+        """
+        class Address(EmbeddedDocument):
+            city = StringField()
+
+        class Place(DynamicDocument):
+            address = EmbeddedDocumentField(Address)
+
+        class User(Document):
+            address = EmbeddedDocumentField(Address)
+            data = DictField()
+
+        def pre_init(sender, document, values):
+            pass
+
+        Place.drop_collection()
+        User.drop_collection()
+        Place(address=Address(city='Rome'), tags={'a': [1]}).save()
+        User(address=Address(city='Oslo'), data={'a': [1], 'b': {}}).save()
+
+        signals.pre_init.connect(pre_init, sender=User)
+        try:
+            for doc_cls, key in ((Place, 'tags'), (User, 'data')):
+                doc = doc_cls.objects.readonly().get()
+                self.assertTrue(doc.address._readonly)
+                self.assertRaises(OperationError, setattr, doc.address,
+                                  'city', 'Paris')
+                value = getattr(doc, key)
+                self.assertEqual(type(value), dict)
+                self.assertEqual(type(value['a']), list)
+        finally:
+            signals.pre_init.disconnect(pre_init, sender=User)
+
+        # Without the constructor
+        user = User.objects.readonly().get()
+        self.assertEqual(type(user.data['a']), list)
+        self.assertEqual(type(user.data['b']), dict)
+
     def test_as_pymongo(self):
 
         from decimal import Decimal
@@ -4548,6 +4798,149 @@ class QuerySetTest(unittest.TestCase):
             list(docs)
             self.assertEqual(q, 2)
 
+    def test_iter_batches(self):
+        """Ensure the documents can be read by batches, in _id order unless
+        the queryset is ordered.
+        """
+        class Person(Document):
+            age = IntField()
+
+        Person.drop_collection()
+        for age in (3, 1, 4, 1, 5, 9, 2):
+            Person(age=age).save()
+
+        batches = list(Person.objects.iter_batches(3))
+        self.assertEqual([[p.age for p in batch] for batch in batches],
+                         [[3, 1, 4], [1, 5, 9], [2]])
+        self.assertTrue(all(isinstance(p, Person) for p in batches[0]))
+
+        batches = Person.objects(age__gt=1).order_by('-age').skip(1).limit(3)
+        self.assertEqual(
+            [[p['age'] for p in batch]
+             for batch in batches.iter_batches(2, as_pymongo=True)],
+            [[5, 4], [3]])
+        self.assertEqual(list(Person.objects.scalar('age').iter_batches(4)),
+                         [[3, 1, 4, 1], [5, 9, 2]])
+        self.assertEqual(list(Person.objects.none().iter_batches()), [])
+
+    def test_prefetch_batches(self):
+        """Ensure the results loaded in the background are the ones of a
+        normal iteration.
+        """
+        class Person(Document):
+            age = IntField()
+
+        Person.drop_collection()
+        Person.objects.insert([Person(age=age) for age in range(250)])
+
+        people = Person.objects.order_by('age').prefetch_batches(depth=3)
+        self.assertEqual([p.age for p in people], range(250))
+        self.assertEqual(len(people._result_cache), 250)
+        self.assertEqual([p.age for p in people][:3], [0, 1, 2])
+
+        ages = Person.objects(age__lt=30).order_by('-age').scalar('age')
+        self.assertEqual(list(ages.prefetch_batches(batch_size=7)),
+                         range(29, -1, -1))
+
+        # Stopping early stops the thread, and iterating again
+        people = Person.objects.order_by('age').prefetch_batches(
+            batch_size=10)
+        for person in people:
+            thread = people._prefetcher._thread
+            break
+        self.assertFalse(thread.is_alive())
+        self.assertEqual([p.age for p in people], range(250))
+
+        people = Person.objects.order_by('age').no_cache() \
+            .prefetch_batches(batch_size=10)
+        for person in people:
+            thread = people._prefetcher._thread
+            break
+        self.assertFalse(thread.is_alive())
+        self.assertEqual([p.age for p in people], range(250))
+
+    def test_prefetch_batches_session(self):
+        """Ensure the results loaded in the background join the session
+        of the iterating thread.
+        """
+        class Person(Document):
+            age = IntField()
+
+        Person.drop_collection()
+        Person.objects.insert([Person(age=age) for age in range(50)])
+
+        with session():
+            people = list(Person.objects.order_by('age')
+                          .prefetch_batches(batch_size=10))
+            self.assertTrue(Person.objects.get(pk=people[3].pk) is people[3])
+            people[3].age = 300
+
+        self.assertEqual(Person.objects.get(pk=people[3].pk).age, 300)
+
+    def test_paginate(self):
+        """Ensure pages are selected by ranges of the sort keys, forwards
+        and backwards, and that seek_iter walks all the documents.
+        """
+        class Person(Document):
+            age = IntField()
+
+        Person.drop_collection()
+        people = [Person(age=age).save() for age in (3, 1, 4, 1, 5, 9, 2)]
+        by_age = sorted(people, key=lambda p: (-p.age, p.id))
+
+        pages = []
+        page = Person.objects.paginate(order_by=('-age',), page_size=3)
+        while True:
+            pages.append(list(page))
+            if page.next_token is None:
+                break
+            page = Person.objects.paginate(order_by=('-age',), page_size=3,
+                                           after=page.next_token)
+        self.assertEqual(pages, [by_age[:3], by_age[3:6], by_age[6:]])
+
+        page = Person.objects.paginate(order_by=('-age',), page_size=3,
+                                       before=page.previous_token)
+        self.assertEqual(page, by_age[3:6])
+        page = Person.objects.paginate(order_by=('-age',), page_size=3,
+                                       before=page.previous_token)
+        self.assertEqual(page, by_age[:3])
+        self.assertEqual(page.previous_token, None)
+
+        # Ties on the age are broken by the id
+        page = Person.objects(age__lt=9).paginate(
+            order_by=('age',), page_size=2, after=people[1])
+        self.assertEqual([p.age for p in page], [1, 2])
+        self.assertEqual(page[0], people[3])
+
+        self.assertRaises(InvalidQueryError, Person.objects.paginate,
+                          order_by=('-age',), after=page.next_token)
+        self.assertEqual([p.age for p in Person.objects.seek_iter(
+            ('age',), batch_size=2)], [1, 1, 2, 3, 4, 5, 9])
+
+    def test_parallel_map(self):
+        class Item(Document):
+            number = IntField()
+
+        Item.drop_collection()
+        Item.objects.insert([Item(number=i % 30) for i in range(120)])
+        queryset = Item.objects(number__gte=10)
+
+        restored = pickle.loads(pickle.dumps(queryset.only('number')))
+        self.assertEqual(restored.count(), 80)
+        self.assertEqual(restored._loaded_fields.as_dict(), {'number': 1})
+
+        items = list(queryset.parallel_iter(workers=3, partition='number',
+                                            ordered=True))
+        self.assertEqual([item.number for item in items],
+                         sorted(i % 30 for i in range(120) if i % 30 >= 10))
+        self.assertEqual(len(set(item.id for item in items)), 80)
+
+        self.assertEqual(sorted(queryset.parallel_map(_square, workers=3)),
+                         sorted((i % 30) ** 2 for i in range(120)
+                                if i % 30 >= 10))
+        self.assertEqual(list(queryset.none().parallel_iter()), [])
+        self.assertRaises(OperationError, queryset.limit(5).parallel_iter)
+
     def test_nested_queryset_iterator(self):
         # Try iterating the same queryset twice, nested.
         names = ['Alice', 'Bob', 'Chuck', 'David', 'Eric', 'Francis', 'George']
@@ -4852,6 +5245,59 @@ class QuerySetTest(unittest.TestCase):
             {'_id': None, 'avg': 29, 'total': 2}
         ])
 
+    def test_queryset_aggregation_projection(self):
+        class Person(Document):
+            name = StringField()
+            age = IntField()
+
+        Person.drop_collection()
+
+        p1 = Person.objects.create(name="Isabella Luanna", age=16)
+        p2 = Person.objects.create(name="Wilson Junior", age=21)
+        Person.objects.create(name="Sandra Mara", age=37)
+
+        data = Person.objects(age__lte=22).only('name').aggregate()
+        self.assertEqual(list(data), [
+            {'_id': p1.pk, 'name': "Isabella Luanna"},
+            {'_id': p2.pk, 'name': "Wilson Junior"}
+        ])
+
+    def test_pipeline(self):
+        class Address(EmbeddedDocument):
+            city = StringField(db_field='c')
+
+        class Person(Document):
+            name = StringField(db_field='n')
+            age = IntField()
+            tags = ListField(StringField(), db_field='t')
+            address = EmbeddedDocumentField(Address, db_field='a')
+
+        Person.drop_collection()
+
+        Person.objects.create(name='Ada', age=36, tags=['math', 'code'],
+                              address=Address(city='London'))
+        Person.objects.create(name='Alan', age=41, tags=['math'],
+                              address=Address(city='London'))
+        Person.objects.create(name='Grace', age=85, tags=['code'],
+                              address=Address(city='New York'))
+
+        pipeline = Person.objects(age__lt=50).pipeline() \
+            .unwind('tags') \
+            .group('$tags', count={'$sum': 1}, oldest={'$max': '$age'}) \
+            .sort('-count')
+        self.assertEqual(pipeline.stages[1:3], [
+            {'$unwind': '$t'},
+            {'$group': {'_id': '$t', 'count': {'$sum': 1},
+                        'oldest': {'$max': '$age'}}}])
+        rows = list(pipeline.named())
+        self.assertEqual([(row.id, row.count, row.oldest) for row in rows],
+                         [('math', 2, 41), ('code', 1, 36)])
+
+        pipeline = Person.objects.pipeline() \
+            .match(address__city='London').sort('-age')
+        self.assertEqual([person.name for person in pipeline.documents()],
+                         ['Alan', 'Ada'])
+
     def test_delete_count(self):
         [self.Person(name="User {0}".format(i), age=i * 10).save() for i in xrange(1, 4)]
         self.assertEqual(self.Person.objects().delete(), 3)  # test ordinary QuerySey delete count
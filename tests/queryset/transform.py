@@ -234,5 +234,31 @@ class TransformTest(unittest.TestCase):
         events = Event.objects(location__within=box)
         self.assertRaises(InvalidQueryError, lambda: events.count())
 
+    def test_query_plan_cache(self):
+        """Ensure the parsing of the query keys is cached per document
+        class, the values being converted on every call.
+        """
+        class Person(Document):
+            name = StringField(db_field='n')
+            age = IntField()
+            meta = {'allow_inheritance': True}
+
+        class Employee(Person):
+            salary = IntField(db_field='s')
+
+        before = transform.get_query_plan_stats()
+        self.assertEqual(transform.query(Person, name='Ross', age__gte='30'),
+                         {'n': 'Ross', 'age': {'$gte': 30}})
+        self.assertEqual(transform.query(Person, name='Bob', age__gte=20),
+                         {'n': 'Bob', 'age': {'$gte': 20}})
+        after = transform.get_query_plan_stats()
+        self.assertEqual(after['misses'] - before['misses'], 2)
+        self.assertEqual(after['hits'] - before['hits'], 2)
+
+        self.assertEqual(transform.query(Employee, name='Jon', salary__lt=10),
+                         {'n': 'Jon', 's': {'$lt': 10}})
+        self.assertRaises(InvalidQueryError, transform.query, Person,
+                          height__lt=10)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,172 @@
+import sys
+sys.path[0:0] = [""]
+import unittest
+
+from mongoengine import *
+from mongoengine import async_support
+from mongoengine.async_support import HAS_ASYNCIO, StopAsyncIteration
+from mongoengine.connection import disconnect
+
+try:
+    import mongomock
+except ImportError:
+    mongomock = None
+
+if HAS_ASYNCIO:
+    import asyncio
+
+
+@unittest.skipIf(not HAS_ASYNCIO or mongomock is None,
+                 'asyncio and mongomock are required')
+class AsyncTest(unittest.TestCase):
+
+    def setUp(self):
+        connect('mongoenginetest', alias='async',
+                host='mongomock://localhost')
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+        class Person(Document):
+            name = StringField()
+            age = IntField()
+            meta = {'db_alias': 'async'}
+
+        Person.drop_collection()
+        self.Person = Person
+
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+        disconnect('async')
+
+    def wait(self, future):
+        return self.loop.run_until_complete(future)
+
+    def test_asave(self):
+        """Ensure documents are inserted and updated with asave().
+        """
+        person = self.Person(name='Ross', age=30)
+        self.assertTrue(self.wait(person.asave()) is person)
+        self.assertTrue(person.pk is not None)
+        self.assertEqual(person._get_changed_fields(), [])
+        self.assertEqual(self.Person.objects.get().name, 'Ross')
+
+        person.age = 31
+        self.wait(person.asave())
+        self.assertEqual(self.Person.objects.get().age, 31)
+
+        self.Person.objects.update(set__name='Bob')
+        self.assertEqual(self.wait(person.areload()).name, 'Bob')
+
+        self.wait(person.adelete())
+        self.assertEqual(self.Person.objects.count(), 0)
+
+    def test_queries(self):
+        """Ensure the results of a query are read with asyncio.
+        """
+        for age, name in enumerate(('Ross', 'Bob', 'Jon')):
+            self.Person(name=name, age=age).save()
+
+        people = self.wait(self.Person.aobjects.order_by('name').to_list())
+        self.assertEqual([p.name for p in people], ['Bob', 'Jon', 'Ross'])
+        self.assertEqual(
+            self.wait(self.Person.aobjects(age__gte=1).acount()), 2)
+        self.assertEqual(self.wait(self.Person.aobjects.limit(1).acount(
+            with_limit_and_skip=True)), 1)
+        self.assertEqual(
+            self.wait(self.Person.aobjects(name='Jon').afirst()).age, 2)
+        self.assertEqual(
+            self.wait(self.Person.aobjects(name='Ann').afirst()), None)
+        self.assertEqual(self.wait(
+            self.Person.aobjects.order_by('age').scalar('name').to_list(2)),
+            ['Ross', 'Bob'])
+
+        by_id = self.wait(self.Person.aobjects.ain_bulk(
+            [p.pk for p in people]))
+        self.assertEqual(set(by_id), set(p.pk for p in people))
+
+        self.assertRaises(TypeError, list, self.Person.aobjects)
+
+        self.assertEqual(self.wait(
+            self.Person.aobjects.order_by('age')[1:].scalar('age').to_list()),
+            [1, 2])
+        self.assertEqual(self.wait(
+            self.Person.aobjects.order_by('age')[:1].scalar('age').to_list()),
+            [0])
+        self.assertEqual(self.wait(self.Person.aobjects[2:2].to_list()), [])
+
+    def test_acount_without_count_documents(self):
+        """Ensure documents are counted with the drivers lacking
+        count_documents (Motor < 2.0).
+        """
+        for age in range(3):
+            self.Person(name='Ross', age=age).save()
+
+        has_count_documents = async_support._has_count_documents
+        async_support._has_count_documents = lambda collection: False
+        try:
+            self.assertEqual(
+                self.wait(self.Person.aobjects(age__gte=1).acount()), 2)
+            self.assertEqual(self.wait(self.Person.aobjects.skip(1).limit(
+                1).acount(with_limit_and_skip=True)), 1)
+        finally:
+            async_support._has_count_documents = has_count_documents
+
+    def test_synchronous_methods(self):
+        """Ensure the synchronous methods reading or writing documents
+        raise TypeError.
+        """
+        person = self.Person(name='Ross', age=30).save()
+        people = self.Person.aobjects
+
+        self.assertRaises(TypeError, people.count)
+        self.assertRaises(TypeError, people.get, name='Ross')
+        self.assertRaises(TypeError, people.first)
+        self.assertRaises(TypeError, people.with_id, person.pk)
+        self.assertRaises(TypeError, people.in_bulk, [person.pk])
+        self.assertRaises(TypeError, people.update, set__age=31)
+        self.assertRaises(TypeError, people.modify, set__age=31)
+        self.assertRaises(TypeError, people.delete)
+        self.assertRaises(TypeError, people.aggregate, {'$match': {}})
+        self.assertRaises(TypeError, len, people)
+        self.assertRaises(TypeError, bool, people)
+        self.assertRaises(TypeError, people.__getitem__, 0)
+        self.assertEqual(self.Person.objects.get().age, 30)
+
+    def test_async_iteration(self):
+        """Ensure a queryset can be iterated with ``async for``.
+        """
+        for age in range(3):
+            self.Person(name='Ross', age=age).save()
+
+        iterator = self.Person.aobjects.order_by('-age').__aiter__()
+        ages = []
+        while True:
+            try:
+                ages.append(self.wait(iterator.__anext__()).age)
+            except StopAsyncIteration:
+                break
+        self.assertEqual(ages, [2, 1, 0])
+
+    def test_aupdate_and_aaggregate(self):
+        """Ensure updates and aggregations run with asyncio.
+        """
+        for age in range(3):
+            self.Person(name='Ross', age=age).save()
+
+        self.assertEqual(
+            self.wait(self.Person.aobjects(age__gte=1).aupdate(inc__age=10)),
+            2)
+        self.assertEqual(self.wait(self.Person.aobjects(age=0).aupdate_one(
+            set__name='Bob')), 1)
+        self.assertEqual(self.wait(
+            self.Person.aobjects.order_by('age').scalar('age').to_list()),
+            [0, 11, 12])
+
+        result = self.wait(self.Person.aobjects(name='Ross').aaggregate(
+            {'$group': {'_id': None, 'total': {'$sum': '$age'}}}))
+        self.assertEqual(result[0]['total'], 23)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import sys
+sys.path[0:0] = [""]
+import unittest
+
+from benchmarks.cases import CASES
+from benchmarks.runner import compare
+
+
+class BenchmarksTest(unittest.TestCase):
+
+    def test_cases(self):
+        """Ensure every benchmarked operation runs without a database.
+        """
+        for name, setup in CASES:
+            operation = setup()
+            operation()
+
+    def test_compare(self):
+        """Ensure results slower or allocating more than the baseline
+        beyond the threshold are reported.
+        """
+        baseline = {'a': {'ops_per_sec': 100.0, 'alloc_kib': 10.0},
+                    'b': {'ops_per_sec': 100.0, 'alloc_kib': None},
+                    'c': {'ops_per_sec': 100.0, 'alloc_kib': 10.0}}
+        results = {'a': {'ops_per_sec': 95.0, 'alloc_kib': 10.5},
+                   'b': {'ops_per_sec': 80.0, 'alloc_kib': 20.0},
+                   'c': {'ops_per_sec': 150.0, 'alloc_kib': 12.0},
+                   'd': {'ops_per_sec': 1.0, 'alloc_kib': None}}
+        self.assertEqual(compare(results, baseline, threshold=0.1),
+                         [('b', 'ops_per_sec', 100.0, 80.0),
+                          ('c', 'alloc_kib', 10.0, 12.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
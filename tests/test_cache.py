@@ -0,0 +1,104 @@
+import sys
+sys.path[0:0] = [""]
+import unittest
+
+from mongoengine import *
+from mongoengine.cache import LRUCache, get_document_cache
+
+
+class CacheTest(unittest.TestCase):
+
+    def setUp(self):
+        connect(db='mongoenginetest')
+
+        class Country(Document):
+            name = StringField()
+            meta = {'cache': {'backend': 'lru', 'max_size': 10, 'ttl': 30}}
+
+        class City(Document):
+            country = ReferenceField(Country)
+
+        Country.drop_collection()
+        City.drop_collection()
+        self.Country = Country
+        self.City = City
+
+    def test_read_through(self):
+        """Ensure documents read by id are served from the cache, and that
+        writes invalidate them.
+        """
+        Country = self.Country
+        france = Country(name='France').save()
+        cache = get_document_cache(Country)
+
+        self.assertEqual(Country.objects.get(pk=france.pk).name, 'France')
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 1})
+
+        # Written behind MongoEngine's back: the cached copy is served
+        Country._get_collection().update({'_id': france.pk},
+                                         {'$set': {'name': 'Francia'}})
+        self.assertEqual(Country.objects.with_id(france.pk).name, 'France')
+        self.assertEqual(Country.objects.in_bulk([france.pk])[france.pk].name,
+                         'France')
+        city = self.City(country=france).save()
+        self.assertEqual(self.City.objects.get(pk=city.pk).country.name,
+                         'France')
+        self.assertEqual(cache.stats(), {'hits': 3, 'misses': 1})
+
+        # Queries on other fields are not cached
+        self.assertEqual(Country.objects.get(name='Francia').name, 'Francia')
+
+        Country.objects(pk=france.pk).update(set__name='Frankreich')
+        self.assertEqual(Country.objects.get(pk=france.pk).name, 'Frankreich')
+
+        france.name = 'Francia'
+        france.save()
+        self.assertEqual(Country.objects.get(pk=france.pk).name, 'Francia')
+
+        france.delete()
+        self.assertEqual(Country.objects.with_id(france.pk), None)
+
+    def test_other_database(self):
+        """Ensure the documents read from another database are not served
+        from the cache of the default one.
+        """
+        class Country(Document):
+            name = StringField()
+            meta = {'collection': 'cached_country',
+                    'cache': {'backend': 'lru', 'max_size': 10}}
+
+        register_connection('testdb-cache', 'mongoenginetest2')
+        Country.drop_collection()
+        france = Country(name='France').save()
+        Country.objects.using('testdb-cache').delete()
+        Country.objects.using('testdb-cache').insert(
+            Country(pk=france.pk, name='Francia'), load_bulk=False)
+
+        self.assertEqual(Country.objects.get(pk=france.pk).name, 'France')
+        other = Country.objects.using('testdb-cache')
+        self.assertEqual(other.get(pk=france.pk).name, 'Francia')
+        self.assertEqual(other.in_bulk([france.pk])[france.pk].name,
+                         'Francia')
+        self.assertEqual(Country.objects.with_id(france.pk).name, 'France')
+
+    def test_lru_cache(self):
+        """Ensure the LRU cache evicts the least recently used and the
+        expired entries.
+        """
+        cache = LRUCache('default.country', max_size=2, ttl=30)
+        cache.set_many({1: 'a', 2: 'b'})
+        self.assertEqual(cache.get_many([1, 3]), {1: 'a'})
+        cache.set_many({3: 'c'})
+        self.assertEqual(cache.get_many([1, 2, 3]), {1: 'a', 3: 'c'})
+        cache.delete_many([1])
+        self.assertEqual(len(cache), 1)
+
+        cache.ttl = -1
+        cache.set_many({4: 'd'})
+        self.assertEqual(cache.get_many([3, 4]), {3: 'c'})
+        cache.clear()
+        self.assertEqual(cache.get_many([3]), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,7 @@ from mongoengine import *
 from mongoengine.connection import get_db
 from mongoengine.context_managers import (switch_db, switch_collection,
                                           no_sub_classes, no_dereference,
-                                          query_counter)
+                                          query_counter, session)
 
 
 class ContextManagersTest(unittest.TestCase):
@@ -200,5 +200,89 @@ class ContextManagersTest(unittest.TestCase):
 
             self.assertEqual(50, q)
 
+    def test_session(self):
+        connect('mongoenginetest')
+
+        class Organization(Document):
+            name = StringField()
+
+        class User(Document):
+            name = StringField()
+            organization = ReferenceField(Organization)
+            organizations = ListField(ReferenceField(Organization))
+
+        Organization.drop_collection()
+        User.drop_collection()
+
+        org = Organization.objects.create(name='org')
+        for i in range(3):
+            User.objects.create(name='user %d' % i, organization=org,
+                                organizations=[org])
+
+        with session() as s:
+            users = list(User.objects)
+            self.assertTrue(User.objects.get(name='user 0') is users[0])
+
+            org = Organization.objects.get()
+            self.assertTrue(users[0].organization is org)
+            self.assertTrue(users[1].organizations[0] is org)
+            self.assertTrue(Organization.objects.with_id(org.pk) is org)
+            self.assertTrue(Organization.objects.in_bulk([org.pk])[org.pk]
+                            is org)
+
+            org.name = 'renamed'
+            new_user = User(name='new')
+            s.add(new_user)
+            self.assertEqual(Organization.objects._collection.find_one()[
+                'name'], 'org')
+
+        # Changes are written on exit
+        self.assertEqual(Organization.objects.get().name, 'renamed')
+        self.assertEqual(User.objects.get(name='new').pk, new_user.pk)
+        self.assertFalse(User.objects.first() is User.objects.first())
+
+        # ... unless the block raised
+        try:
+            with session():
+                Organization.objects.get().name = 'discarded'
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertEqual(Organization.objects.get().name, 'renamed')
+
+    def test_session_other_database(self):
+        connect('mongoenginetest')
+        register_connection('testdb-session', 'mongoenginetest2')
+
+        class Team(Document):
+            name = StringField()
+
+        Team.drop_collection()
+        with switch_db(Team, 'testdb-session') as OtherTeam:
+            OtherTeam.drop_collection()
+
+        team = Team.objects.create(name='default')
+        Team(pk=team.pk, name='other').switch_db('testdb-session').save()
+
+        with session():
+            team = Team.objects.get()
+            other = Team.objects.using('testdb-session')
+            self.assertEqual(other.with_id(team.pk).name, 'other')
+            self.assertEqual(other.in_bulk([team.pk])[team.pk].name,
+                             'other')
+            self.assertEqual(other.get().name, 'other')
+            self.assertTrue(Team.objects.with_id(team.pk) is team)
+
+            switched = Team.objects.get().switch_db('testdb-session')
+            switched.name = 'switched'
+            switched.save()
+            self.assertTrue(Team.objects.with_id(team.pk) is not switched)
+
+        self.assertEqual(Team.objects.get().name, 'default')
+        self.assertEqual(Team.objects.using('testdb-session').get().name,
+                         'switched')
+        with switch_db(Team, 'testdb-session') as OtherTeam:
+            OtherTeam.drop_collection()
+
 if __name__ == '__main__':
     unittest.main()
@@ -1284,5 +1284,56 @@ class FieldTest(unittest.TestCase):
 
             self.assertEqual(q, 2)
 
+    def test_prefetch(self):
+        """Ensure prefetch() fetches the references of each batch of
+        results with one query per referenced class.
+        """
+        class User(Document):
+            name = StringField()
+            boss = ReferenceField('self')
+
+        class Tag(Document):
+            name = StringField()
+
+        class Comment(EmbeddedDocument):
+            author = ReferenceField(User)
+
+        class Post(Document):
+            author = ReferenceField(User)
+            tags = ListField(ReferenceField(Tag))
+            comments = ListField(EmbeddedDocumentField(Comment))
+            related = GenericReferenceField()
+
+        User.drop_collection()
+        Tag.drop_collection()
+        Post.drop_collection()
+
+        boss = User.objects.create(name='boss')
+        users = [User.objects.create(name='user %d' % i, boss=boss)
+                 for i in range(3)]
+        tags = [Tag.objects.create(name='tag %d' % i) for i in range(3)]
+        for i in range(150):
+            Post.objects.create(author=users[i % 3], tags=tags[:i % 3 + 1],
+                                comments=[Comment(author=users[i % 2])],
+                                related=tags[i % 3])
+
+        with query_counter() as q:
+            posts = Post.objects.prefetch('author.boss', 'tags',
+                                          'comments.author', 'related')
+            posts = list(posts)
+            # For each of the 2 batches of results: its fetch, the users
+            # and tags, then the bosses and comment authors
+            self.assertEqual(q, 8)
+
+            self.assertEqual(posts[4].author, users[1])
+            self.assertEqual(posts[4].author.boss, boss)
+            self.assertEqual(posts[4].tags, tags[:2])
+            self.assertEqual(posts[4].comments[0].author, users[0])
+            self.assertEqual(posts[4].related, tags[1])
+            self.assertEqual(q, 8)
+
+        self.assertRaises(InvalidQueryError, Post.objects.prefetch, 'comments')
+        self.assertRaises(InvalidQueryError, Post.objects.prefetch, 'title')
+
 if __name__ == '__main__':
     unittest.main()
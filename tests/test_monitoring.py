@@ -0,0 +1,102 @@
+import sys
+sys.path[0:0] = [""]
+import datetime
+import unittest
+
+from bson import BSON
+
+from mongoengine import *
+from mongoengine.monitoring import (CommandMonitor, CommandStats,
+                                    MONITORING_AVAILABLE, get_command_stats)
+
+
+class MonitoringTest(unittest.TestCase):
+
+    def setUp(self):
+        connect(db='mongoenginetest')
+
+        class Post(Document):
+            title = StringField()
+
+        Post.drop_collection()
+        self.Post = Post
+
+    def test_command_stats(self):
+        """Ensure the commands sent by querysets are recorded with the
+        document class and method which sent them.
+        """
+        stats = get_command_stats()
+        if stats is None:
+            raise unittest.SkipTest('the connection is not monitored')
+        stats.reset()
+
+        self.Post(title='Test').save()
+        self.assertEqual(self.Post.objects.count(), 1)
+        self.assertEqual(stats.count('count'), 1)
+        self.assertEqual(stats.origins[('Post', 'count', 'count')], 1)
+        self.assertEqual(stats.origins[('Post', 'save', 'insert')], 1)
+
+    def test_command_monitor(self):
+        """Ensure the monitor records the latencies and sizes of the
+        commands and calls the slow command callbacks.
+        """
+        if not MONITORING_AVAILABLE:
+            raise unittest.SkipTest('PyMongo has no command monitoring')
+        from pymongo.monitoring import (CommandStartedEvent,
+                                        CommandSucceededEvent)
+
+        monitor = CommandMonitor()
+        monitor.stats = CommandStats()
+        slow = []
+        monitor.slow_callbacks.append((50, slow.append))
+
+        command = {'find': 'post', 'filter': {}}
+        reply = {'cursor': {'firstBatch': [{'title': 'Test'}]}, 'ok': 1}
+        connection_id = ('localhost', 27017)
+        for request_id, duration in ((1, 3), (2, 120)):
+            monitor.started(CommandStartedEvent(
+                command, 'mongoenginetest', request_id, connection_id, 1))
+            monitor.succeeded(CommandSucceededEvent(
+                datetime.timedelta(milliseconds=duration), reply, 'find',
+                request_id, connection_id, 1))
+
+        entry = monitor.stats.commands['find']
+        self.assertEqual(entry['count'], 2)
+        self.assertEqual(entry['max_ms'], 120)
+        self.assertEqual(entry['bytes_returned'], 2 * len(BSON.encode(reply)))
+        self.assertEqual(entry['histogram'][2], 1)  # 2ms < 3ms <= 5ms
+        self.assertEqual(entry['histogram'][7], 1)  # 100ms < 120ms <= 200ms
+
+        self.assertEqual(len(slow), 1)
+        self.assertEqual(slow[0].command, command)
+        self.assertEqual(slow[0].duration_ms, 120)
+        self.assertEqual(slow[0].document, None)
+
+    def test_drops_forget_indexes(self):
+        """Ensure the indexes ensured in a collection are forgotten once
+        the monitor sees it, or its database, dropped.
+        """
+        if not MONITORING_AVAILABLE:
+            raise unittest.SkipTest('PyMongo has no command monitoring')
+        from pymongo.monitoring import (CommandStartedEvent,
+                                        CommandSucceededEvent)
+        from mongoengine.document import _ensured_indexes
+
+        keys = [('default', 'mongoenginetest.post', (('title', 1),), '[]'),
+                ('default', 'mongoenginetest.tag', (('name', 1),), '[]')]
+        _ensured_indexes.update(keys)
+        monitor = CommandMonitor()
+        connection_id = ('localhost', 27017)
+        for request_id, command in ((1, {'drop': 'post'}),
+                                    (2, {'dropDatabase': 1})):
+            monitor.started(CommandStartedEvent(
+                command, 'mongoenginetest', request_id, connection_id, 1))
+            self.assertTrue(keys[request_id - 1] in _ensured_indexes)
+            monitor.succeeded(CommandSucceededEvent(
+                datetime.timedelta(milliseconds=1), {'ok': 1},
+                list(command)[0], request_id, connection_id, 1))
+            self.assertFalse(keys[request_id - 1] in _ensured_indexes)
+
+
+if __name__ == '__main__':
+    unittest.main()
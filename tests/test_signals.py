@@ -232,6 +232,30 @@ class SignalTests(unittest.TestCase):
 
         self.assertEqual(self.pre_signals, post_signals)
 
+    def test_has_receivers(self):
+        """ The receivers registry follows connect / disconnect. """
+
+        class Book(Document):
+            title = StringField()
+
+        def receiver(sender, document, **kwargs):
+            pass
+
+        self.assertFalse(signals.has_receivers(signals.post_save, Book))
+        self.assertTrue(signals.has_receivers(signals.post_save, self.Author))
+
+        signals.post_save.connect(receiver, sender=Book)
+        self.assertTrue(signals.has_receivers(signals.post_save, Book))
+        self.assertFalse(signals.has_receivers(signals.pre_save, Book))
+        signals.post_save.disconnect(receiver, sender=Book)
+        self.assertFalse(signals.has_receivers(signals.post_save, Book))
+
+        # Receivers connected to any sender apply to every document
+        signals.pre_save.connect(receiver)
+        self.assertTrue(signals.has_receivers(signals.pre_save, Book))
+        signals.pre_save.disconnect(receiver)
+        self.assertFalse(signals.has_receivers(signals.pre_save, Book))
+
     def test_model_signals(self):
         """ Model saves should throw some signals. """
 
@@ -304,9 +328,6 @@ class SignalTests(unittest.TestCase):
             'post_init signal, Bill Shakespeare, document._created = True',
             'pre_bulk_insert signal, [<Author: Bill Shakespeare>]',
             {},
-            'pre_init signal, Author',
-            {'id': 3, 'name': 'Bill Shakespeare'},
-            'post_init signal, Bill Shakespeare, document._created = False',
             'post_bulk_insert signal, [<Author: Bill Shakespeare>]',
             'Is loaded',
             {}
@@ -360,9 +381,6 @@ class SignalTests(unittest.TestCase):
             'post_init signal, Bill Shakespeare, document._created = True',
             'pre_bulk_insert signal, [<Author: Bill Shakespeare>]',
             {'key': True},
-            'pre_init signal, Author',
-            {'id': 2, 'name': 'Bill Shakespeare'},
-            'post_init signal, Bill Shakespeare, document._created = False',
             'post_bulk_insert signal, [<Author: Bill Shakespeare>]',
             'Is loaded',
             {'key': True}